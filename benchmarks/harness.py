@@ -0,0 +1,103 @@
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from src.vacancy import Vacancy
+
+AREAS = ["Москва", "Санкт-Петербург", "Казань", "Новосибирск", "Екатеринбург", "Нижний Новгород"]
+TITLES = ["Python-разработчик", "Backend-разработчик", "Data Engineer", "Аналитик данных", "DevOps-инженер"]
+SKILLS = ["Python", "Django", "FastAPI", "PostgreSQL", "Docker", "Kubernetes", "Airflow", "Spark", "Redis", "Git"]
+
+
+class BenchmarkResult(NamedTuple):
+    """Итог одного замера: задержки в секундах, память в байтах"""
+
+    suite: str
+    name: str
+    size: int
+    ops: int
+    seconds: float
+    throughput: float
+    p50: float
+    p99: float
+    peak_memory: Optional[int]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Возвращает словарь для отчета JSON"""
+        return self._asdict()
+
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    """Перцентиль q (0..100) по методу ближайшего ранга"""
+    if not samples:
+        raise ValueError("Нет замеров для расчета перцентиля")
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def measure(
+    suite: str,
+    name: str,
+    size: int,
+    func: Callable[[int], Any],
+    repeat: int,
+    items: int = 1,
+    trace_memory: bool = True,
+) -> BenchmarkResult:
+    """Замер операции func(i) для i от 0 до repeat - 1.
+
+    Задержки снимаются без tracemalloc, чтобы трассировка не искажала
+    время. Пиковая память измеряется отдельным вызовом func(repeat),
+    поэтому данные для операции должны быть готовы на repeat + 1 вызов.
+    items - число обработанных элементов за вызов для расчета
+    пропускной способности.
+    """
+    samples = []
+    for i in range(repeat):
+        started = time.perf_counter()
+        func(i)
+        samples.append(time.perf_counter() - started)
+
+    peak_memory = None
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            func(repeat)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    seconds = sum(samples)
+    return BenchmarkResult(
+        suite=suite,
+        name=name,
+        size=size,
+        ops=repeat,
+        seconds=seconds,
+        throughput=items * repeat / seconds if seconds else float("inf"),
+        p50=percentile(samples, 50),
+        p99=percentile(samples, 99),
+        peak_memory=peak_memory,
+    )
+
+
+def synthetic_vacancies(count: int, seed: int = 0, prefix: str = "bench") -> List[Vacancy]:
+    """Детерминированный набор вакансий с уникальными ссылками"""
+    rnd = random.Random(seed)
+    vacancies = []
+    for number in range(count):
+        salary_from = rnd.choice([None, rnd.randrange(40, 300) * 1000])
+        salary_to = rnd.choice([None, (salary_from or 50000) + rnd.randrange(0, 150) * 1000])
+        vacancies.append(
+            Vacancy.from_trusted(
+                f"{rnd.choice(TITLES)} {number}",
+                rnd.choice(AREAS),
+                f"https://hh.ru/vacancy/{prefix}{number}",
+                salary_from,
+                salary_to,
+                "Требования: " + ", ".join(rnd.sample(SKILLS, 4)),
+            )
+        )
+    return vacancies
@@ -0,0 +1,215 @@
+"""Бенчмарки клиента API, хранилищ и запросов.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.run --sizes 1000 10000 100000 1000000 --output results.json
+    python -m benchmarks.run --baseline old.json --output new.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.harness import BenchmarkResult, measure, synthetic_vacancies
+from benchmarks.stub_server import StubHeadHunterServer
+from src.api_connector import HeadHunterAPI
+from src.harvester import STORAGE_FORMATS, open_storage
+from src.vacancy import Vacancy
+
+DEFAULT_SIZES = [1000, 10000]
+# Подстроки описания для get_vacancies: слово, фрагмент из двух слов и часть слова
+QUERIES = ["python", "docker", "spark", "требования: django", "sql"]
+# Запросы со словами AND/OR для search_vacancies
+SEARCH_QUERIES = ["postgresql kubernetes", "django|fastapi", "python redis | spark airflow"]
+TOP_N = 10
+
+
+def run_api_benchmarks(
+    latency: float = 0.0,
+    repeat: int = 20,
+    max_workers: int = 8,
+    found: int = 2000,
+) -> List[BenchmarkResult]:
+    """Замер HeadHunterAPI на локальной заглушке hh.ru с задержкой latency"""
+    results = []
+    with StubHeadHunterServer(latency=latency, found=found) as stub:
+        with HeadHunterAPI(max_workers=max_workers, api_url=stub.url, max_retries=0) as api:
+            # Первый вызов загружает дерево регионов, остальные идут по индексу
+            results.append(measure("api", "get_area_id_cold", 1, lambda i: api.get_area_id("Казань"), 1, 1, False))
+            results.append(measure("api", "get_area_id", 1, lambda i: api.get_area_id("Москва"), repeat))
+            results.append(
+                measure(
+                    "api", "search_page", HeadHunterAPI.PER_PAGE,
+                    lambda i: api.search("python", 113), repeat, HeadHunterAPI.PER_PAGE,
+                )
+            )
+            depth = min(found, HeadHunterAPI.MAX_DEPTH)
+            pages = max(1, repeat // 5)
+            results.append(
+                measure("api", "search_all_pages", depth, lambda i: api.search("python", 113, True), pages, depth)
+            )
+            items = api.search("python", 113, True)["items"]
+
+            def parse(i: int) -> None:
+                Vacancy.from_api_items(items)
+
+            results.append(measure("api", "from_api_items", len(items), parse, repeat, len(items)))
+    return results
+
+
+def run_storage_benchmarks(
+    size: int,
+    storage_format: str = "json",
+    repeat: int = 20,
+    directory: Optional[str] = None,
+) -> List[BenchmarkResult]:
+    """Замер add/get/remove и top-N хранилища на size синтетических вакансиях"""
+    suite = f"storage:{storage_format}"
+    vacancies = synthetic_vacancies(size)
+    extra = synthetic_vacancies(repeat + 1, seed=1, prefix="extra")
+    results = []
+
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        opened = []
+
+        def load(i: int) -> None:
+            storage = open_storage(os.path.join(tmp, f"load{i}.{storage_format}"), storage_format)
+            storage.add_vacancies(vacancies)
+            opened.append(storage)
+
+        results.append(measure(suite, "add_vacancies", size, load, 1, size))
+        storage = opened[0]
+        for other in opened[1:]:
+            _close(other)
+
+        try:
+            results.append(measure(suite, "add_vacancy", size, lambda i: storage.add_vacancy(extra[i]), repeat))
+
+            def query(i: int) -> None:
+                storage.get_vacancies(QUERIES[i % len(QUERIES)])
+
+            results.append(measure(suite, "get_vacancies", size, query, repeat))
+            if hasattr(storage, "search_vacancies"):
+
+                def search(i: int) -> None:
+                    storage.search_vacancies(SEARCH_QUERIES[i % len(SEARCH_QUERIES)])
+
+                results.append(measure(suite, "search_vacancies", size, search, repeat))
+            results.append(measure(suite, "top_by_salary", size, lambda i: storage.top_by_salary(TOP_N), repeat))
+            results.append(
+                measure(suite, "top_by_salary_area", size, lambda i: storage.top_by_salary(TOP_N, "Москва"), repeat)
+            )
+            results.append(
+                measure(suite, "remove_vacancy", size, lambda i: storage.remove_vacancy(extra[i].url), repeat)
+            )
+        finally:
+            _close(storage)
+    return results
+
+
+def _close(storage: Any) -> None:
+    """Закрытие хранилища, если у него есть метод close"""
+    close = getattr(storage, "close", None)
+    if close is not None:
+        close()
+
+
+def _git_revision() -> Optional[str]:
+    """Короткий хеш текущего коммита или None вне репозитория git"""
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def environment() -> Dict[str, Any]:
+    """Сведения об окружении для сопоставления результатов между версиями"""
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(current: List[Dict[str, Any]], baseline: List[Dict[str, Any]]) -> List[str]:
+    """Строки сравнения p50 и пропускной способности с прошлым прогоном"""
+    previous = {(row["suite"], row["name"], row["size"]): row for row in baseline}
+    lines = []
+    for row in current:
+        old = previous.get((row["suite"], row["name"], row["size"]))
+        if old is None or not old["p50"] or not old["throughput"]:
+            continue
+        latency = (row["p50"] - old["p50"]) / old["p50"] * 100
+        throughput = (row["throughput"] - old["throughput"]) / old["throughput"] * 100
+        lines.append(
+            f"{row['suite']:<16} {row['name']:<20} {row['size']:>8}  p50 {latency:+7.1f}%  "
+            f"пропускная способность {throughput:+7.1f}%"
+        )
+    return lines
+
+
+def format_result(result: BenchmarkResult) -> str:
+    """Строка таблицы результатов для вывода в консоль"""
+    memory = f"{result.peak_memory / 1024:>10.0f} КиБ" if result.peak_memory is not None else f"{'-':>14}"
+    return (
+        f"{result.suite:<16} {result.name:<20} {result.size:>8} "
+        f"{result.throughput:>12.1f}/с  p50 {result.p50 * 1000:>9.3f} мс  p99 {result.p99 * 1000:>9.3f} мс {memory}"
+    )
+
+
+def main(argv: Optional[List[str]] = None, output: Callable[[str], None] = print) -> List[BenchmarkResult]:
+    """Командная строка: прогон бенчмарков и сохранение результатов в JSON"""
+    parser = argparse.ArgumentParser(description="Бенчмарки клиента API и хранилищ вакансий")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="размеры хранилища")
+    parser.add_argument(
+        "--formats", nargs="+", choices=sorted(STORAGE_FORMATS), default=["json"], help="форматы хранилищ"
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="число повторов каждой операции")
+    parser.add_argument("--latency", type=float, default=0.0, help="задержка заглушки API в секундах")
+    parser.add_argument("--workers", type=int, default=8, help="потоков HeadHunterAPI")
+    parser.add_argument("--skip-api", action="store_true", help="не запускать бенчмарки API")
+    parser.add_argument("--skip-storage", action="store_true", help="не запускать бенчмарки хранилищ")
+    parser.add_argument("--output", help="файл для сохранения результатов в JSON")
+    parser.add_argument("--baseline", help="JSON прошлого прогона для сравнения")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat должен быть положительным")
+
+    results: List[BenchmarkResult] = []
+    if not args.skip_api:
+        for result in run_api_benchmarks(args.latency, args.repeat, args.workers):
+            output(format_result(result))
+            results.append(result)
+    if not args.skip_storage:
+        for storage_format in args.formats:
+            for size in args.sizes:
+                for result in run_storage_benchmarks(size, storage_format, args.repeat):
+                    output(format_result(result))
+                    results.append(result)
+
+    rows = [result.to_dict() for result in results]
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        output("\nИзменение относительно базового прогона:")
+        for line in compare(rows, baseline):
+            output(line)
+    if args.output:
+        report = {"environment": environment(), "options": vars(args), "results": rows}
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
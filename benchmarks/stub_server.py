@@ -0,0 +1,132 @@
+import copy
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_fixture(name: str, fixtures_dir: str = FIXTURES_DIR) -> Any:
+    """Загрузка записанного ответа hh.ru из каталога фикстур"""
+    with open(os.path.join(fixtures_dir, name), encoding="utf-8") as file:
+        return json.load(file)
+
+
+class StubHeadHunterServer:
+    """Локальная заглушка API hh.ru на записанных ответах.
+
+    Отдает /areas, постраничные /vacancies и детали /vacancies/{id}
+    с полным описанием. Страница выдачи собирается
+    из записанных вакансий с уникальными id и ссылками, чтобы объем
+    ответа соответствовал per_page. latency - задержка каждого ответа в
+    секундах, found - общее число вакансий в выдаче.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        found: int = 2000,
+        fixtures_dir: str = FIXTURES_DIR,
+    ) -> None:
+        self.latency = latency
+        self.found = found
+        self.requests = 0
+        self.__lock = threading.Lock()
+        self._areas_body = json.dumps(load_fixture("areas.json", fixtures_dir), ensure_ascii=False).encode("utf-8")
+        self.__templates: List[Dict[str, Any]] = load_fixture("vacancies.json", fixtures_dir)["items"]
+        self.__server = ThreadingHTTPServer(("127.0.0.1", 0), self.__handler())
+        self.__server.daemon_threads = True
+        self.__thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Базовый адрес заглушки для параметра api_url"""
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubHeadHunterServer":
+        """Запуск сервера в фоновом потоке"""
+        self.__thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+        self.__thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Остановка сервера и ожидание фонового потока"""
+        self.__server.shutdown()
+        self.__server.server_close()
+        if self.__thread is not None:
+            self.__thread.join()
+
+    def __enter__(self) -> "StubHeadHunterServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def vacancies_page(self, page: int, per_page: int) -> Dict[str, Any]:
+        """Страница выдачи из размноженных записанных вакансий"""
+        pages = -(-self.found // per_page)
+        start = page * per_page
+        items = []
+        for number in range(start, min(start + per_page, self.found)):
+            item = copy.deepcopy(self.__templates[number % len(self.__templates)])
+            item["id"] = str(number + 1)
+            item["alternate_url"] = f"https://hh.ru/vacancy/{number + 1}"
+            items.append(item)
+        return {"found": self.found, "pages": pages, "per_page": per_page, "page": page, "items": items}
+
+    def vacancy_detail(self, vacancy_id: int) -> Dict[str, Any]:
+        """Детали вакансии: запись выдачи с HTML-описанием"""
+        item = copy.deepcopy(self.__templates[(vacancy_id - 1) % len(self.__templates)])
+        item["id"] = str(vacancy_id)
+        item["alternate_url"] = f"https://hh.ru/vacancy/{vacancy_id}"
+        snippet = item.pop("snippet")
+        item["description"] = (
+            f"<p><strong>Обязанности:</strong></p><ul><li>{snippet['responsibility'] or ''}</li></ul>"
+            f"<p><strong>Требования:</strong></p><ul><li>{snippet['requirement']}</li></ul>"
+        )
+        return item
+
+    def _record_request(self) -> None:
+        """Подсчет запроса из потока обработчика"""
+        with self.__lock:
+            self.requests += 1
+
+    def __handler(self) -> type:
+        """Приватный метод создания класса обработчика запросов к заглушке"""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                """Ответ на GET: регионы, страница выдачи или детали вакансии"""
+                stub._record_request()
+                if stub.latency:
+                    time.sleep(stub.latency)
+                parsed = urlparse(self.path)
+                if parsed.path == "/areas":
+                    body = stub._areas_body
+                elif parsed.path == "/vacancies":
+                    query = parse_qs(parsed.query)
+                    page = int(query.get("page", ["0"])[0])
+                    per_page = int(query.get("per_page", ["20"])[0])
+                    body = json.dumps(stub.vacancies_page(page, per_page), ensure_ascii=False).encode("utf-8")
+                elif parsed.path.startswith("/vacancies/") and parsed.path[11:].isdigit():
+                    body = json.dumps(stub.vacancy_detail(int(parsed.path[11:])), ensure_ascii=False).encode("utf-8")
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                """Отключение журнала запросов в stderr"""
+                pass
+
+        return Handler
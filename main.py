@@ -1,21 +1,208 @@
+import argparse
 import os
-from src.vacancy import Vacancy
-from src.api_connector import HeadHunterAPI
-from src.data_saver import JSONVacancyStorage
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional, Tuple
 
+# Тяжелые модули (requests, numpy, asyncio) импортируются при первом
+# использовании, чтобы меню появлялось сразу после запуска
+if TYPE_CHECKING:
+    from src.api_connector import HeadHunterAPI
+    from src.data_saver import JSONVacancyStorage
+    from src.rate_limiter import EndpointRateLimiter
 
-def main() -> None:
-    """Основная функция взаимодействия с пользователем"""
-    api = HeadHunterAPI()
-    path = os.path.join(os.path.dirname(__file__), "data", "vacancies.json")
-    storage = JSONVacancyStorage(path)
+STARTED = time.perf_counter()
 
-    region = input("Введите населенный пункт (город, регион и т.п.): ").strip()
-    region_id = api.get_area_id(region)
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+RATE_LIMIT_FILE = os.path.join(DATA_DIR, "rate_limit.db")
+DEFAULT_RATE = 5.0  # запросов к /vacancies в секунду
+AREAS_RATE = 0.5  # дерево регионов запрашивается редко
+# Ключи src.harvester.STORAGE_FORMATS: модуль не импортируется ради разбора аргументов
+STORAGE_FORMAT_NAMES = ("binary", "json", "jsonl", "sqlite")
+
+
+def make_rate_limiter(rate: float = DEFAULT_RATE, filename: str = RATE_LIMIT_FILE) -> "EndpointRateLimiter":
+    """Ограничитель частоты запросов к hh.ru, общий для всех процессов с тем же файлом"""
+    from src.rate_limiter import endpoint_limits
+
+    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+    return endpoint_limits(
+        {"/vacancies": (rate, max(1.0, rate)), "/areas": (AREAS_RATE, 1.0)},
+        filename=filename,
+    )
+
+
+class StartupProfile:
+    """Замеры этапов запуска для --profile-startup.
+
+    Этапы записываются из любого потока вместе с его именем, время
+    начала отсчитывается от импорта модуля main.
+    """
+
+    def __init__(self, started: float = STARTED) -> None:
+        self.started = started
+        self.__phases: List[Tuple[str, str, float, float]] = []
+        self.__lock = threading.Lock()
+
+    def __record(self, name: str, begin: float, end: float) -> None:
+        with self.__lock:
+            self.__phases.append((threading.current_thread().name, name, begin - self.started, end - begin))
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Замер длительности этапа name"""
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.__record(name, begin, time.perf_counter())
+
+    def mark(self, name: str) -> None:
+        """Отметка момента без длительности (например, первое приглашение)"""
+        now = time.perf_counter()
+        self.__record(name, now, now)
+
+    def report(self) -> List[str]:
+        """Строки отчета: начало и длительность этапов в порядке начала"""
+        with self.__lock:
+            phases = sorted(self.__phases, key=lambda phase: phase[2])
+        lines = ["Этапы запуска (начало, длительность, поток, этап):"]
+        for thread, name, offset, duration in phases:
+            lines.append(f"{offset * 1000:9.1f} мс {duration * 1000:9.1f} мс  {thread:<16} {name}")
+        return lines
+
+
+class APIPrefetch:
+    """Фоновое создание клиента API и загрузка дерева регионов.
+
+    Импорт requests, создание сессии и загрузка /areas выполняются в
+    отдельном потоке, пока пользователь вводит регион. get дожидается
+    окончания загрузки; ошибка фонового потока выбрасывается из get.
+    close закрывает созданный клиент, даже если загрузка регионов не
+    удалась, и не ждет сеть дольше close_timeout секунд: незавершенный
+    поток закроет клиент сам, когда загрузка закончится.
+    """
+
+    def __init__(
+        self, factory: Callable[[], "HeadHunterAPI"], profile: StartupProfile, close_timeout: float = 0.5
+    ) -> None:
+        self.__factory = factory
+        self.__profile = profile
+        self.__close_timeout = close_timeout
+        self.__api: Optional["HeadHunterAPI"] = None
+        self.__error: Optional[BaseException] = None
+        self.__lock = threading.Lock()
+        self.__done = False
+        self.__closed = False
+        self.__thread = threading.Thread(target=self.__run, name="api-prefetch", daemon=True)
+        self.__thread.start()
+
+    def __run(self) -> None:
+        try:
+            with self.__profile.phase("импорт и создание клиента API"):
+                self.__api = api = self.__factory()
+            with self.__profile.phase("загрузка дерева регионов"):
+                api.load_areas()
+        except BaseException as e:
+            self.__error = e
+        finally:
+            with self.__lock:
+                self.__done = True
+                closed = self.__closed
+            if closed:
+                self.__close_api()
+
+    def get(self) -> "HeadHunterAPI":
+        """Клиент API после окончания фоновой загрузки"""
+        if self.__thread.is_alive():
+            with self.__profile.phase("ожидание фоновой загрузки API"):
+                self.__thread.join()
+        if self.__error is not None:
+            raise self.__error
+        return self.__api
+
+    def __close_api(self) -> None:
+        """Приватный метод закрытия клиента, его ограничителя запросов и кеша деталей"""
+        api = self.__api
+        if api is None:
+            return
+        api.close()
+        api.rate_limiter.close()
+        if api.detail_cache is not None:
+            api.detail_cache.close()
+
+    def close(self) -> None:
+        """Закрытие клиента API без долгого ожидания фоновой загрузки.
+
+        Если поток не завершился за close_timeout, клиент закрывает сам
+        поток по окончании загрузки.
+        """
+        self.__thread.join(self.__close_timeout)
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            done = self.__done
+        if done:
+            self.__close_api()
+
+
+def make_interactive_api() -> "HeadHunterAPI":
+    """Клиент hh.ru для интерактивного режима"""
+    from src.api_cache import MemoryCache
+    from src.api_connector import HeadHunterAPI
 
-    if not region_id:
-        print("Регион не найден. Используется значение по умолчанию (Россия).")
-        region_id = 113  # Россия по умолчанию
+    return HeadHunterAPI(
+        areas_cache_path=os.path.join(DATA_DIR, "areas.json"),
+        cache=MemoryCache(ttl=300),
+        rate_limiter=make_rate_limiter(),
+    )
+
+
+def main(profile_startup: bool = False) -> None:
+    """Основная функция взаимодействия с пользователем.
+
+    Клиент API создается в фоне (APIPrefetch), первое приглашение
+    выводится без ожидания сети. С profile_startup по завершении в
+    stderr выводятся замеры этапов запуска.
+    """
+    profile = StartupProfile()
+    profile.mark("запуск main")
+    # Хранилище создается до запуска фонового потока: параллельные
+    # импорты конкурируют за GIL и задерживают первое приглашение
+    with profile.phase("создание хранилища"):
+        from src.data_saver import JSONVacancyStorage, StorageCorruptedError
+
+        storage = JSONVacancyStorage(os.path.join(DATA_DIR, "vacancies.json"))
+    prefetch = APIPrefetch(make_interactive_api, profile)
+    try:
+        run_menu(prefetch, storage, profile)
+    except (EOFError, KeyboardInterrupt):
+        print("\nВыход из программы.")
+    except StorageCorruptedError as e:
+        # Поврежденный файл без резервной копии: восстановить данные нечем
+        print(f"\nОшибка хранилища: {e}")
+    finally:
+        prefetch.close()
+        storage.close()
+        if profile_startup:
+            for line in profile.report():
+                print(line, file=sys.stderr)
+
+
+def run_menu(prefetch: APIPrefetch, storage: "JSONVacancyStorage", profile: StartupProfile) -> None:
+    """Диалог с пользователем: ввод региона и меню действий.
+
+    Регион разрешается при первом поиске, поэтому меню не ждет
+    загрузки клиента API и дерева регионов.
+    """
+    from src.vacancy import Vacancy
+
+    profile.mark("приглашение ввода региона")
+    region = input("Введите населенный пункт (город, регион и т.п.): ").strip()
+    region_id: Optional[int] = None
 
     while True:
         print("\nМеню:")
@@ -23,6 +210,7 @@ def main() -> None:
         print("2. Получить топ N вакансий по зарплате")
         print("3. Получить вакансии по ключевому слову в описании")
         print("4. Выход")
+        profile.mark("меню")
         choice = input("\nВыберите действие: ").strip()
 
         if choice == "1":
@@ -31,30 +219,29 @@ def main() -> None:
                 print("Ошибка: запрос не может быть пустым")
                 continue
 
+            api = prefetch.get()
+            if region_id is None:
+                region_id = api.get_area_id(region)
+                if not region_id:
+                    print("Регион не найден. Используется значение по умолчанию (Россия).")
+                    region_id = api.DEFAULT_AREA_ID
+
             vacancies = api.get_vacancies(query, region_id)
             if not vacancies:
-                print("По вашему запросу вакансий не найдено.")
+                if api.last_error:
+                    print(f"Ошибка API: {api.last_error}")
+                else:
+                    print("По вашему запросу вакансий не найдено.")
                 continue
 
-            for item in vacancies:
-                salary = item.get("salary", {})
-                salary_from = salary.get("from")
-                salary_to = salary.get("to")
-                requirement = item.get("snippet", {}).get("requirement", "")
-
-                try:
-                    vacancy = Vacancy(
-                        name=item["name"],
-                        area=item["area"]["name"],
-                        url=item["alternate_url"],
-                        salary_from=salary_from,
-                        salary_to=salary_to,
-                        description=requirement,
-                    )
-                    print(vacancy)
-                    storage.add_vacancy(vacancy)
-                except ValueError as e:
-                    print(f"Ошибка обработки вакансии: {e}")
+            parsed, errors = Vacancy.from_api_items(vacancies)
+            for vacancy in parsed:
+                print(vacancy)
+            for _, error in errors:
+                print(f"Ошибка обработки вакансии: {error}")
+
+            result = storage.add_vacancies(parsed)
+            print(f"Сохранено новых вакансий: {result.inserted}, пропущено дубликатов: {result.skipped}")
 
         elif choice == "2":
             top_amount = input("Введите количество вакансий для топа: ").strip()
@@ -67,23 +254,13 @@ def main() -> None:
                 print("Ошибка: количество должно быть положительным числом")
                 continue
 
-            all_vacancies = storage.get_vacancies("")
-            if not all_vacancies:
+            top_vacancies = storage.top_by_salary(top_amount)
+            if not top_vacancies:
                 print("Нет сохраненных вакансий.")
                 continue
 
-            # Сортировка по максимальной зарплате
-            sorted_vacancies = sorted(
-                all_vacancies,
-                key=lambda v: max(
-                    v.salary_to if v.salary_to is not None else 0,
-                    v.salary_from if v.salary_from is not None else 0,
-                ),
-                reverse=True,
-            )
-
             # Выводим ровно top_amount вакансий
-            for i, vacancy in enumerate(sorted_vacancies[:top_amount], 1):
+            for i, vacancy in enumerate(top_vacancies, 1):
                 print(f"\nВакансия #{i}")
                 print(vacancy)
 
@@ -111,5 +288,158 @@ def main() -> None:
             print("Неверный выбор. Пожалуйста, введите число от 1 до 4.")
 
 
+def run_batch(
+    jobs_file: str,
+    storage_path: str,
+    concurrency: int,
+    rate: float,
+    incremental: bool = False,
+    storage_format: Optional[str] = None,
+    metrics_path: Optional[str] = None,
+    rate_file: str = RATE_LIMIT_FILE,
+    enrich: bool = False,
+    max_age_days: Optional[float] = None,
+    near_duplicates: bool = False,
+) -> None:
+    """Пакетный сбор вакансий по файлу заданий без интерактивного ввода.
+
+    Если указан metrics_path, по завершении в него записываются метрики
+    API и хранилища в формате OpenMetrics. С enrich вакансии дополняются
+    полными описаниями, которые кэшируются в DATA_DIR/details.db.
+    С max_age_days после сбора удаляются вакансии, загруженные раньше.
+    С near_duplicates почти-дубликаты сохраненных вакансий (переопубликованные
+    под новым URL) не сохраняются, подписи хранятся в STORAGE.minhash.npz.
+    """
+    import asyncio
+
+    from src.api_cache import SQLiteCache
+    from src.api_connector import HeadHunterAPI
+    from src.harvester import harvest, open_storage, parse_jobs
+    from src.metrics import MetricsRegistry
+    from src.near_duplicates import NearDuplicateStorage
+    from src.sync import IncrementalSync, SyncState
+
+    with open(jobs_file, "r", encoding="utf-8") as file:
+        jobs = parse_jobs(file)
+
+    metrics = MetricsRegistry() if metrics_path else None
+    api = HeadHunterAPI(
+        areas_cache_path=os.path.join(DATA_DIR, "areas.json"),
+        rate_limiter=make_rate_limiter(rate, rate_file),
+        metrics=metrics,
+        enrich=enrich,
+        detail_cache=SQLiteCache(os.path.join(DATA_DIR, "details.db")) if enrich else None,
+    )
+    storage = None
+    try:
+        storage = open_storage(storage_path, storage_format)
+        if metrics is not None:
+            storage.metrics = metrics
+        if near_duplicates:
+            storage = NearDuplicateStorage(storage, index_filename=f"{storage_path}.minhash.npz")
+        syncer = IncrementalSync(api, SyncState(f"{storage_path}.sync.json")) if incremental else None
+
+        started = time.perf_counter()
+        reports = asyncio.run(harvest(api, storage, jobs, concurrency=concurrency, syncer=syncer))
+        elapsed = time.perf_counter() - started
+
+        fetched = sum(report.fetched for report in reports)
+        inserted = sum(report.inserted for report in reports)
+        print(
+            f"\nЗаданий: {len(reports)}, получено вакансий: {fetched}, новых: {inserted}, "
+            f"время: {elapsed:.2f} с ({fetched / elapsed if elapsed else 0:.0f} вак./с)"
+        )
+        if max_age_days is not None:
+            print(f"Удалено устаревших вакансий: {storage.prune(max_age_days * 24 * 60 * 60)}")
+        if isinstance(storage, NearDuplicateStorage):
+            print(f"Отсеяно почти-дубликатов: {len(storage.duplicates)}")
+    finally:
+        close_storage = getattr(storage, "close", None)
+        if close_storage is not None:
+            close_storage()
+        api.close()
+        api.rate_limiter.close()
+        if api.detail_cache is not None:
+            api.detail_cache.close()
+    if metrics is not None:
+        with open(metrics_path, "w", encoding="utf-8") as file:
+            file.write(metrics.to_openmetrics())
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Поиск вакансий на hh.ru")
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help='файл заданий для пакетного сбора: строки вида "запрос; регион1, регион2"',
+    )
+    parser.add_argument(
+        "--storage",
+        default=os.path.join(DATA_DIR, "vacancies.json"),
+        help="файл хранилища для пакетного сбора (.json, .jsonl, .db, .jvb)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=STORAGE_FORMAT_NAMES,
+        help="формат хранилища, если он не определяется по расширению",
+    )
+    parser.add_argument("--concurrency", type=int, default=4, help="одновременных заданий")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="запросов к API в секунду")
+    parser.add_argument(
+        "--rate-file",
+        default=RATE_LIMIT_FILE,
+        help="файл ограничителя частоты, общий для одновременно запущенных процессов",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="загружать только вакансии, опубликованные после прошлого запуска",
+    )
+    parser.add_argument(
+        "--enrich",
+        action="store_true",
+        help="загружать полные описания вакансий для поиска по ключевым словам",
+    )
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        metavar="DAYS",
+        help="удалить из хранилища вакансии, загруженные более DAYS дней назад",
+    )
+    parser.add_argument(
+        "--near-duplicates",
+        action="store_true",
+        help="не сохранять почти-дубликаты вакансий с другим URL",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="FILE",
+        help="файл для метрик пакетного сбора в формате OpenMetrics",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="вывести в stderr длительность этапов запуска интерактивного режима",
+    )
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.batch:
+        run_batch(
+            args.batch,
+            args.storage,
+            args.concurrency,
+            args.rate,
+            args.incremental,
+            args.format,
+            args.metrics,
+            args.rate_file,
+            args.enrich,
+            args.max_age,
+            args.near_duplicates,
+        )
+    else:
+        main(args.profile_startup)
@@ -0,0 +1,215 @@
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from src.api_connector import JobPlatformAPI
+from src.keyword_index import tokenize
+from src.metrics import NULL_METRICS, MetricsObserver
+
+logger = logging.getLogger(__name__)
+
+DedupeKey = Tuple[str, str, Optional[int], Optional[int]]
+
+
+def normalize_text(value: Optional[str]) -> str:
+    """Текст для сравнения: слова в нижнем регистре без пунктуации и разметки"""
+    return " ".join(tokenize(value or ""))
+
+
+def dedupe_key(item: Dict[str, Any]) -> Optional[DedupeKey]:
+    """Ключ дедупликации записи выдачи в формате hh.ru.
+
+    Совпадают нормализованные название и работодатель и границы
+    зарплаты. Для записей без названия или с некорректной структурой
+    возвращается None: такие записи не сравниваются.
+    """
+    try:
+        salary = item.get("salary") or {}
+        employer = item.get("employer") or {}
+        name = normalize_text(item.get("name"))
+        key = (name, normalize_text(employer.get("name")), salary.get("from"), salary.get("to"))
+    except (AttributeError, TypeError):
+        return None
+    return key if name else None
+
+
+class ProviderResult(NamedTuple):
+    """Ответ одной платформы: новые записи после дедупликации"""
+
+    provider: str
+    items: List[Dict[str, Any]]
+    fetched: int
+    duplicates: int
+    seconds: float
+    error: Optional[str] = None
+
+    def __str__(self) -> str:
+        if self.error:
+            return f"{self.provider}: ошибка - {self.error}"
+        return (
+            f"{self.provider}: получено {self.fetched}, новых {len(self.items)}, "
+            f"дубликатов {self.duplicates} за {self.seconds:.2f} с"
+        )
+
+
+class AggregatedResult(NamedTuple):
+    """Объединенная выдача всех платформ"""
+
+    items: List[Dict[str, Any]]
+    providers: List[ProviderResult]
+
+    @property
+    def complete(self) -> bool:
+        """Все платформы ответили без ошибок и в срок"""
+        return all(result.error is None for result in self.providers)
+
+
+class _Provider(NamedTuple):
+    api: JobPlatformAPI
+    timeout: Optional[float]
+
+
+class PlatformAggregator:
+    """Параллельный поиск вакансий на нескольких платформах.
+
+    Запрос выполняется на всех зарегистрированных платформах
+    (JobPlatformAPI) одновременно, каждая - в своем потоке. Ответы
+    объединяются по мере поступления, повторы между платформами
+    отбрасываются по dedupe_key: остается запись платформы, ответившей
+    первой. Платформа, не уложившаяся в свой timeout, попадает в
+    результат с ошибкой и не задерживает остальные.
+
+    В metrics записываются итоги платформ (aggregator_providers с
+    метками provider и result) и число отброшенных дубликатов.
+    """
+
+    def __init__(
+        self,
+        providers: Optional[Dict[str, JobPlatformAPI]] = None,
+        timeout: float = 30.0,
+        metrics: Optional[MetricsObserver] = None,
+    ) -> None:
+        if timeout <= 0:
+            raise ValueError("Таймаут должен быть положительным")
+        self.timeout = timeout
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+        self.__providers: Dict[str, _Provider] = {}
+        for name, api in (providers or {}).items():
+            self.register(name, api)
+
+    def register(self, name: str, api: JobPlatformAPI, timeout: Optional[float] = None) -> None:
+        """Регистрация платформы; timeout переопределяет общий таймаут"""
+        if name in self.__providers:
+            raise ValueError(f"Платформа {name} уже зарегистрирована")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("Таймаут должен быть положительным")
+        self.__providers[name] = _Provider(api, timeout)
+
+    @property
+    def providers(self) -> List[str]:
+        """Имена зарегистрированных платформ в порядке регистрации"""
+        return list(self.__providers)
+
+    def close(self) -> None:
+        """Закрытие HTTP-сессий всех платформ"""
+        for provider in self.__providers.values():
+            provider.api.close()
+
+    def __enter__(self) -> "PlatformAggregator":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @staticmethod
+    def __fetch(api: JobPlatformAPI, query: str, region: Optional[str]) -> List[Dict[str, Any]]:
+        """Приватный метод поиска на одной платформе.
+
+        Регион разрешается через get_area_id платформы, поэтому его
+        загрузка тоже учитывается таймаутом. Ошибки API выбрасываются
+        как ConnectionError.
+        """
+        area_id = None
+        if region:
+            area_id = api.get_area_id(region)
+            if area_id is None:
+                raise ConnectionError(api.last_error or "регион не найден")
+        items = api.get_vacancies(query, area_id)
+        if not items and api.last_error:
+            raise ConnectionError(api.last_error)
+        return items
+
+    def __merge(
+        self, name: str, items: List[Dict[str, Any]], seen: Set[DedupeKey], seconds: float
+    ) -> ProviderResult:
+        """Приватный метод добавления ответа платформы к объединенной выдаче"""
+        unique = []
+        for item in items:
+            key = dedupe_key(item)
+            if key is not None:
+                if key in seen:
+                    continue
+                seen.add(key)
+            unique.append(item)
+        duplicates = len(items) - len(unique)
+        self.metrics.increment("aggregator_providers", provider=name, result="ok")
+        if duplicates:
+            self.metrics.increment("aggregator_duplicates", duplicates, provider=name)
+        return ProviderResult(name, unique, len(items), duplicates, seconds)
+
+    def __failed(self, name: str, error: str, seconds: float, result: str) -> ProviderResult:
+        """Приватный метод результата платформы, завершившейся ошибкой"""
+        logger.warning("Платформа %s: %s", name, error)
+        self.metrics.increment("aggregator_providers", provider=name, result=result)
+        return ProviderResult(name, [], 0, 0, seconds, error)
+
+    def iter_search(self, query: str, region: Optional[str] = None) -> Iterator[ProviderResult]:
+        """Поиск с выдачей результатов платформ по мере их поступления.
+
+        region - название региона, у каждой платформы он разрешается в
+        ее собственный ID; без региона платформа ищет по умолчанию.
+        Платформы, не ответившие в срок, выдаются последними с ошибкой,
+        их потоки не ожидаются.
+        """
+        if not self.__providers:
+            return
+        executor = ThreadPoolExecutor(max_workers=len(self.__providers), thread_name_prefix="aggregator")
+        started = time.monotonic()
+        pending: Dict["Future[List[Dict[str, Any]]]", Tuple[str, float]] = {}
+        for name, provider in self.__providers.items():
+            timeout = provider.timeout if provider.timeout is not None else self.timeout
+            future = executor.submit(self.__fetch, provider.api, query, region)
+            pending[future] = (name, started + timeout)
+
+        seen: Set[DedupeKey] = set()
+        try:
+            while pending:
+                deadline = min(deadline for _, deadline in pending.values())
+                done, _ = wait(pending, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+                now = time.monotonic()
+                for future in done:
+                    name, _ = pending.pop(future)
+                    try:
+                        items = future.result()
+                    except Exception as e:
+                        yield self.__failed(name, str(e), now - started, "error")
+                    else:
+                        yield self.__merge(name, items, seen, now - started)
+                for future, (name, deadline) in list(pending.items()):
+                    if deadline <= now and not future.done():
+                        del pending[future]
+                        future.cancel()
+                        yield self.__failed(name, "превышено время ожидания", now - started, "timeout")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def search(self, query: str, region: Optional[str] = None) -> AggregatedResult:
+        """Поиск на всех платформах с объединенной выдачей без дубликатов.
+
+        Записи идут в порядке поступления ответов платформ, результаты
+        платформ - в порядке регистрации.
+        """
+        results = {result.provider: result for result in self.iter_search(query, region)}
+        items = [item for result in results.values() for item in result.items]
+        return AggregatedResult(items, [results[name] for name in self.__providers if name in results])
@@ -0,0 +1,237 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+from urllib.parse import urlencode
+
+
+class CacheEntry(NamedTuple):
+    """Закэшированный ответ API с метаданными для ревалидации"""
+
+    value: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+
+class CacheStats:
+    """Потокобезопасные счетчики попаданий в кэш"""
+
+    __slots__ = ("hits", "misses", "revalidations", "_lock")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._lock = threading.Lock()
+
+    def record(self, kind: str) -> None:
+        """Учет события: hits, misses или revalidations"""
+        with self._lock:
+            setattr(self, kind, getattr(self, kind) + 1)
+
+    @property
+    def hit_ratio(self) -> float:
+        """Доля запросов, обслуженных без загрузки тела ответа"""
+        total = self.hits + self.misses + self.revalidations
+        return (self.hits + self.revalidations) / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Возвращает словарь со значениями счетчиков"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "hit_ratio": self.hit_ratio,
+            }
+
+
+def make_key(url: str, params: Dict[str, Any]) -> str:
+    """Нормализованный ключ запроса: параметры отсортированы, строки без регистра"""
+    normalized = []
+    for name, value in sorted(params.items()):
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        elif isinstance(value, str):
+            value = " ".join(value.split()).casefold()
+        normalized.append((name, str(value)))
+    return f"{url}?{urlencode(normalized)}"
+
+
+class ResponseCache(ABC):
+    """Абстрактный кэш ответов API с TTL.
+
+    get возвращает запись и после истечения TTL: устаревшую запись можно
+    ревалидировать условным запросом вместо повторной загрузки.
+    """
+
+    def __init__(self, ttl: float = 300.0) -> None:
+        self.ttl = ttl
+        self.stats = CacheStats()
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Запись не старше TTL"""
+        return time.time() - entry.stored_at < self.ttl
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Получение записи по ключу"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Сохранение записи"""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Очистка кэша"""
+        pass
+
+
+class MemoryCache(ResponseCache):
+    """Кэш в памяти с вытеснением давно не использованных записей (LRU)"""
+
+    def __init__(self, ttl: float = 300.0, maxsize: int = 1024) -> None:
+        super().__init__(ttl)
+        self.maxsize = maxsize
+        self.__entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                self.__entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self.__lock:
+            self.__entries[key] = entry
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+
+class SQLiteCache(ResponseCache):
+    """Дисковый кэш в SQLite, при переполнении удаляются самые старые записи.
+
+    Число записей оценивается счетчиком в памяти (каждая запись считается
+    новой), поэтому set не подсчитывает строки таблицы. Когда оценка
+    превышает max_entries, число строк уточняется запросом, и при
+    переполнении одним запросом удаляются самые старые записи с запасом
+    в evict_fraction от max_entries, чтобы следующие записи не вызывали
+    вытеснение каждый раз.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        ttl: float = 24 * 60 * 60,
+        max_entries: int = 100_000,
+        evict_fraction: float = 0.1,
+    ) -> None:
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self.evict_fraction = evict_fraction
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(filename, timeout=30.0, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        with self.__connection:
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, etag TEXT, "
+                "last_modified TEXT, stored_at REAL NOT NULL)"
+            )
+            self.__connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)"
+            )
+        self.__count = self.__connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT value, etag, last_modified, stored_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        return CacheEntry(json.loads(row[0]), row[1], row[2], row[3])
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        value = json.dumps(entry.value, ensure_ascii=False)
+        with self.__lock, self.__connection:
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, value, entry.etag, entry.last_modified, entry.stored_at),
+            )
+            self.__count += 1
+            if self.__count > self.max_entries:
+                self.__evict()
+
+    def __evict(self) -> None:
+        """Приватный метод удаления самых старых записей при переполнении.
+
+        Вызывается под блокировкой в транзакции set.
+        """
+        count = self.__connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            excess += int(self.max_entries * self.evict_fraction)
+            self.__connection.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY stored_at LIMIT ?)",
+                (excess,),
+            )
+            count = max(count - excess, 0)
+        self.__count = count
+
+    def clear(self) -> None:
+        with self.__lock, self.__connection:
+            self.__connection.execute("DELETE FROM responses")
+            self.__count = 0
+
+    def close(self) -> None:
+        """Закрытие соединения с базой"""
+        self.__connection.close()
+
+
+class TieredCache(ResponseCache):
+    """Двухуровневый кэш: LRU в памяти поверх дискового кэша"""
+
+    def __init__(self, memory: MemoryCache, disk: ResponseCache) -> None:
+        super().__init__(disk.ttl)
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self.memory.get(key)
+        if entry is None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self.memory.set(key, entry)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self.memory.set(key, entry)
+        self.disk.set(key, entry)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        self.disk.clear()
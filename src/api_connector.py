@@ -1,63 +1,718 @@
+import html
+import json
+import logging
+import random
+import re
+import threading
+import time
 import requests
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from itertools import repeat
+from typing import List, Dict, Any, Optional, Tuple, Union
+
+from requests.adapters import HTTPAdapter
+
+from src.api_cache import CacheEntry, ResponseCache, make_key
+from src.area_index import AreaCache, AreaIndex
+from src.keyword_index import tokenize
+from src.metrics import NULL_METRICS, MetricsObserver, instrument_methods
+from src.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Методы платформ, длительность которых попадает в api_call_seconds
+INSTRUMENTED_METHODS = ("_connect_to_api", "get_vacancies", "get_area_id", "search")
+
+
+class RequestStats:
+    """Потокобезопасные счетчики запросов к API"""
+
+    __slots__ = ("requests", "retries", "errors", "total_latency", "max_latency", "_lock")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self._lock = threading.Lock()
+
+    def record_request(self, latency: float) -> None:
+        """Учет выполненного HTTP-запроса и его длительности"""
+        with self._lock:
+            self.requests += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def record_retry(self) -> None:
+        """Учет повторной попытки запроса"""
+        with self._lock:
+            self.retries += 1
+
+    def record_error(self) -> None:
+        """Учет запроса, завершившегося ошибкой после всех попыток"""
+        with self._lock:
+            self.errors += 1
+
+    @property
+    def average_latency(self) -> float:
+        """Средняя длительность запроса в секундах"""
+        return self.total_latency / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Возвращает словарь со значениями счетчиков"""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "errors": self.errors,
+                "total_latency": self.total_latency,
+                "average_latency": self.average_latency,
+                "max_latency": self.max_latency,
+            }
+
+
+_BLOCK_TAG_RE = re.compile(r"<\s*(?:br|/p|/li|/div|/h\d)\s*/?>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _html_to_text(value: str) -> str:
+    """Текст описания вакансии без HTML-разметки"""
+    text = _TAG_RE.sub("", _BLOCK_TAG_RE.sub("\n", value))
+    lines = (" ".join(line.split()) for line in html.unescape(text).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Разбор заголовка Retry-After (секунды или HTTP-дата)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
 
 
 class JobPlatformAPI(ABC):
-    """Абстрактный класс для работы с API сервисов вакансий"""
+    """Абстрактный класс для работы с API сервисов вакансий.
+
+    Владеет HTTP-сессией с пулом соединений (keep-alive), таймаутами
+    и повторными попытками с экспоненциальной задержкой на 429/5xx.
+    Ответы могут кэшироваться (cache), для этого наследники получают
+    данные через _get_json. Ограничитель rate_limiter может быть общим
+    для нескольких экземпляров и процессов (SQLiteTokenBucket), лимиты
+    выбираются по адресу запроса; ответ 429 приостанавливает ограничитель.
+
+    В metrics записываются длительность и статус HTTP-запросов, объем
+    ответов, повторы, ошибки, обращения к кэшу и длительность вызовов
+    методов из INSTRUMENTED_METHODS у наследников.
+    """
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        instrument_methods(cls, "api_call_seconds", INSTRUMENTED_METHODS, platform=cls.__name__)
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        pool_size: int = 10,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        metrics: Optional[MetricsObserver] = None,
+    ) -> None:
+        if max_retries < 0:
+            raise ValueError("Количество повторов не может быть отрицательным")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.stats = RequestStats()
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+        self.last_error: Optional[str] = None
+
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = "JobHunter/1.0"
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def close(self) -> None:
+        """Закрытие HTTP-сессии"""
+        self._session.close()
+
+    def __enter__(self) -> "JobPlatformAPI":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Задержка перед повтором: Retry-After либо экспонента с полным джиттером"""
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+
+    def _request(
+        self, url: str, params: Dict[str, Any], headers: Optional[Dict[str, str]] = None
+    ) -> requests.Response:
+        """GET-запрос через сессию с повторами на 429/5xx и сетевых ошибках.
+
+        Возвращает ответ со статусом 200 (или 304 на условный запрос),
+        иначе выбрасывает ConnectionError.
+        """
+        metrics = self.metrics
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            throttled = False
+            if self.rate_limiter is not None:
+                waited = self.rate_limiter.acquire(url)
+                if metrics.enabled:
+                    metrics.observe("api_rate_limit_wait_seconds", waited)
+            started = time.perf_counter()
+            try:
+                response = self._session.get(
+                    url, params=params, headers=headers, timeout=self.timeout
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                latency = time.perf_counter() - started
+                self.stats.record_request(latency)
+                if metrics.enabled:
+                    self.__record_request(latency, "network_error")
+                error = f"Ошибка сети при обращении к {url}: {e}"
+            else:
+                latency = time.perf_counter() - started
+                self.stats.record_request(latency)
+                if metrics.enabled:
+                    self.__record_request(latency, str(response.status_code), len(response.content))
+                if response.status_code == 200 or (headers and response.status_code == 304):
+                    return response
+                error = f"Ошибка подключения к API. Статус: {response.status_code}"
+                if response.status_code not in RETRY_STATUSES:
+                    break
+                retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                throttled = response.status_code == 429 and self.rate_limiter is not None
+
+            if throttled:
+                # Пауза общего ограничителя притормаживает все потоки и процессы,
+                # которые его используют; ожидание перед повтором выполнит acquire
+                delay = self._backoff_delay(attempt, retry_after)
+                logger.debug("%s; пауза ограничителя %.2f с", error, delay)
+                self.rate_limiter.pause(delay, url)
+            if attempt < self.max_retries:
+                self.stats.record_retry()
+                metrics.increment("api_retries")
+                if not throttled:
+                    delay = self._backoff_delay(attempt, retry_after)
+                    logger.debug("%s; повтор через %.2f с", error, delay)
+                    time.sleep(delay)
+
+        self.stats.record_error()
+        metrics.increment("api_errors")
+        self.last_error = error
+        raise ConnectionError(error)
+
+    def __record_request(self, latency: float, status: str, size: int = 0) -> None:
+        """Приватный метод записи метрик одного HTTP-запроса"""
+        self.metrics.increment("api_requests", status=status)
+        self.metrics.observe("api_request_seconds", latency, status=status)
+        if size:
+            self.metrics.increment("api_response_bytes", size)
+
+    def _get_json(self, url: str, params: Dict[str, Any]) -> Any:
+        """Получение JSON-ответа с учетом кэша.
+
+        Свежая запись возвращается без запроса, устаревшая
+        ревалидируется по ETag/Last-Modified.
+        """
+        if self.cache is None:
+            return self._request(url, params).json()
+
+        key = make_key(url, params)
+        entry = self.cache.get(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            self.cache.stats.record("hits")
+            self.metrics.increment("api_cache", result="hit")
+            return entry.value
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        response = self._request(url, params, headers=headers or None)
+
+        if response.status_code == 304:
+            self.cache.stats.record("revalidations")
+            self.metrics.increment("api_cache", result="revalidation")
+            self.cache.set(key, entry._replace(stored_at=time.time()))
+            return entry.value
+
+        self.cache.stats.record("misses")
+        self.metrics.increment("api_cache", result="miss")
+        value = response.json()
+        self.cache.set(
+            key,
+            CacheEntry(
+                value,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+                time.time(),
+            ),
+        )
+        return value
 
     @abstractmethod
     def _connect_to_api(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Приватный метод для подключения к API"""
         pass
 
+    def get_area_id(self, region_name: str) -> Optional[int]:
+        """Получение ID региона платформы по названию, None если регион не найден"""
+        return None
+
     @abstractmethod
-    def get_vacancies(self, query: str, area_id: int) -> List[Dict[str, Any]]:
-        """Абстрактный метод получения вакансий"""
+    def get_vacancies(self, query: str, area_id: Optional[int]) -> List[Dict[str, Any]]:
+        """Абстрактный метод получения вакансий.
+
+        Записи возвращаются в формате выдачи hh.ru (см. Vacancy.from_api_items),
+        area_id=None - поиск без ограничения по региону. Ошибка API
+        сохраняется в last_error, результат при этом пустой.
+        """
         pass
 
 
 class HeadHunterAPI(JobPlatformAPI):
-    """Класс для работы с API hh.ru"""
+    """Класс для работы с API hh.ru.
 
-    def __init__(self) -> None:
-        self.__base_url = "https://api.hh.ru/vacancies"
-        self.__areas_url = "https://api.hh.ru/areas"
+    С enrich=True поиск дополняет вакансии полным описанием из
+    /vacancies/{id}: запросы деталей идут параллельно (не более
+    detail_workers одновременно) по мере загрузки страниц выдачи.
+    Описания хранятся в detail_cache по id и времени изменения
+    вакансии, поэтому неизменившиеся вакансии повторно не загружаются.
+    """
+
+    PER_PAGE = 100
+    MAX_DEPTH = 2000  # hh.ru не отдает больше 2000 вакансий на один запрос
+    DEFAULT_AREA_ID = 113  # Россия
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        areas_cache_path: Optional[str] = None,
+        areas_ttl: float = 24 * 60 * 60,
+        api_url: str = "https://api.hh.ru",
+        enrich: bool = False,
+        detail_workers: int = 4,
+        detail_cache: Optional[ResponseCache] = None,
+        **session_options: Any,
+    ) -> None:
+        if max_workers < 1 or detail_workers < 1:
+            raise ValueError("Количество потоков должно быть положительным")
+        session_options.setdefault("pool_size", max_workers + detail_workers)
+        super().__init__(**session_options)
+        self.__base_url = f"{api_url.rstrip('/')}/vacancies"
+        self.__areas_url = f"{api_url.rstrip('/')}/areas"
+        self.max_workers = max_workers
+        self.enrich = enrich
+        self.detail_workers = detail_workers
+        self.detail_cache = detail_cache
+        self.__areas_cache = AreaCache(areas_cache_path, areas_ttl) if areas_cache_path else None
+        self.__area_index: Optional[AreaIndex] = None
+        self.__area_lock = threading.Lock()
 
     def _connect_to_api(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Приватный метод подключения к API hh.ru с проверкой статуса"""
-        response = requests.get(url, params=params)
-        if response.status_code != 200:
-            raise ConnectionError(
-                f"Ошибка подключения к API hh.ru. Статус: {response.status_code}"
-            )
-        return response.json()
+        return self._get_json(url, params)
+
+    def __load_areas(self) -> List[Dict[str, Any]]:
+        """Приватный метод получения дерева регионов с учетом дискового кэша"""
+        cache = self.__areas_cache
+        if cache is None:
+            return self._connect_to_api(self.__areas_url, {})
+        if cache.is_fresh:
+            return cache.areas
+
+        headers = {"If-None-Match": cache.etag} if cache.areas is not None and cache.etag else None
+        try:
+            response = self._request(self.__areas_url, {}, headers=headers)
+        except ConnectionError:
+            if cache.areas is None:
+                raise
+            logger.warning("Используется устаревший кэш регионов")
+            return cache.areas
+
+        if response.status_code == 304:
+            cache.touch()
+        else:
+            cache.store(response.json(), response.headers.get("ETag"))
+        return cache.areas
+
+    def load_areas(self) -> bool:
+        """Загрузка дерева регионов, если оно еще не загружено.
+
+        Позволяет загрузить регионы заранее, например в фоне до первого
+        вызова get_area_id. Возвращает False, если регионы недоступны.
+        """
+        with self.__area_lock:
+            if self.__area_index is None:
+                try:
+                    self.__area_index = AreaIndex(self.__load_areas())
+                except ConnectionError as e:
+                    logger.warning("Не удалось получить список регионов: %s", e)
+                    return False
+        return True
 
     def get_area_id(self, region_name: str) -> Optional[int]:
         """Получение ID региона по названию"""
+        if not self.load_areas():
+            return None
+        return self.__area_index.get(region_name)
+
+    def __fetch_page(self, params: Dict[str, Any], page: int) -> Dict[str, Any]:
+        """Приватный метод загрузки одной страницы результатов поиска"""
+        return self._connect_to_api(self.__base_url, {**params, "page": page})
+
+    def __fetch_items(self, params: Dict[str, Any], page: int) -> Optional[List[Dict[str, Any]]]:
+        """Приватный метод загрузки вакансий одной страницы, None при ошибке"""
         try:
-            areas_data = self._connect_to_api(self.__areas_url, {})
-            for country in areas_data:
-                for region in country["areas"]:
-                    if region["name"].lower() == region_name.lower():
-                        return region["id"]
-                    for city in region["areas"]:
-                        if city["name"].lower() == region_name.lower():
-                            return city["id"]
+            return self.__fetch_page(params, page).get("items", [])
+        except ConnectionError as e:
+            logger.warning("Не удалось загрузить страницу %s: %s", page, e)
             return None
-        except ConnectionError:
+
+    @staticmethod
+    def __detail_key(item: Dict[str, Any]) -> str:
+        """Приватный метод ключа кэша деталей: id и версия вакансии"""
+        version = item.get("updated_at") or item.get("published_at") or ""
+        return f"{item['id']}@{version}"
+
+    def __fetch_description(self, item: Dict[str, Any]) -> Optional[str]:
+        """Приватный метод загрузки полного описания вакансии, None при ошибке"""
+        try:
+            detail = self._connect_to_api(f"{self.__base_url}/{item['id']}", {})
+        except (ConnectionError, ValueError) as e:
+            logger.warning("Не удалось загрузить описание вакансии %s: %s", item["id"], e)
+            self.metrics.increment("api_details", result="error")
             return None
+        try:
+            description = _html_to_text(detail.get("description") or "")
+        except (AttributeError, TypeError) as e:
+            logger.warning("Некорректные детали вакансии %s: %s", item["id"], e)
+            self.metrics.increment("api_details", result="error")
+            return None
+        self.metrics.increment("api_details", result="fetched")
+        if self.detail_cache is not None:
+            self.detail_cache.set(self.__detail_key(item), CacheEntry(description, None, None, time.time()))
+        return description
+
+    def __submit_details(
+        self,
+        executor: ThreadPoolExecutor,
+        items: List[Dict[str, Any]],
+        pending: List[Tuple[Dict[str, Any], "Future[Optional[str]]"]],
+    ) -> int:
+        """Приватный метод запуска загрузки описаний для страницы выдачи.
+
+        Описания из кэша подставляются сразу, возвращает их количество.
+        """
+        cached = 0
+        for item in items:
+            if not item.get("id"):
+                continue
+            if self.detail_cache is not None:
+                entry = self.detail_cache.get(self.__detail_key(item))
+                if entry is not None:
+                    self.detail_cache.stats.record("hits")
+                    self.metrics.increment("api_details", result="cached")
+                    item["description"] = entry.value
+                    cached += 1
+                    continue
+                self.detail_cache.stats.record("misses")
+            pending.append((item, executor.submit(self.__fetch_description, item)))
+        return cached
 
-    def get_vacancies(self, query: str, area_id: int) -> List[Dict[str, Any]]:
-        """Получение вакансий по запросу и региону"""
+    def search(
+        self,
+        query: str,
+        area_id: int,
+        all_pages: bool = False,
+        date_from: Optional[str] = None,
+        enrich: Optional[bool] = None,
+        order_by: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Поиск вакансий с подробным результатом.
+
+        Возвращает словарь с ключами items, found, complete и enriched.
+        complete ложно, если часть страниц не загрузилась или выдача
+        обрезана ограничением глубины. date_from (ISO 8601) ограничивает
+        выдачу вакансиями, опубликованными не раньше этой даты. enrich
+        переопределяет настройку экземпляра; полное описание попадает
+        в поле description записи, enriched - число дополненных записей.
+        order_by задает сортировку выдачи hh.ru (например, publication_time).
+        Ошибка первого запроса выбрасывается как ConnectionError.
+        """
+        if enrich is None:
+            enrich = self.enrich
         params = {
             "text": query,
             "area": area_id,
-            "per_page": 100,
+            "per_page": self.PER_PAGE,
             "only_with_salary": True,
         }
+        if date_from:
+            params["date_from"] = date_from
+        if order_by:
+            params["order_by"] = order_by
+        data = self.__fetch_page(params, 0)
+
+        items = list(data.get("items", []))
+        found = data.get("found", len(items))
+        total_pages = data.get("pages", 1)
+        pages = min(total_pages, self.MAX_DEPTH // self.PER_PAGE) if all_pages else 1
+        complete = total_pages <= pages
+
+        details = ThreadPoolExecutor(max_workers=self.detail_workers) if enrich else None
+        pending: List[Tuple[Dict[str, Any], "Future[Optional[str]]"]] = []
+        enriched = 0
         try:
-            data = self._connect_to_api(self.__base_url, params)
-            return data.get("items", [])
-        except ConnectionError:
+            if details is not None:
+                enriched += self.__submit_details(details, items, pending)
+            if pages > 1:
+                # executor.map возвращает результаты в порядке страниц, описания
+                # загружаются параллельно со следующими страницами
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    for page_items in executor.map(self.__fetch_items, repeat(params), range(1, pages)):
+                        if page_items is None:
+                            complete = False
+                            continue
+                        items.extend(page_items)
+                        if details is not None:
+                            enriched += self.__submit_details(details, page_items, pending)
+
+            for item, future in pending:
+                description = future.result()
+                if description is not None:
+                    item["description"] = description
+                    enriched += 1
+        finally:
+            if details is not None:
+                details.shutdown(cancel_futures=True)
+        return {"items": items, "found": found, "complete": complete, "enriched": enriched}
+
+    def get_vacancies(
+        self,
+        query: str,
+        area_id: Optional[int],
+        all_pages: bool = False,
+        date_from: Optional[str] = None,
+        enrich: Optional[bool] = None,
+    ) -> List[Dict[str, Any]]:
+        """Получение вакансий по запросу и региону.
+
+        При all_pages=True загружаются все страницы выдачи (в пределах
+        ограничения глубины hh.ru) параллельно, не более max_workers
+        запросов одновременно. Порядок вакансий совпадает с порядком страниц.
+        enrich включает или отключает загрузку полных описаний (см. search).
+        Без area_id поиск идет по DEFAULT_AREA_ID.
+        """
+        self.last_error = None
+        if area_id is None:
+            area_id = self.DEFAULT_AREA_ID
+        try:
+            return self.search(query, area_id, all_pages, date_from, enrich)["items"]
+        except ConnectionError as e:
+            logger.warning("Не удалось получить вакансии: %s", e)
             return []
+
+
+def _superjob_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Запись выдачи SuperJob в формате hh.ru.
+
+    Нулевые границы зарплаты SuperJob означают "не указано".
+    """
+    town = item.get("town") or {}
+    client = item.get("client") or {}
+    salary_from = item.get("payment_from") or None
+    salary_to = item.get("payment_to") or None
+    published = item.get("date_published")
+    currency = item.get("currency") or "rub"
+    return {
+        "id": str(item["id"]) if item.get("id") is not None else None,
+        "name": item.get("profession"),
+        "alternate_url": item.get("link"),
+        "area": {"id": town.get("id"), "name": town.get("title") or ""},
+        "employer": {"name": item.get("firm_name") or client.get("title") or ""},
+        "salary": (
+            {"from": salary_from, "to": salary_to, "currency": "RUR" if currency == "rub" else currency.upper()}
+            if salary_from or salary_to
+            else None
+        ),
+        "snippet": {"requirement": item.get("candidat") or ""},
+        "published_at": time.strftime("%Y-%m-%dT%H:%M:%S+0000", time.gmtime(published)) if published else None,
+    }
+
+
+class SuperJobAPI(JobPlatformAPI):
+    """Класс для работы с API SuperJob.
+
+    Запросы подписываются ключом приложения app_key (заголовок
+    X-Api-App-Id). Записи выдачи приводятся к формату hh.ru, регион
+    задается ID города SuperJob. С salary_only выдача ограничивается
+    вакансиями с указанной зарплатой (параметр no_agreement SuperJob).
+    """
+
+    PER_PAGE = 100
+    MAX_DEPTH = 500  # SuperJob не отдает больше 500 вакансий на один запрос
+
+    def __init__(
+        self,
+        app_key: str,
+        max_workers: int = 4,
+        api_url: str = "https://api.superjob.ru/2.0",
+        salary_only: bool = False,
+        **session_options: Any,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("Количество потоков должно быть положительным")
+        session_options.setdefault("pool_size", max_workers)
+        super().__init__(**session_options)
+        self._session.headers["X-Api-App-Id"] = app_key
+        self.__base_url = f"{api_url.rstrip('/')}/vacancies/"
+        self.__towns_url = f"{api_url.rstrip('/')}/towns/"
+        self.max_workers = max_workers
+        self.salary_only = salary_only
+        self.__towns: Dict[str, Optional[int]] = {}
+
+    def _connect_to_api(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Приватный метод подключения к API SuperJob с проверкой статуса"""
+        return self._get_json(url, params)
+
+    def get_area_id(self, region_name: str) -> Optional[int]:
+        """Получение ID города SuperJob по названию"""
+        key = region_name.strip().casefold()
+        if key not in self.__towns:
+            try:
+                data = self._connect_to_api(self.__towns_url, {"keyword": region_name.strip(), "all": 1})
+            except ConnectionError as e:
+                logger.warning("Не удалось получить список городов: %s", e)
+                return None
+            self.__towns[key] = next(
+                (town.get("id") for town in data.get("objects", []) if str(town.get("title", "")).casefold() == key),
+                None,
+            )
+        return self.__towns[key]
+
+    def __fetch_items(self, params: Dict[str, Any], page: int) -> Optional[List[Dict[str, Any]]]:
+        """Приватный метод загрузки вакансий одной страницы, None при ошибке"""
+        try:
+            data = self._connect_to_api(self.__base_url, {**params, "page": page})
+        except ConnectionError as e:
+            logger.warning("Не удалось загрузить страницу %s: %s", page, e)
+            return None
+        return [_superjob_item(item) for item in data.get("objects", [])]
+
+    def search(self, query: str, area_id: Optional[int] = None, all_pages: bool = False) -> Dict[str, Any]:
+        """Поиск вакансий с подробным результатом.
+
+        Возвращает словарь с ключами items, found и complete, как
+        HeadHunterAPI.search. Ошибка первого запроса выбрасывается как
+        ConnectionError.
+        """
+        params: Dict[str, Any] = {"keyword": query, "count": self.PER_PAGE}
+        if self.salary_only:
+            params["no_agreement"] = 1
+        if area_id is not None:
+            params["town"] = area_id
+        data = self._connect_to_api(self.__base_url, {**params, "page": 0})
+
+        items = [_superjob_item(item) for item in data.get("objects", [])]
+        found = data.get("total", len(items))
+        total_pages = max(1, -(-found // self.PER_PAGE))
+        pages = min(total_pages, self.MAX_DEPTH // self.PER_PAGE) if all_pages else 1
+        complete = total_pages <= pages
+        if pages > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for page_items in executor.map(self.__fetch_items, repeat(params), range(1, pages)):
+                    if page_items is None:
+                        complete = False
+                        continue
+                    items.extend(page_items)
+        return {"items": items, "found": found, "complete": complete}
+
+    def get_vacancies(
+        self, query: str, area_id: Optional[int] = None, all_pages: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Получение вакансий по запросу и городу в формате выдачи hh.ru"""
+        self.last_error = None
+        try:
+            return self.search(query, area_id, all_pages)["items"]
+        except ConnectionError as e:
+            logger.warning("Не удалось получить вакансии: %s", e)
+            return []
+
+
+class FixtureJobPlatform(JobPlatformAPI):
+    """Платформа с вакансиями из локального JSON в формате выдачи hh.ru.
+
+    Источник - путь к файлу (список записей или ответ с ключом items)
+    либо список записей. Поиск выбирает записи, в названии или требованиях
+    которых встречаются все слова запроса; регион сверяется с area.id.
+    delay имитирует задержку ответа. Используется в тестах и без сети.
+    """
+
+    def __init__(
+        self,
+        source: Union[str, List[Dict[str, Any]]],
+        delay: float = 0.0,
+        **session_options: Any,
+    ) -> None:
+        super().__init__(**session_options)
+        if isinstance(source, str):
+            with open(source, "r", encoding="utf-8") as file:
+                source = json.load(file)
+        self.items: List[Dict[str, Any]] = source["items"] if isinstance(source, dict) else list(source)
+        self.delay = delay
+
+    def _connect_to_api(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Приватный метод выборки записей по параметрам text и area"""
+        if self.delay:
+            time.sleep(self.delay)
+        words = tokenize(params.get("text", ""))
+        area = params.get("area")
+        items = []
+        for item in self.items:
+            if area is not None and str((item.get("area") or {}).get("id")) != str(area):
+                continue
+            requirement = (item.get("snippet") or {}).get("requirement") or ""
+            text = set(tokenize(f"{item.get('name') or ''} {requirement}"))
+            if all(word in text for word in words):
+                items.append(item)
+        return {"items": items, "found": len(items)}
+
+    def get_area_id(self, region_name: str) -> Optional[int]:
+        """ID региона первой записи с таким названием региона"""
+        key = region_name.strip().casefold()
+        for item in self.items:
+            area = item.get("area") or {}
+            if str(area.get("name", "")).casefold() == key and area.get("id") is not None:
+                return int(area["id"])
+        return None
+
+    def get_vacancies(self, query: str, area_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Получение записей файла по запросу и региону"""
+        self.last_error = None
+        return self._connect_to_api("", {"text": query, "area": area_id})["items"]
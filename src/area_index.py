@@ -0,0 +1,80 @@
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class AreaIndex:
+    """Индекс регионов hh.ru для поиска ID по названию за O(1)"""
+
+    __slots__ = ("__ids",)
+
+    def __init__(self, areas: Iterable[Dict[str, Any]]) -> None:
+        self.__ids: Dict[str, int] = {}
+        stack = list(reversed(list(areas)))
+        # Обход в глубину в исходном порядке: при совпадении названий
+        # выигрывает первый встреченный регион, как и раньше
+        while stack:
+            area = stack.pop()
+            name = area.get("name")
+            if name:
+                self.__ids.setdefault(name.casefold(), int(area["id"]))
+            stack.extend(reversed(area.get("areas") or []))
+
+    def get(self, name: str) -> Optional[int]:
+        """Получение ID региона по названию без учета регистра"""
+        return self.__ids.get(name.strip().casefold())
+
+    def __len__(self) -> int:
+        return len(self.__ids)
+
+
+class AreaCache:
+    """Дисковый кэш дерева регионов с TTL и ETag для ревалидации"""
+
+    def __init__(self, filename: str, ttl: float = 24 * 60 * 60) -> None:
+        self.filename = filename
+        self.ttl = ttl
+        self.etag: Optional[str] = None
+        self.fetched_at = 0.0
+        self.areas: Optional[List[Dict[str, Any]]] = None
+        self.__load()
+
+    def __load(self) -> None:
+        """Приватный метод чтения кэша с диска"""
+        if not os.path.exists(self.filename):
+            return
+        try:
+            with open(self.filename, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            self.areas = data["areas"]
+            self.etag = data.get("etag")
+            self.fetched_at = float(data.get("fetched_at", 0))
+        except (OSError, ValueError, KeyError, TypeError):
+            self.areas = None
+
+    @property
+    def is_fresh(self) -> bool:
+        """Кэш загружен и не старше TTL"""
+        return self.areas is not None and time.time() - self.fetched_at < self.ttl
+
+    def store(self, areas: List[Dict[str, Any]], etag: Optional[str]) -> None:
+        """Сохранение нового дерева регионов"""
+        self.areas = areas
+        self.etag = etag
+        self.touch()
+
+    def touch(self) -> None:
+        """Продление срока жизни кэша (после ответа 304 Not Modified)"""
+        self.fetched_at = time.time()
+        directory = os.path.dirname(self.filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_name = f"{self.filename}.tmp"
+        with open(tmp_name, "w", encoding="utf-8") as file:
+            json.dump(
+                {"etag": self.etag, "fetched_at": self.fetched_at, "areas": self.areas},
+                file,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_name, self.filename)
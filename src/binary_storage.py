@@ -0,0 +1,339 @@
+import argparse
+import gzip
+import heapq
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.data_saver import AbstractVacancyStorage, AddResult, JSONVacancyStorage, VacancyPredicate
+from src.vacancy import Vacancy
+
+try:
+    import zstandard
+except ImportError:  # zstd необязателен
+    zstandard = None
+
+MAGIC = b"JHVB"
+VERSION = 2  # версия 2 добавила колонку времени загрузки
+READABLE_VERSIONS = (1, 2)
+_HEADER = struct.Struct("<4sBB2x")
+_COUNTS = struct.Struct("<II")
+_LENGTHS = struct.Struct("<III")
+_SEPARATOR = "\x00"
+
+_HAS_FROM = 1
+_HAS_TO = 2
+
+COMPRESSIONS = {None: 0, "gzip": 1, "zstd": 2}
+
+
+def _compress(data: bytes, compression: Optional[str]) -> bytes:
+    """Сжатие данных выбранным методом"""
+    if compression is None:
+        return data
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if zstandard is None:
+        raise ValueError("Для сжатия zstd установите пакет zstandard")
+    return zstandard.ZstdCompressor(level=10).compress(data)
+
+
+def _decompress(data: bytes, code: int) -> bytes:
+    """Распаковка данных по коду метода сжатия из заголовка"""
+    if code == 0:
+        return data
+    if code == 1:
+        return gzip.decompress(data)
+    if code == 2:
+        if zstandard is None:
+            raise ValueError("Для чтения архива zstd установите пакет zstandard")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Неизвестный метод сжатия: {code}")
+
+
+def _little_endian(values: array) -> array:
+    """Приведение массива к порядку байтов little-endian"""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def _join_strings(values: Iterable[str]) -> bytes:
+    """Склейка строк через нулевой символ.
+
+    Нулевой символ внутри строки сделал бы разбиение неоднозначным,
+    поэтому такая строка вызывает ValueError.
+    """
+    values = list(values)
+    joined = _SEPARATOR.join(values)
+    if joined.count(_SEPARATOR) > max(len(values) - 1, 0):
+        raise ValueError("Строка содержит нулевой символ, недопустимый в бинарном формате")
+    return joined.encode("utf-8")
+
+
+def _split_strings(blob: bytes, count: int) -> List[str]:
+    """Разбиение склеенных строк"""
+    return blob.decode("utf-8").split(_SEPARATOR) if count else []
+
+
+def encode_vacancies(
+    vacancies: List[Vacancy],
+    compression: Optional[str] = "gzip",
+    fetched_at: Optional[List[float]] = None,
+) -> bytes:
+    """Кодирование вакансий в компактный колоночный формат.
+
+    После заголовка идут сжатые колонки: таблица уникальных названий
+    и регионов, индексы в ней, значения зарплат, время загрузки (0 -
+    неизвестно), флаги зарплат, затем ссылки и описания одним блоком
+    каждая.
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Неизвестный метод сжатия: {compression}")
+    if fetched_at is None:
+        fetched_at = [0.0] * len(vacancies)
+    elif len(fetched_at) != len(vacancies):
+        raise ValueError("Число отметок времени не совпадает с числом вакансий")
+
+    table: List[str] = []
+    codes: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(table)
+            table.append(value)
+        return code
+
+    names = array("I", (intern(v.name) for v in vacancies))
+    areas = array("I", (intern(v.area) for v in vacancies))
+    flags = bytes(
+        (_HAS_FROM if v.salary_from is not None else 0) | (_HAS_TO if v.salary_to is not None else 0)
+        for v in vacancies
+    )
+    salary_from = array("q", (v.salary_from or 0 for v in vacancies))
+    salary_to = array("q", (v.salary_to or 0 for v in vacancies))
+    fetched = array("d", fetched_at)
+
+    strings = [
+        _join_strings(table),
+        _join_strings(v.url for v in vacancies),
+        _join_strings(v.description for v in vacancies),
+    ]
+    payload = b"".join(
+        [
+            _COUNTS.pack(len(vacancies), len(table)),
+            _LENGTHS.pack(*(len(block) for block in strings)),
+            *(_little_endian(column).tobytes() for column in (names, areas, salary_from, salary_to, fetched)),
+            flags,
+            *strings,
+        ]
+    )
+    return _HEADER.pack(MAGIC, VERSION, COMPRESSIONS[compression]) + _compress(payload, compression)
+
+
+def decode_records(data: bytes) -> Tuple[List[Vacancy], List[float]]:
+    """Декодирование вакансий и времени их загрузки из компактного формата"""
+    magic, version, compression = _HEADER.unpack_from(data)
+    if magic != MAGIC or version not in READABLE_VERSIONS:
+        raise ValueError("Файл не является архивом вакансий поддерживаемой версии")
+    payload = _decompress(data[_HEADER.size:], compression)
+
+    count, table_size = _COUNTS.unpack_from(payload)
+    offset = _COUNTS.size
+    table_len, urls_len, descriptions_len = _LENGTHS.unpack_from(payload, offset)
+    offset += _LENGTHS.size
+
+    columns = []
+    for typecode in ("I", "I", "q", "q", "d") if version >= 2 else ("I", "I", "q", "q"):
+        column = array(typecode)
+        size = column.itemsize * count
+        column.frombytes(payload[offset:offset + size])
+        columns.append(_little_endian(column))
+        offset += size
+    names, areas, salary_from, salary_to = columns[:4]
+    fetched_at = columns[4].tolist() if version >= 2 else [0.0] * count
+    flags = payload[offset:offset + count]
+    offset += count
+
+    table = _split_strings(payload[offset:offset + table_len], table_size)
+    offset += table_len
+    urls = _split_strings(payload[offset:offset + urls_len], count)
+    offset += urls_len
+    descriptions = _split_strings(payload[offset:offset + descriptions_len], count)
+
+    create = Vacancy.from_trusted
+    vacancies = [
+        create(
+            table[names[i]],
+            table[areas[i]],
+            urls[i],
+            salary_from[i] if flags[i] & _HAS_FROM else None,
+            salary_to[i] if flags[i] & _HAS_TO else None,
+            descriptions[i],
+        )
+        for i in range(count)
+    ]
+    return vacancies, fetched_at
+
+
+def decode_vacancies(data: bytes) -> List[Vacancy]:
+    """Декодирование вакансий из компактного формата"""
+    return decode_records(data)[0]
+
+
+class BinaryVacancyStorage(AbstractVacancyStorage):
+    """Хранилище вакансий в компактном бинарном формате для архивов.
+
+    Файл читается и перезаписывается целиком (запись атомарная, через
+    временный файл), поэтому формат рассчитан на редко изменяемые
+    снимки, а не на потоковую запись.
+    """
+
+    def __init__(self, filename: str, compression: Optional[str] = "gzip") -> None:
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Неизвестный метод сжатия: {compression}")
+        self.__filename = filename
+        self.__compression = compression
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __load(self) -> Tuple[List[Vacancy], List[float]]:
+        """Приватный метод загрузки архива: вакансии и время их загрузки"""
+        if not os.path.exists(self.__filename) or not os.path.getsize(self.__filename):
+            return [], []
+        with self.metrics.time("storage_io_seconds", storage="BinaryVacancyStorage", op="read"):
+            with open(self.__filename, "rb") as file:
+                data = file.read()
+        self.metrics.increment("storage_io_bytes", len(data), storage="BinaryVacancyStorage", op="read")
+        return decode_records(data)
+
+    def __save(self, vacancies: List[Vacancy], fetched_at: List[float]) -> None:
+        """Приватный метод атомарной записи архива"""
+        data = encode_vacancies(vacancies, self.__compression, fetched_at)
+        with self.metrics.time("storage_io_seconds", storage="BinaryVacancyStorage", op="write"):
+            fd, tmp_name = tempfile.mkstemp(
+                dir=os.path.dirname(self.__filename) or ".",
+                prefix=os.path.basename(self.__filename) + ".",
+                suffix=".tmp",
+            )
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    file.write(data)
+                os.replace(tmp_name, self.__filename)
+            except BaseException:
+                if os.path.exists(tmp_name):
+                    os.unlink(tmp_name)
+                raise
+        self.metrics.increment("storage_io_bytes", len(data), storage="BinaryVacancyStorage", op="write")
+
+    def __remove_where(self, condition: Callable[[Vacancy, float], bool]) -> int:
+        """Приватный метод удаления вакансий по условию одной перезаписью архива"""
+        stored, fetched_at = self.__load()
+        kept = [(v, t) for v, t in zip(stored, fetched_at) if not condition(v, t)]
+        removed = len(stored) - len(kept)
+        if removed:
+            self.__save([v for v, _ in kept], [t for _, t in kept])
+        return removed
+
+    def add_vacancy(self, vacancy: Vacancy) -> None:
+        """Добавление вакансии с проверкой на дубликаты"""
+        self.add_vacancies([vacancy])
+
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> AddResult:
+        """Пакетное добавление вакансий с одной перезаписью архива.
+
+        У уже сохраненных вакансий обновляется время загрузки.
+        """
+        stored, fetched_at = self.__load()
+        positions = {v.url: i for i, v in enumerate(stored)}
+        stored_count = len(stored)
+        now = time.time()
+        inserted = skipped = touched = 0
+        for vacancy in vacancies:
+            position = positions.get(vacancy.url)
+            if position is not None:
+                skipped += 1
+                if position < stored_count:
+                    fetched_at[position] = now
+                    touched += 1
+                continue
+            positions[vacancy.url] = len(stored)
+            stored.append(vacancy)
+            fetched_at.append(now)
+            inserted += 1
+        if inserted or touched:
+            self.__save(stored, fetched_at)
+        return AddResult(inserted, skipped)
+
+    def get_vacancies(self, criterion: str) -> List[Vacancy]:
+        """Получение вакансий по ключевому слову в описании"""
+        criterion = criterion.lower()
+        if not criterion:
+            return self.__load()[0]
+        return list(self.iter_vacancies(lambda vacancy: criterion in vacancy.description.lower()))
+
+    def iter_vacancies(self, predicate: Optional[VacancyPredicate] = None) -> Iterator[Vacancy]:
+        """Перебор вакансий архива"""
+        for vacancy in self.__load()[0]:
+            if predicate is None or predicate(vacancy):
+                yield vacancy
+
+    def top_by_salary(self, n: int, area: Optional[str] = None) -> List[Vacancy]:
+        """Топ N вакансий по зарплате"""
+        vacancies = self.iter_vacancies(None if area is None else lambda v: v.area == area)
+        return heapq.nlargest(n, vacancies, key=lambda vacancy: vacancy.salary_key)
+
+    def remove_vacancy(self, vacancy_url: str) -> None:
+        """Удаление вакансии по URL"""
+        self.remove_vacancies([vacancy_url])
+
+    def remove_vacancies(self, vacancy_urls: Iterable[str]) -> int:
+        """Пакетное удаление вакансий одной перезаписью архива"""
+        urls = set(vacancy_urls)
+        if not urls:
+            return 0
+        return self.__remove_where(lambda vacancy, _: vacancy.url in urls)
+
+    def prune(self, older_than: float) -> int:
+        """Удаление устаревших вакансий одной перезаписью архива"""
+        cutoff = time.time() - older_than
+        return self.__remove_where(lambda _, fetched_at: 0 < fetched_at < cutoff)
+
+
+def convert_json_archive(
+    json_path: str, binary_path: str, compression: Optional[str] = "gzip"
+) -> Tuple[int, int, int]:
+    """Конвертация vacancies.json в бинарный архив.
+
+    Возвращает число вакансий и размеры исходного и нового файлов в байтах.
+    """
+    vacancies = list(JSONVacancyStorage(json_path).iter_vacancies())
+    BinaryVacancyStorage(binary_path, compression).add_vacancies(vacancies)
+    return len(vacancies), os.path.getsize(json_path), os.path.getsize(binary_path)
+
+
+def main(argv: Optional[List[str]] = None, output: Callable[[str], None] = print) -> None:
+    """Командная строка конвертера: python -m src.binary_storage in.json out.jvb"""
+    parser = argparse.ArgumentParser(description="Конвертация JSON-хранилища вакансий в бинарный архив")
+    parser.add_argument("source", help="исходный файл vacancies.json")
+    parser.add_argument("target", help="файл бинарного архива")
+    parser.add_argument("--compression", choices=["none", "gzip", "zstd"], default="gzip")
+    args = parser.parse_args(argv)
+
+    compression = None if args.compression == "none" else args.compression
+    count, source_size, target_size = convert_json_archive(args.source, args.target, compression)
+    output(
+        f"Вакансий: {count}, размер: {source_size} -> {target_size} байт "
+        f"({source_size / max(target_size, 1):.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,320 @@
+import heapq
 import json
+import logging
 import os
+import tempfile
+import time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from contextlib import contextmanager
+from itertools import islice
+from typing import List, Dict, Any, Callable, Optional, IO, Iterable, Iterator, NamedTuple, Set, Tuple
 
-from src.vacancy import Vacancy
+try:
+    import fcntl
+except ImportError:  # Windows: блокировки между процессами недоступны
+    fcntl = None
+
+from src.keyword_index import KeywordIndex, load_index, save_index
+from src.metrics import NULL_METRICS, MetricsObserver, instrument_methods
+from src.vacancy import Vacancy, salary_key
+
+logger = logging.getLogger(__name__)
+
+VacancyPredicate = Callable[[Vacancy], bool]
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789.eE+-"
+
+# Методы хранилищ, длительность которых попадает в storage_call_seconds
+INSTRUMENTED_METHODS = (
+    "add_vacancy",
+    "add_vacancies",
+    "get_vacancies",
+    "search_vacancies",
+    "iter_vacancies",
+    "top_by_salary",
+    "remove_vacancy",
+    "remove_vacancies",
+    "prune",
+)
+
+# Время загрузки вакансии (секунды Unix) в сохраненной записи
+FETCHED_AT_KEY = "fetched_at"
+
+
+class StorageCorruptedError(ValueError):
+    """Файл хранилища поврежден и не может быть восстановлен из копии"""
+
+
+@contextmanager
+def _exclusive_lock(lock_path: str) -> Iterator[None]:
+    """Рекомендательная блокировка файла (flock) на время изменения данных"""
+    with open(lock_path, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _atomic_write_json(filename: str, data: Any, backup: Optional[str] = None, **dump_options: Any) -> None:
+    """Атомарная запись JSON: временный файл, fsync и переименование.
+
+    Если указан backup, прежняя версия файла сохраняется под этим именем
+    (жесткой ссылкой, без копирования данных).
+    """
+    directory = os.path.dirname(filename) or "."
+    fd, tmp_name = tempfile.mkstemp(dir=directory, prefix=os.path.basename(filename) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(data, file, **dump_options)
+            file.flush()
+            os.fsync(file.fileno())
+        if backup is not None and os.path.exists(filename):
+            backup_tmp = f"{backup}.tmp"
+            if os.path.exists(backup_tmp):
+                os.unlink(backup_tmp)
+            try:
+                os.link(filename, backup_tmp)
+            except OSError:
+                backup_tmp = None
+            if backup_tmp is not None:
+                os.replace(backup_tmp, backup)
+        os.replace(tmp_name, filename)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def _salary_value(value: Any) -> Optional[int]:
+    """Граница зарплаты записи; некорректное значение считается неуказанным"""
+    return value if isinstance(value, int) else None
+
+
+def _item_salary_key(item: Dict[str, Any]) -> int:
+    """Ключ сортировки по зарплате для сохраненного словаря"""
+    return salary_key(_salary_value(item.get("salary_from")), _salary_value(item.get("salary_to")))
+
+
+def _top_items(
+    items: Iterable[Dict[str, Any]], n: int, area: Optional[str]
+) -> List[Vacancy]:
+    """Отбор N вакансий с наибольшей зарплатой через кучу размера N"""
+    if area is not None:
+        items = (item for item in items if item.get("area") == area)
+    result = []
+    for item in heapq.nlargest(n, items, key=_item_salary_key):
+        try:
+            result.append(_vacancy_from_dict(item))
+        except (KeyError, ValueError):
+            continue
+    return result
+
+
+def _iter_json_array(file: IO[str], chunk_size: int = 1 << 16, strict: bool = False) -> Iterator[Any]:
+    """Потоковый разбор JSON-массива: элементы читаются по одному.
+
+    В памяти держится только текущий фрагмент файла, поэтому расход
+    памяти не зависит от размера массива. Поврежденный остаток файла
+    завершает перебор, а при strict=True приводит к ValueError.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    started = False
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        if pos < len(buffer):
+            char = buffer[pos]
+            if not started:
+                if char != "[":
+                    if strict:
+                        raise ValueError("Файл не содержит JSON-массив")
+                    return
+                started = True
+                pos += 1
+                continue
+            if char == "]":
+                return
+            if char == ",":
+                pos += 1
+                continue
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    if strict:
+                        raise ValueError(f"Поврежденные данные JSON в позиции {pos}")
+                    return
+            else:
+                # Число, дошедшее до конца буфера или до "." и экспоненты,
+                # может продолжаться в следующем фрагменте файла
+                if eof or (end < len(buffer) and buffer[end] not in _NUMBER_CHARS):
+                    pos = end
+                    yield item
+                    continue
+        elif eof:
+            if strict and started:
+                raise ValueError("Неожиданный конец JSON-массива")
+            return
+
+        # Недочитанный элемент как минимум удваивается при каждом чтении,
+        # поэтому большой элемент разбирается заново лишь O(log n) раз
+        chunk = file.read(max(chunk_size, len(buffer) - pos))
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def _filter_vacancies(
+    items: Iterable[Dict[str, Any]], predicate: Optional[VacancyPredicate]
+) -> Iterator[Vacancy]:
+    """Ленивое создание вакансий из словарей с фильтрацией"""
+    for item in items:
+        try:
+            vacancy = _vacancy_from_dict(item)
+        except (KeyError, TypeError, ValueError):
+            continue
+        if predicate is None or predicate(vacancy):
+            yield vacancy
+
+
+def _to_record(vacancy: Vacancy, fetched_at: float) -> Dict[str, Any]:
+    """Запись для хранилища: данные вакансии и время загрузки"""
+    record = vacancy.to_dict()
+    record[FETCHED_AT_KEY] = fetched_at
+    return record
+
+
+def _is_stale(record: Dict[str, Any], cutoff: float) -> bool:
+    """Запись загружена раньше cutoff; записи без отметки времени не устаревают"""
+    fetched_at = record.get(FETCHED_AT_KEY)
+    return bool(fetched_at) and fetched_at < cutoff
+
+
+def _vacancy_from_dict(item: Dict[str, Any]) -> Vacancy:
+    """Создание вакансии из сохраненного словаря с валидацией.
+
+    Текстовые файлы JSON и JSON Lines можно изменить вручную, поэтому
+    данные проверяются заново; некорректные записи отбрасывает
+    вызывающий по ValueError. Проверку пропускают только SQLite и
+    бинарный формат, которые читают свои же типизированные данные.
+    """
+    return Vacancy.from_dict(item)
+
+
+class _Snapshot:
+    """Разобранное содержимое файла хранилища и производные индексы.
+
+    Список items не изменяется после создания: запись создает новый
+    снимок, поэтому начатый перебор старого снимка остается корректным.
+    Индексы строятся при первом обращении.
+    """
+
+    __slots__ = ("stamp", "items", "_urls", "_positions", "_salary_order")
+
+    def __init__(self, stamp: Dict[str, int], items: List[Dict[str, Any]]) -> None:
+        self.stamp = stamp
+        self.items = items
+        self._urls: Optional[Set[str]] = None
+        self._positions: Optional[Dict[str, int]] = None
+        self._salary_order: Optional[List[Dict[str, Any]]] = None
+
+    @property
+    def urls(self) -> Set[str]:
+        """Множество URL сохраненных вакансий"""
+        if self._urls is None:
+            self._urls = {item.get("url") for item in self.items}
+        return self._urls
+
+    def select(self, urls: Iterable[str]) -> List[Dict[str, Any]]:
+        """Записи с указанными URL в порядке файла"""
+        if self._positions is None:
+            self._positions = {item.get("url"): i for i, item in enumerate(self.items)}
+        positions = self._positions
+        return [self.items[i] for i in sorted(positions[url] for url in urls if url in positions)]
+
+    @property
+    def salary_order(self) -> List[Dict[str, Any]]:
+        """Записи по убыванию зарплаты, равные - в порядке файла"""
+        if self._salary_order is None:
+            self._salary_order = sorted(self.items, key=_item_salary_key, reverse=True)
+        return self._salary_order
+
+
+class AddResult(NamedTuple):
+    """Результат пакетного добавления вакансий"""
+
+    inserted: int
+    skipped: int
 
 
 class AbstractVacancyStorage(ABC):
-    """Абстрактный класс для работы с хранилищами вакансий"""
+    """Абстрактный класс для работы с хранилищами вакансий.
+
+    Методы наследников из INSTRUMENTED_METHODS автоматически замеряются
+    в гистограмму storage_call_seconds наблюдателя metrics (по умолчанию
+    отключен). Хранилища с файлами пишут также storage_io_seconds и
+    storage_io_bytes с меткой op: read, scan или write.
+    """
+
+    metrics: MetricsObserver = NULL_METRICS
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        instrument_methods(
+            cls,
+            "storage_call_seconds",
+            INSTRUMENTED_METHODS,
+            iterators=("iter_vacancies",),
+            storage=cls.__name__,
+        )
 
     @abstractmethod
     def add_vacancy(self, vacancy: Vacancy) -> None:
         """Добавление вакансии в хранилище"""
         pass
 
+    @abstractmethod
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> AddResult:
+        """Пакетное добавление вакансий с одной записью на пакет.
+
+        Вакансия с уже сохраненным URL пропускается, но время загрузки
+        сохраненной записи обновляется: снова найденная вакансия не
+        устаревает для prune.
+        """
+        pass
+
     @abstractmethod
     def get_vacancies(self, criterion: str) -> List[Vacancy]:
-        """Получение вакансий по критерию"""
+        """Получение вакансий, в описании которых критерий встречается как подстрока.
+
+        Регистр не учитывается (str.lower), пустой критерий возвращает
+        все вакансии. Вакансии возвращаются в порядке добавления.
+        """
+        pass
+
+    @abstractmethod
+    def iter_vacancies(self, predicate: Optional[VacancyPredicate] = None) -> Iterator[Vacancy]:
+        """Ленивый перебор вакансий, удовлетворяющих условию predicate"""
+        pass
+
+    @abstractmethod
+    def top_by_salary(self, n: int, area: Optional[str] = None) -> List[Vacancy]:
+        """Топ N вакансий по зарплате, при необходимости только в регионе area"""
         pass
 
     @abstractmethod
@@ -24,65 +322,638 @@ class AbstractVacancyStorage(ABC):
         """Удаление вакансии из хранилища"""
         pass
 
+    @abstractmethod
+    def remove_vacancies(self, vacancy_urls: Iterable[str]) -> int:
+        """Пакетное удаление вакансий по URL, возвращает число удаленных"""
+        pass
+
+    @abstractmethod
+    def prune(self, older_than: float) -> int:
+        """Удаление вакансий, загруженных (или найденных повторно) более older_than секунд назад.
+
+        Вакансии без времени загрузки (сохраненные до появления отметки)
+        не удаляются. Возвращает число удаленных вакансий.
+        """
+        pass
+
 
 class JSONVacancyStorage(AbstractVacancyStorage):
-    """Класс для работы с JSON-хранилищем вакансий"""
+    """Класс для работы с JSON-хранилищем вакансий.
+
+    Рядом с файлом данных хранится инвертированный индекс слов описания
+    (файл с суффиксом .idx). Он строится при первом поиске, если файл
+    данных был изменен в обход хранилища. Собственные записи обновляют
+    индекс в памяти, а .idx переписывается один раз при close.
+    get_vacancies ищет подстроку, используя индекс только для сужения
+    перебора, search_vacancies - слова запроса с операциями AND/OR.
 
-    def __init__(self, filename: str) -> None:
+    Изменения выполняются под блокировкой файла .lock, поэтому несколько
+    процессов могут писать в одно хранилище без потери обновлений. Файл
+    заменяется атомарно, прежняя версия остается в .bak: если основной
+    файл поврежден, чтение и запись с предупреждением в журнале берут
+    данные из нее, а recover() восстанавливает из нее файл.
+
+    С snapshot=True (по умолчанию) разобранное содержимое файла хранится
+    в памяти вместе с множеством URL и порядком по зарплате. Снимок
+    сверяется с размером, временем изменения и inode файла перед каждой
+    операцией и заменяется после собственной записи, поэтому повторные
+    запросы не читают файл, пока его не изменит другой процесс. Без
+    снимка файл читается потоково, и расход памяти на чтение не зависит
+    от размера хранилища.
+    """
+
+    def __init__(self, filename: str, snapshot: bool = True) -> None:
         self.__filename = filename
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        self.__index_filename = f"{filename}.idx"
+        self.__lock_filename = f"{filename}.lock"
+        self.__backup_filename = f"{filename}.bak"
+        self.__index: Optional[KeywordIndex] = None
+        self.__index_stamp: Optional[Dict[str, int]] = None
+        self.__index_dirty = False
+        self.__use_snapshot = snapshot
+        self.__snapshot: Optional[_Snapshot] = None
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
 
-    def __load_vacancies(self) -> List[Dict[str, Any]]:
-        """Приватный метод загрузки вакансий из файла"""
-        if not os.path.exists(self.__filename):
+    def __read_file(self, filename: str) -> List[Dict[str, Any]]:
+        """Приватный метод чтения JSON-массива, ValueError при повреждении"""
+        if not os.path.exists(filename):
             return []
+        size = os.path.getsize(filename)
+        if not size:
+            return []
+        with self.metrics.time("storage_io_seconds", storage="JSONVacancyStorage", op="read"):
+            with open(filename, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        self.metrics.increment("storage_io_bytes", size, storage="JSONVacancyStorage", op="read")
+        if not isinstance(data, list):
+            raise ValueError("Файл не содержит JSON-массив")
+        return data
+
+    def __load_vacancies(self) -> Tuple[List[Dict[str, Any]], bool]:
+        """Приватный метод загрузки вакансий из файла с восстановлением из копии.
 
+        Возвращает новый список, который можно изменять (актуальный
+        снимок копируется без чтения файла), и признак того, что файл
+        прочитан без ошибок. Данные из резервной копии возвращаются с
+        False: поврежденный файл не должен заменить копию при записи.
+        """
+        snapshot = self.__fresh_snapshot(self.__source_stamp())
+        if snapshot is not None:
+            return list(snapshot.items), True
         try:
+            return self.__read_file(self.__filename), True
+        except ValueError:
+            return self.__recover(), False
+
+    def __fresh_snapshot(self, stamp: Dict[str, int]) -> Optional[_Snapshot]:
+        """Приватный метод получения снимка, если он соответствует файлу"""
+        snapshot = self.__snapshot
+        if snapshot is not None and snapshot.stamp == stamp:
+            self.metrics.increment("storage_snapshot", result="hit")
+            return snapshot
+        return None
+
+    def __get_snapshot(self) -> _Snapshot:
+        """Приватный метод получения актуального снимка с перечитыванием файла"""
+        stamp = self.__source_stamp()
+        snapshot = self.__fresh_snapshot(stamp)
+        if snapshot is None:
+            self.metrics.increment("storage_snapshot", result="miss")
+            try:
+                items = self.__read_file(self.__filename)
+            except ValueError:
+                items = self.__recover()
+            snapshot = self.__snapshot = _Snapshot(stamp, [item for item in items if isinstance(item, dict)])
+        return snapshot
+
+    def __known_urls(self, stored: List[Dict[str, Any]]) -> Set[str]:
+        """Приватный метод получения URL записей stored, загруженных из файла.
+
+        Множество не изменяется вызывающим: оно может принадлежать снимку.
+        """
+        snapshot = self.__snapshot
+        if snapshot is not None and snapshot.stamp == self.__source_stamp():
+            return snapshot.urls
+        return {item.get("url") for item in stored}
+
+    def __items(self) -> Iterable[Dict[str, Any]]:
+        """Приватный метод получения записей из снимка или потоковым чтением"""
+        if self.__use_snapshot:
+            return self.__get_snapshot().items
+        return self.__iter_items()
+
+    def __recover(self) -> List[Dict[str, Any]]:
+        """Приватный метод восстановления данных из резервной копии"""
+        try:
+            data = self.__read_file(self.__backup_filename)
+        except ValueError:
+            data = None
+        if data is None or not os.path.exists(self.__backup_filename):
+            raise StorageCorruptedError(
+                f"Файл {self.__filename} поврежден, резервная копия недоступна"
+            )
+        logger.warning("Файл %s поврежден, используется резервная копия", self.__filename)
+        return data
+
+    def recover(self) -> int:
+        """Восстановление поврежденного файла из резервной копии.
+
+        Возвращает число вакансий в восстановленном файле. Если основной
+        файл цел, ничего не меняет.
+        """
+        with _exclusive_lock(self.__lock_filename):
+            try:
+                return len(self.__read_file(self.__filename))
+            except ValueError:
+                data = self.__recover()
+            _atomic_write_json(self.__filename, data, ensure_ascii=False, indent=2)
+            return len(data)
+
+    def __iter_items(self) -> Iterator[Dict[str, Any]]:
+        """Приватный генератор потокового чтения вакансий из файла.
+
+        Если файл оказывается поврежден, после уже выданных записей
+        выдаются записи резервной копии с другими URL.
+        """
+        if not os.path.exists(self.__filename):
+            return
+        yielded = set()
+        with self.metrics.time("storage_io_seconds", storage="JSONVacancyStorage", op="scan"):
             with open(self.__filename, "r", encoding="utf-8") as file:
-                return json.load(file)
-        except json.JSONDecodeError:
-            return []
+                try:
+                    for item in _iter_json_array(file, strict=True):
+                        if isinstance(item, dict):
+                            yielded.add(item.get("url"))
+                            yield item
+                except ValueError:
+                    corrupted = True
+                else:
+                    corrupted = False
+                self.metrics.increment("storage_io_bytes", file.tell(), storage="JSONVacancyStorage", op="scan")
+        if corrupted:
+            for item in self.__recover():
+                if isinstance(item, dict) and item.get("url") not in yielded:
+                    yield item
+
+    def __save_vacancies(self, data: List[Dict[str, Any]], backup: bool = True) -> None:
+        """Приватный метод атомарного сохранения вакансий в файл.
+
+        С backup=False резервная копия не обновляется: так записываются
+        данные, восстановленные из нее вместо поврежденного файла.
+        """
+        with self.metrics.time("storage_io_seconds", storage="JSONVacancyStorage", op="write"):
+            _atomic_write_json(
+                self.__filename,
+                data,
+                backup=self.__backup_filename if backup else None,
+                ensure_ascii=False,
+                indent=2,
+            )
+        if self.metrics.enabled:
+            self.metrics.increment(
+                "storage_io_bytes", os.path.getsize(self.__filename), storage="JSONVacancyStorage", op="write"
+            )
+
+    def __source_stamp(self) -> Dict[str, int]:
+        """Приватный метод получения отметки версии файла данных"""
+        try:
+            stat = os.stat(self.__filename)
+        except FileNotFoundError:
+            return {"size": 0, "mtime_ns": 0, "inode": 0}
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "inode": stat.st_ino}
+
+    def __cached_index(self, stamp: Dict[str, int]) -> Optional[KeywordIndex]:
+        """Приватный метод получения индекса из памяти или с диска, если он актуален"""
+        if self.__index is not None and self.__index_stamp == stamp:
+            return self.__index
+        return load_index(self.__index_filename, stamp)
 
-    def __save_vacancies(self, data: List[Dict[str, Any]]) -> None:
-        """Приватный метод сохранения вакансий в файл"""
-        with open(self.__filename, "w", encoding="utf-8") as file:
-            json.dump(data, file, ensure_ascii=False, indent=2)
+    @staticmethod
+    def __update_index(
+        index: KeywordIndex, added: Iterable[Dict[str, Any]] = (), removed: Iterable[Dict[str, Any]] = ()
+    ) -> KeywordIndex:
+        """Приватный метод обновления индекса слов описания; записи без URL пропускаются"""
+        for item in removed:
+            if isinstance(item.get("url"), str):
+                index.remove(item["url"], item.get("description") or "")
+        for item in added:
+            if isinstance(item.get("url"), str):
+                index.add(item["url"], item.get("description") or "")
+        return index
+
+    def __get_index(self) -> KeywordIndex:
+        """Приватный метод получения актуального индекса слов описания"""
+        stamp = self.__source_stamp()
+        index = self.__cached_index(stamp)
+        if index is None:
+            index = self.__update_index(KeywordIndex(), added=self.__items())
+            if os.path.exists(self.__filename):
+                save_index(self.__index_filename, index, stamp)
+            self.__index_dirty = False
+        self.__index = index
+        self.__index_stamp = stamp
+        return index
+
+    def __commit(
+        self,
+        data: List[Dict[str, Any]],
+        added: Iterable[Dict[str, Any]] = (),
+        removed: Iterable[Dict[str, Any]] = (),
+        backup: bool = True,
+    ) -> None:
+        """Приватный метод сохранения вакансий с обновлением индекса в памяти.
+
+        Индекс, не загруженный в память или устаревший, не обновляется:
+        его построит следующий поиск. Обновленный индекс записывается
+        в .idx при close.
+        """
+        index = self.__index
+        if index is not None and self.__index_stamp == self.__source_stamp():
+            self.__update_index(index, added, removed)
+        else:
+            index = None
+        self.__index_dirty = index is not None
+
+        self.__save_vacancies(data, backup)
+        stamp = self.__source_stamp()
+        self.__index = index
+        self.__index_stamp = stamp if index is not None else None
+        if self.__use_snapshot:
+            self.__snapshot = _Snapshot(stamp, data)
+
+    def close(self) -> None:
+        """Сохранение индекса, обновленного записями, в файл .idx.
+
+        Индекс не сохраняется, если файл данных изменил другой процесс:
+        тогда он не соответствует файлу.
+        """
+        if not self.__index_dirty:
+            return
+        self.__index_dirty = False
+        stamp = self.__source_stamp()
+        if self.__index is not None and self.__index_stamp == stamp:
+            save_index(self.__index_filename, self.__index, stamp)
+
+    def __enter__(self) -> "JSONVacancyStorage":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     def add_vacancy(self, vacancy: Vacancy) -> None:
         """Добавление вакансии с проверкой на дубликаты"""
-        vacancies = self.__load_vacancies()
-        vacancy_dict = vacancy.to_dict()
+        self.add_vacancies([vacancy])
+
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> AddResult:
+        """Пакетное добавление вакансий с проверкой на дубликаты"""
+        batch = list(vacancies)
+        with _exclusive_lock(self.__lock_filename):
+            stored, clean = self.__load_vacancies()
+            known = self.__known_urls(stored)
+            seen = set()
+            touched = set()
+            added = []
+            skipped = 0
+            fetched_at = time.time()
+
+            for vacancy in batch:
+                if vacancy.url in known:
+                    touched.add(vacancy.url)
+                if vacancy.url in known or vacancy.url in seen:
+                    skipped += 1
+                    continue
+                seen.add(vacancy.url)
+                added.append(_to_record(vacancy, fetched_at))
 
-        # Проверка на дубликаты по URL
-        if not any(v["url"] == vacancy.url for v in vacancies):
-            vacancies.append(vacancy_dict)
-            self.__save_vacancies(vacancies)
+            if touched:
+                # Записи снимка не изменяются: обновленные записи копируются
+                stored = [
+                    dict(item, **{FETCHED_AT_KEY: fetched_at}) if item.get("url") in touched else item
+                    for item in stored
+                ]
+            if added or touched:
+                stored.extend(added)
+                self.__commit(stored, added=added, backup=clean)
+        return AddResult(len(added), skipped)
 
     def get_vacancies(self, criterion: str) -> List[Vacancy]:
-        """Получение вакансий по ключевому слову в описании"""
-        vacancies_data = self.__load_vacancies()
-        result = []
+        """Получение вакансий по ключевому слову в описании.
 
-        for item in vacancies_data:
-            try:
-                vacancy = Vacancy(
-                    name=item["name"],
-                    area=item["area"],
-                    url=item["url"],
-                    salary_from=item["salary_from"],
-                    salary_to=item["salary_to"],
-                    description=item["description"],
-                )
-
-                if not criterion or criterion.lower() in vacancy.description.lower():
-                    result.append(vacancy)
-            except (KeyError, ValueError):
-                continue
+        Критерий ищется как подстрока описания без учета регистра. Индекс
+        слов сужает перебор до вакансий, которые могут его содержать, и
+        при отсутствии кандидатов файл данных не читается. Критерий без
+        букв и цифр проверяется перебором всех вакансий.
+        """
+        needle = criterion.lower()
+        if not needle:
+            return list(_filter_vacancies(self.__items(), None))
+
+        urls = self.__get_index().candidates(criterion)
+        if urls is None:
+            items = self.__items()
+        elif not urls:
+            return []
+        else:
+            items = self.__select(urls)
+        return list(_filter_vacancies(items, lambda vacancy: needle in vacancy.description.lower()))
+
+    def search_vacancies(self, query: str) -> List[Vacancy]:
+        """Поиск вакансий по словам описания с операциями AND/OR.
+
+        Слова через пробел должны встретиться все, группы слов разделяются
+        "|" или "OR". Слова сравниваются по основе, поэтому "разработка"
+        находит и "разработки" (см. KeywordIndex). Поиск идет только по
+        индексу, файл данных читается при наличии совпадений.
+        """
+        urls = self.__get_index().search(query)
+        if not urls:
+            return []
+        return list(_filter_vacancies(self.__select(urls), None))
+
+    def __select(self, urls: Set[str]) -> Iterable[Dict[str, Any]]:
+        """Приватный метод получения записей с указанными URL в порядке файла"""
+        if self.__use_snapshot:
+            return self.__get_snapshot().select(urls)
+        return (item for item in self.__iter_items() if item.get("url") in urls)
+
+    def iter_vacancies(self, predicate: Optional[VacancyPredicate] = None) -> Iterator[Vacancy]:
+        """Ленивый перебор вакансий из снимка или с потоковым чтением файла"""
+        return _filter_vacancies(self.__items(), predicate)
 
-        return result
+    def top_by_salary(self, n: int, area: Optional[str] = None) -> List[Vacancy]:
+        """Топ N вакансий по зарплате.
+
+        Со снимком записи берутся из готового порядка по зарплате,
+        иначе отбираются кучей без сортировки всего списка.
+        """
+        if not self.__use_snapshot:
+            return _top_items(self.__iter_items(), n, area)
+        items: Iterable[Dict[str, Any]] = self.__get_snapshot().salary_order
+        if area is not None:
+            items = (item for item in items if item.get("area") == area)
+        return list(_filter_vacancies(islice(items, max(n, 0)), None))
 
     def remove_vacancy(self, vacancy_url: str) -> None:
         """Удаление вакансии по URL"""
-        vacancies = self.__load_vacancies()
-        updated = [v for v in vacancies if v["url"] != vacancy_url]
-        self.__save_vacancies(updated)
+        self.remove_vacancies([vacancy_url])
+
+    def __remove_where(self, condition: Callable[[Dict[str, Any]], bool]) -> int:
+        """Приватный метод удаления записей по условию за одну перезапись файла"""
+        with _exclusive_lock(self.__lock_filename):
+            kept = []
+            removed = []
+            stored, clean = self.__load_vacancies()
+            for item in stored:
+                (removed if condition(item) else kept).append(item)
+            if removed:
+                self.__commit(kept, removed=removed, backup=clean)
+        return len(removed)
+
+    def remove_vacancies(self, vacancy_urls: Iterable[str]) -> int:
+        """Пакетное удаление вакансий по URL одной перезаписью файла"""
+        urls = set(vacancy_urls)
+        if not urls:
+            return 0
+        return self.__remove_where(lambda item: item.get("url") in urls)
+
+    def prune(self, older_than: float) -> int:
+        """Удаление устаревших вакансий одной перезаписью файла"""
+        cutoff = time.time() - older_than
+        return self.__remove_where(lambda item: _is_stale(item, cutoff))
+
+
+class JSONLinesVacancyStorage(AbstractVacancyStorage):
+    """Хранилище вакансий в виде журнала JSON Lines с дозаписью.
+
+    Каждая вакансия - одна строка файла. Удаление записывает отметку
+    об удалении, повторно найденная вакансия - отметку с новым временем
+    загрузки, а в памяти поддерживается индекс URL -> смещение
+    актуальной записи. Когда удаленных записей становится много, журнал
+    уплотняется: живые записи переписываются во временный файл, который
+    атомарно заменяет исходный.
+    """
+
+    DELETED_KEY = "_deleted"
+    TOUCHED_KEY = "_touched"
+
+    def __init__(
+        self,
+        filename: str,
+        compact_threshold: int = 1000,
+        compact_ratio: float = 0.5,
+        fsync: bool = False,
+    ) -> None:
+        self.__filename = filename
+        self.__compact_threshold = compact_threshold
+        self.__compact_ratio = compact_ratio
+        self.__fsync = fsync
+        self.__index: Dict[str, int] = {}
+        self.__fetched: Dict[str, float] = {}
+        self.__dead = 0
+        self.__file: Optional[IO[bytes]] = None
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.__build_index()
+
+    def __build_index(self) -> None:
+        """Приватный метод построения индекса по содержимому журнала"""
+        self.__index = {}
+        self.__fetched = {}
+        self.__dead = 0
+        if not os.path.exists(self.__filename):
+            return
+
+        valid_size = 0
+        with open(self.__filename, "rb") as file:
+            offset = 0
+            for number, line in enumerate(file, 1):
+                if not line.endswith(b"\n"):
+                    break  # Недописанная последняя строка после сбоя
+                offset += len(line)
+                valid_size = offset
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                url = record.get("url") if isinstance(record, dict) else None
+                if not isinstance(url, str):
+                    # Поврежденная строка в середине журнала: пропускается
+                    # и удаляется при следующем уплотнении
+                    logger.warning("Пропущена поврежденная строка %s журнала %s", number, self.__filename)
+                    self.__dead += 1
+                    continue
+                line_offset = offset - len(line)
+                if record.get(self.TOUCHED_KEY):
+                    if url in self.__index:
+                        self.__fetched[url] = record.get(FETCHED_AT_KEY) or 0.0
+                    self.__dead += 1
+                    continue
+                if url in self.__index:
+                    self.__dead += 1
+                if record.get(self.DELETED_KEY):
+                    self.__index.pop(url, None)
+                    self.__fetched.pop(url, None)
+                    self.__dead += 1
+                else:
+                    self.__index[url] = line_offset
+                    self.__fetched[url] = record.get(FETCHED_AT_KEY) or 0.0
+
+        # Отбрасываем недописанную последнюю строку, чтобы следующие записи шли с новой строки
+        if os.path.getsize(self.__filename) != valid_size:
+            with open(self.__filename, "r+b") as file:
+                file.truncate(valid_size)
+
+    def __append(self, records: List[Dict[str, Any]]) -> List[int]:
+        """Приватный метод дозаписи строк в журнал одной операцией записи.
+
+        Возвращает смещения записанных строк.
+        """
+        if self.__file is None:
+            self.__file = open(self.__filename, "ab")
+        offset = self.__file.tell()
+        offsets = []
+        lines = []
+        for record in records:
+            line = json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+            offsets.append(offset)
+            lines.append(line)
+            offset += len(line)
+        data = b"".join(lines)
+        with self.metrics.time("storage_io_seconds", storage="JSONLinesVacancyStorage", op="write"):
+            self.__file.write(data)
+            self.__file.flush()
+            if self.__fsync:
+                os.fsync(self.__file.fileno())
+        self.metrics.increment("storage_io_bytes", len(data), storage="JSONLinesVacancyStorage", op="write")
+        return offsets
+
+    def __iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Приватный генератор актуальных записей журнала"""
+        if not self.__index:
+            return
+        live_offsets = set(self.__index.values())
+        with self.metrics.time("storage_io_seconds", storage="JSONLinesVacancyStorage", op="scan"):
+            with open(self.__filename, "rb") as file:
+                offset = 0
+                for line in file:
+                    if offset in live_offsets:
+                        yield json.loads(line)
+                    offset += len(line)
+            self.metrics.increment("storage_io_bytes", offset, storage="JSONLinesVacancyStorage", op="scan")
+
+    def close(self) -> None:
+        """Закрытие файла журнала"""
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def __enter__(self) -> "JSONLinesVacancyStorage":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.__index)
+
+    def __contains__(self, vacancy_url: object) -> bool:
+        return vacancy_url in self.__index
+
+    def add_vacancy(self, vacancy: Vacancy) -> None:
+        """Добавление вакансии с проверкой на дубликаты по индексу"""
+        self.add_vacancies([vacancy])
+
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> AddResult:
+        """Пакетное добавление вакансий одной дозаписью в журнал.
+
+        Для уже сохраненных вакансий дописываются отметки с новым
+        временем загрузки.
+        """
+        batch: Dict[str, Dict[str, Any]] = {}
+        touched: Dict[str, Dict[str, Any]] = {}
+        skipped = 0
+        fetched_at = time.time()
+        for vacancy in vacancies:
+            if vacancy.url in self.__index:
+                touched[vacancy.url] = {"url": vacancy.url, FETCHED_AT_KEY: fetched_at, self.TOUCHED_KEY: True}
+            if vacancy.url in self.__index or vacancy.url in batch:
+                skipped += 1
+                continue
+            batch[vacancy.url] = _to_record(vacancy, fetched_at)
+
+        if batch or touched:
+            offsets = self.__append(list(batch.values()) + list(touched.values()))
+            self.__index.update(zip(batch, offsets))
+            self.__fetched.update(dict.fromkeys(batch, fetched_at))
+            self.__fetched.update(dict.fromkeys(touched, fetched_at))
+            self.__dead += len(touched)
+            self.__maybe_compact()
+        return AddResult(len(batch), skipped)
+
+    def get_vacancies(self, criterion: str) -> List[Vacancy]:
+        """Получение вакансий по ключевому слову в описании"""
+        criterion = criterion.lower()
+        if not criterion:
+            return list(self.iter_vacancies())
+        return list(self.iter_vacancies(lambda vacancy: criterion in vacancy.description.lower()))
+
+    def iter_vacancies(self, predicate: Optional[VacancyPredicate] = None) -> Iterator[Vacancy]:
+        """Ленивый перебор вакансий с построчным чтением журнала"""
+        return _filter_vacancies(self.__iter_records(), predicate)
+
+    def top_by_salary(self, n: int, area: Optional[str] = None) -> List[Vacancy]:
+        """Топ N вакансий по зарплате потоковым чтением журнала"""
+        return _top_items(self.__iter_records(), n, area)
+
+    def remove_vacancy(self, vacancy_url: str) -> None:
+        """Удаление вакансии по URL через отметку об удалении"""
+        self.remove_vacancies([vacancy_url])
+
+    def remove_vacancies(self, vacancy_urls: Iterable[str]) -> int:
+        """Пакетное удаление вакансий одной дозаписью отметок об удалении"""
+        urls = [url for url in dict.fromkeys(vacancy_urls) if url in self.__index]
+        if not urls:
+            return 0
+        self.__append([{"url": url, self.DELETED_KEY: True} for url in urls])
+        for url in urls:
+            del self.__index[url]
+            del self.__fetched[url]
+        self.__dead += 2 * len(urls)
+        self.__maybe_compact()
+        return len(urls)
+
+    def prune(self, older_than: float) -> int:
+        """Удаление устаревших вакансий по времени загрузки из индекса в памяти"""
+        cutoff = time.time() - older_than
+        return self.remove_vacancies(
+            [url for url, fetched_at in self.__fetched.items() if fetched_at and fetched_at < cutoff]
+        )
+
+    def __maybe_compact(self) -> None:
+        """Приватный метод уплотнения журнала при большом числе удаленных записей"""
+        if (
+            self.__dead >= self.__compact_threshold
+            and self.__dead > self.__compact_ratio * (self.__dead + len(self.__index))
+        ):
+            self.compact()
+
+    def compact(self) -> None:
+        """Перезапись журнала без удаленных записей с атомарной заменой файла"""
+        self.close()
+        if not os.path.exists(self.__filename):
+            return
+        tmp_name = f"{self.__filename}.tmp"
+        with open(tmp_name, "wb") as tmp:
+            for record in self.__iter_records():
+                # Время загрузки из отметок повторного нахождения переносится в запись
+                fetched_at = self.__fetched.get(record["url"])
+                if fetched_at:
+                    record[FETCHED_AT_KEY] = fetched_at
+                tmp.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.replace(tmp_name, self.__filename)
+        self.__build_index()
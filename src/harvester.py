@@ -0,0 +1,160 @@
+import asyncio
+import time
+from typing import TYPE_CHECKING, Callable, Iterable, List, NamedTuple, Optional
+
+from src.api_connector import HeadHunterAPI
+from src.binary_storage import BinaryVacancyStorage
+from src.data_saver import AbstractVacancyStorage, JSONLinesVacancyStorage, JSONVacancyStorage
+from src.sqlite_storage import SQLiteVacancyStorage
+from src.vacancy import Vacancy
+
+if TYPE_CHECKING:
+    from src.sync import IncrementalSync
+
+DEFAULT_AREA_ID = 113  # Россия
+
+
+class HarvestJob(NamedTuple):
+    """Задание пакетного сбора: поисковый запрос и регион"""
+
+    query: str
+    region: str
+
+
+class JobReport(NamedTuple):
+    """Итоги выполнения одного задания"""
+
+    job: HarvestJob
+    fetched: int
+    inserted: int
+    skipped: int
+    seconds: float
+    error: Optional[str] = None
+    removed: int = 0
+
+    @property
+    def rate(self) -> float:
+        """Скорость загрузки в вакансиях в секунду"""
+        return self.fetched / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        title = f"{self.job.query} / {self.job.region}"
+        if self.error:
+            return f"{title}: ошибка - {self.error}"
+        removed = f", удалено {self.removed}" if self.removed else ""
+        return (
+            f"{title}: получено {self.fetched}, новых {self.inserted}, "
+            f"дубликатов {self.skipped}{removed} за {self.seconds:.2f} с ({self.rate:.0f} вак./с)"
+        )
+
+
+def parse_jobs(lines: Iterable[str]) -> List[HarvestJob]:
+    """Разбор файла заданий.
+
+    Каждая строка - "запрос; регион1, регион2, ...": запрос собирается
+    по каждому из регионов. Регион задается названием или ID, без региона
+    используется вся Россия. Пустые строки и строки с # пропускаются.
+    """
+    jobs = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        query, _, regions = line.partition(";")
+        query = query.strip()
+        if not query:
+            continue
+        region_names = [region.strip() for region in regions.split(",") if region.strip()]
+        for region in region_names or [str(DEFAULT_AREA_ID)]:
+            jobs.append(HarvestJob(query, region))
+    return jobs
+
+
+STORAGE_FORMATS = {
+    "json": JSONVacancyStorage,
+    "jsonl": JSONLinesVacancyStorage,
+    "sqlite": SQLiteVacancyStorage,
+    "binary": BinaryVacancyStorage,
+}
+_EXTENSIONS = {"jsonl": "jsonl", "db": "sqlite", "sqlite": "sqlite", "sqlite3": "sqlite", "jvb": "binary"}
+
+
+def open_storage(path: str, storage_format: Optional[str] = None) -> AbstractVacancyStorage:
+    """Открытие хранилища нужного формата.
+
+    Без явного storage_format формат определяется по расширению файла:
+    .jsonl, .db/.sqlite, .jvb (бинарный архив), иначе JSON.
+    """
+    if storage_format is None:
+        storage_format = _EXTENSIONS.get(path.rsplit(".", 1)[-1].lower(), "json")
+    if storage_format not in STORAGE_FORMATS:
+        raise ValueError(f"Неизвестный формат хранилища: {storage_format}")
+    return STORAGE_FORMATS[storage_format](path)
+
+
+async def harvest(
+    api: HeadHunterAPI,
+    storage: AbstractVacancyStorage,
+    jobs: Iterable[HarvestJob],
+    concurrency: int = 4,
+    report: Callable[[JobReport], None] = print,
+    syncer: Optional["IncrementalSync"] = None,
+) -> List[JobReport]:
+    """Асинхронный сбор вакансий по списку заданий.
+
+    Одновременно выполняется не более concurrency заданий. Запросы к API
+    идут в пуле потоков, частоту ограничивает api.rate_limiter. Результаты
+    каждого задания сохраняются одной пакетной записью тоже в пуле
+    потоков, чтобы запись не останавливала цикл событий; записи идут по
+    одной, поэтому хранилищу не нужна потокобезопасность. С syncer
+    загружаются только вакансии новее водяного знака задания.
+    """
+    if concurrency < 1:
+        raise ValueError("Количество одновременных заданий должно быть положительным")
+    semaphore = asyncio.Semaphore(concurrency)
+    storage_lock = asyncio.Lock()
+
+    async def resolve_area(region: str) -> Optional[int]:
+        if region.isdigit():
+            return int(region)
+        return await asyncio.to_thread(api.get_area_id, region)
+
+    async def run(job: HarvestJob) -> JobReport:
+        async with semaphore:
+            started = time.perf_counter()
+            area_id = await resolve_area(job.region)
+            if area_id is None:
+                result = JobReport(job, 0, 0, 0, time.perf_counter() - started, "регион не найден")
+            elif syncer is not None:
+                try:
+                    batch = await asyncio.to_thread(syncer.fetch, job.query, area_id)
+                except ConnectionError as e:
+                    result = JobReport(job, 0, 0, 0, time.perf_counter() - started, str(e))
+                else:
+                    async with storage_lock:
+                        synced = await asyncio.to_thread(syncer.commit, batch, storage)
+                    result = JobReport(
+                        job,
+                        synced.fetched,
+                        synced.inserted,
+                        synced.skipped,
+                        time.perf_counter() - started,
+                        removed=synced.removed,
+                    )
+            else:
+                # search выбрасывает ошибку задания, а get_vacancies пишет ее в общий api.last_error
+                try:
+                    items = (await asyncio.to_thread(api.search, job.query, area_id, True))["items"]
+                except ConnectionError as e:
+                    result = JobReport(job, 0, 0, 0, time.perf_counter() - started, str(e))
+                else:
+                    vacancies = Vacancy.from_api_items(items).vacancies
+                    async with storage_lock:
+                        added = await asyncio.to_thread(storage.add_vacancies, vacancies)
+                    result = JobReport(
+                        job, len(items), added.inserted, added.skipped, time.perf_counter() - started
+                    )
+        report(result)
+        return result
+
+    return list(await asyncio.gather(*(run(job) for job in jobs)))
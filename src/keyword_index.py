@@ -0,0 +1,199 @@
+import json
+import os
+import re
+import tempfile
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_TOKEN_RE = re.compile(r"\w+")
+_OR_RE = re.compile(r"\s*\|\s*|\s+OR\s+")
+_CYRILLIC_RE = re.compile(r"[а-я]")
+
+# Окончания русских слов, от длинных к коротким
+_RU_ENDINGS = (
+    "иями", "ями", "ами", "ого", "его", "ому", "ему", "ыми", "ими",
+    "ой", "ей", "ий", "ый", "ая", "яя", "ое", "ее", "ую", "юю",
+    "ах", "ях", "ов", "ев", "ом", "ем", "ам", "ям", "ью",
+    "и", "ы", "а", "я", "о", "е", "у", "ю", "ь",
+)
+_MIN_STEM = 3
+
+
+def _fold(text: str) -> str:
+    """Свертка регистра и приведение "ё" к "е" без изменения границ слов"""
+    return text.casefold().replace("ё", "е")
+
+
+def tokenize(text: str) -> List[str]:
+    """Разбиение текста на нормализованные слова.
+
+    HTML-разметка (подсветка в сниппетах hh.ru) удаляется, регистр
+    сворачивается, "ё" приводится к "е".
+    """
+    return _TOKEN_RE.findall(_fold(_TAG_RE.sub(" ", text)))
+
+
+def stem(token: str) -> str:
+    """Отсечение русского окончания для поиска по префиксу основы"""
+    if not _CYRILLIC_RE.search(token):
+        return token
+    for ending in _RU_ENDINGS:
+        if token.endswith(ending) and len(token) - len(ending) >= _MIN_STEM:
+            return token[: -len(ending)]
+    return token
+
+
+class KeywordIndex:
+    """Инвертированный индекс слов описания: слово -> множество URL.
+
+    Запрос - слова через пробел (все должны встретиться, AND), группы
+    разделяются "|" или "OR" (достаточно одной группы). Слово запроса
+    сводится к основе и ищется как префикс слов индекса, поэтому
+    "разработка" находит и "разработки", и "разработку".
+
+    candidates сужает поиск подстроки: возвращает документы, которые
+    могут содержать фрагмент, а окончательную проверку делает вызывающий.
+    Для этого индексируются и слова HTML-разметки.
+    """
+
+    __slots__ = ("__postings", "__vocabulary")
+
+    def __init__(self) -> None:
+        self.__postings: Dict[str, Set[str]] = {}
+        self.__vocabulary: Optional[List[str]] = None
+
+    @staticmethod
+    def __document_tokens(text: str) -> Set[str]:
+        """Приватный метод получения слов документа вместе со словами разметки"""
+        return set(_TOKEN_RE.findall(_fold(text)))
+
+    def add(self, url: str, text: str) -> None:
+        """Добавление документа в индекс"""
+        for token in self.__document_tokens(text):
+            urls = self.__postings.get(token)
+            if urls is None:
+                self.__postings[token] = {url}
+                self.__vocabulary = None
+            else:
+                urls.add(url)
+
+    def remove(self, url: str, text: str) -> None:
+        """Удаление документа из индекса"""
+        for token in self.__document_tokens(text):
+            urls = self.__postings.get(token)
+            if urls is None:
+                continue
+            urls.discard(url)
+            if not urls:
+                del self.__postings[token]
+                self.__vocabulary = None
+
+    def __match_prefix(self, prefix: str) -> Set[str]:
+        """Приватный метод поиска URL по префиксу слова"""
+        if self.__vocabulary is None:
+            self.__vocabulary = sorted(self.__postings)
+        vocabulary = self.__vocabulary
+        result: Set[str] = set()
+        i = bisect_left(vocabulary, prefix)
+        while i < len(vocabulary) and vocabulary[i].startswith(prefix):
+            result |= self.__postings[vocabulary[i]]
+            i += 1
+        return result
+
+    def __match_term(self, term: str) -> Set[str]:
+        """Приватный метод поиска URL по префиксу основы слова"""
+        return self.__match_prefix(stem(term))
+
+    def __match_fragment(self, token: str, left: bool, right: bool) -> Set[str]:
+        """Приватный метод поиска URL по слову фрагмента текста.
+
+        left и right - слово ограничено во фрагменте слева и справа, то
+        есть в документе оно начинает или заканчивает слово. Неограниченное
+        слово может оказаться частью более длинного слова документа.
+        """
+        if left and right:
+            return set(self.__postings.get(token, ()))
+        if left:
+            return self.__match_prefix(token)
+        result: Set[str] = set()
+        for word, urls in self.__postings.items():
+            if (word.endswith(token) if right else token in word):
+                result |= urls
+        return result
+
+    def candidates(self, fragment: str) -> Optional[Set[str]]:
+        """URL документов, которые могут содержать фрагмент как подстроку.
+
+        Возвращает надмножество точного ответа без учета регистра или
+        None, если фрагмент без букв и цифр и сузить поиск нельзя.
+        """
+        fragment = _fold(fragment)
+        words = [
+            (match.group(), match.start() > 0, match.end() < len(fragment))
+            for match in _TOKEN_RE.finditer(fragment)
+        ]
+        if not words:
+            return None
+        # Сначала точные слова и префиксы: они не требуют перебора словаря
+        words.sort(key=lambda word: (not word[1], not word[2]))
+        found: Optional[Set[str]] = None
+        for token, left, right in words:
+            urls = self.__match_fragment(token, left, right)
+            found = urls if found is None else found & urls
+            if not found:
+                break
+        return found
+
+    def search(self, query: str) -> Set[str]:
+        """Поиск URL документов по запросу с операциями AND/OR"""
+        result: Set[str] = set()
+        for group in _OR_RE.split(query.strip()):
+            terms = tokenize(group)
+            if not terms:
+                continue
+            # Сначала самые редкие слова, чтобы пересечение быстро сужалось
+            matches = sorted((self.__match_term(term) for term in terms), key=len)
+            found = set(matches[0])
+            for urls in matches[1:]:
+                if not found:
+                    break
+                found &= urls
+            result |= found
+        return result
+
+    def __len__(self) -> int:
+        return len(self.__postings)
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        """Возвращает словарь слово -> список URL для сохранения"""
+        return {token: sorted(urls) for token, urls in self.__postings.items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Iterable[str]]) -> "KeywordIndex":
+        """Создание индекса из сохраненного словаря"""
+        index = cls()
+        index.__postings = {token: set(urls) for token, urls in data.items()}
+        return index
+
+
+def load_index(filename: str, source: Dict[str, int]) -> Optional[KeywordIndex]:
+    """Загрузка индекса с диска, если он соответствует файлу данных"""
+    try:
+        with open(filename, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        if data.get("source") != source:
+            return None
+        return KeywordIndex.from_dict(data["postings"])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def save_index(filename: str, index: KeywordIndex, source: Dict[str, Any]) -> None:
+    """Атомарное сохранение индекса рядом с файлом данных"""
+    fd, tmp_name = tempfile.mkstemp(
+        dir=os.path.dirname(filename) or ".", prefix=os.path.basename(filename) + ".", suffix=".tmp"
+    )
+    with os.fdopen(fd, "w", encoding="utf-8") as file:
+        json.dump({"source": source, "postings": index.to_dict()}, file, ensure_ascii=False)
+    os.replace(tmp_name, filename)
@@ -0,0 +1,292 @@
+import functools
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Границы корзин гистограмм длительности, секунды
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class _NullTimer:
+    """Пустой замер для отключенных метрик"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsObserver:
+    """Наблюдатель метрик: счетчики и гистограммы с метками.
+
+    Базовый класс ничего не записывает и служит отключенным
+    наблюдателем по умолчанию. Код с дорогой подготовкой значений
+    проверяет enabled, чтобы при отключенных метриках не тратить время.
+    """
+
+    enabled = False
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        """Увеличение счетчика name на value"""
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Добавление значения в гистограмму name"""
+
+    def time(self, name: str, **labels: str) -> Any:
+        """Контекстный менеджер замера длительности блока в гистограмму name"""
+        return _NULL_TIMER
+
+
+NULL_METRICS = MetricsObserver()
+
+
+class _Timer:
+    """Замер длительности блока для MetricsRegistry"""
+
+    __slots__ = ("_metrics", "_name", "_labels", "_started")
+
+    def __init__(self, metrics: MetricsObserver, name: str, labels: Dict[str, str]) -> None:
+        self._metrics = metrics
+        self._name = name
+        self._labels = labels
+
+    def __enter__(self) -> "_Timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._metrics.observe(self._name, time.perf_counter() - self._started, **self._labels)
+
+
+class Histogram:
+    """Гистограмма с фиксированными границами корзин"""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # последняя корзина - +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Накопленные счетчики по верхним границам корзин"""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"count": self.count, "sum": self.sum, "buckets": self.cumulative()}
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+    return f"{{{pairs}}}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry(MetricsObserver):
+    """Потокобезопасный сборщик метрик в памяти.
+
+    Счетчики и гистограммы различаются по имени и набору меток.
+    Накопленные значения доступны через counter, histogram и to_dict,
+    а также в текстовом формате OpenMetrics (to_openmetrics).
+    """
+
+    enabled = True
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.__counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.__histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self.__lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        key = _label_key(labels)
+        with self.__lock:
+            series = self.__counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = _label_key(labels)
+        with self.__lock:
+            series = self.__histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def time(self, name: str, **labels: str) -> _Timer:
+        return _Timer(self, name, labels)
+
+    def counter(self, name: str, **labels: str) -> float:
+        """Значение счетчика, 0 если он не увеличивался"""
+        with self.__lock:
+            return self.__counters.get(name, {}).get(_label_key(labels), 0)
+
+    def histogram(self, name: str, **labels: str) -> Optional[Histogram]:
+        """Гистограмма с заданными метками или None"""
+        with self.__lock:
+            return self.__histograms.get(name, {}).get(_label_key(labels))
+
+    def reset(self) -> None:
+        """Сброс всех накопленных метрик"""
+        with self.__lock:
+            self.__counters.clear()
+            self.__histograms.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Снимок метрик: имя -> список серий с метками и значениями"""
+        with self.__lock:
+            return {
+                "counters": {
+                    name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                    for name, series in self.__counters.items()
+                },
+                "histograms": {
+                    name: [{"labels": dict(key), **histogram.to_dict()} for key, histogram in series.items()]
+                    for name, series in self.__histograms.items()
+                },
+            }
+
+    def to_openmetrics(self) -> str:
+        """Экспорт метрик в текстовом формате OpenMetrics"""
+        lines = []
+        with self.__lock:
+            for name in sorted(self.__counters):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(self.__counters[name].items()):
+                    lines.append(f"{name}_total{_format_labels(key)} {_format_number(value)}")
+            for name in sorted(self.__histograms):
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(self.__histograms[name].items()):
+                    for bound, count in histogram.cumulative():
+                        labels = _format_labels(key + (("le", _format_number(bound)),))
+                        lines.append(f"{name}_bucket{labels} {count}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_number(histogram.sum)}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+# Объекты, у которых в текущем потоке выполняется замеряемый вызов
+_active = threading.local()
+_END = object()
+
+
+def _enter(obj: Any) -> bool:
+    """Начало замера вызова obj; False, если вызов вложен в уже замеряемый"""
+    active = getattr(_active, "ids", None)
+    if active is None:
+        active = _active.ids = set()
+    if id(obj) in active:
+        return False
+    active.add(id(obj))
+    return True
+
+
+def _leave(obj: Any) -> None:
+    """Завершение замера вызова obj"""
+    _active.ids.discard(id(obj))
+
+
+def _timed_method(func: Callable[..., Any], metric: str, labels: Dict[str, str]) -> Callable[..., Any]:
+    @functools.wraps(func)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        metrics = self.metrics
+        if not metrics.enabled or not _enter(self):
+            return func(self, *args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            _leave(self)
+            metrics.observe(metric, time.perf_counter() - started, **labels)
+
+    return wrapper
+
+
+def _timed_iterator(func: Callable[..., Iterator[Any]], metric: str, labels: Dict[str, str]) -> Callable[..., Any]:
+    def timed(metrics: MetricsObserver, self: Any, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Iterator[Any]:
+        if not _enter(self):
+            yield from func(self, *args, **kwargs)
+            return
+        started = time.perf_counter()
+        try:
+            iterator = iter(func(self, *args, **kwargs))
+            first = next(iterator, _END)
+        finally:
+            _leave(self)
+            metrics.observe(metric, time.perf_counter() - started, **labels)
+        if first is _END:
+            return
+        yield first
+        yield from iterator
+
+    @functools.wraps(func)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Iterator[Any]:
+        metrics = self.metrics
+        if not metrics.enabled:
+            return func(self, *args, **kwargs)
+        return timed(metrics, self, args, kwargs)
+
+    return wrapper
+
+
+def instrument_methods(
+    cls: type,
+    metric: str,
+    names: Iterable[str],
+    iterators: Iterable[str] = (),
+    **labels: str,
+) -> None:
+    """Оборачивание методов класса замером длительности.
+
+    Длительность каждого вызова попадает в гистограмму metric с метками
+    labels и method. Оборачиваются только методы, определенные в самом
+    классе, поэтому унаследованные обертки не дублируются. Вызовы,
+    вложенные в замеряемый вызов того же объекта (например, search из
+    get_vacancies), отдельно не замеряются. Для методов из iterators
+    замеряется время до первого элемента: время, которое потребитель
+    тратит между элементами, не учитывается. Метрики берутся из
+    атрибута metrics экземпляра; если они отключены, обертка сразу
+    вызывает исходный метод.
+    """
+    iterators = set(iterators)
+    for name in names:
+        func = cls.__dict__.get(name)
+        if func is None or getattr(func, "__isabstractmethod__", False):
+            continue
+        wrap = _timed_iterator if name in iterators else _timed_method
+        setattr(cls, name, wrap(func, metric, {**labels, "method": name}))
@@ -0,0 +1,354 @@
+import logging
+import os
+import tempfile
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.data_saver import AbstractVacancyStorage, AddResult, VacancyPredicate
+from src.keyword_index import tokenize
+from src.vacancy import Vacancy
+
+logger = logging.getLogger(__name__)
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """Множество шинглов текста: последовательностей из size слов.
+
+    Текст короче size слов дает один шингл из всех слов.
+    """
+    tokens = tokenize(text)
+    if len(tokens) <= size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def vacancy_text(vacancy: Vacancy) -> str:
+    """Текст вакансии для поиска почти-дубликатов: название и описание"""
+    return f"{vacancy.name}\n{vacancy.description}"
+
+
+class MinHashIndex:
+    """Индекс почти-дубликатов текстов на MinHash с LSH.
+
+    Подпись текста - минимумы num_perm хеш-функций по его шинглам,
+    доля совпадающих позиций подписей оценивает сходство Жаккара.
+    Подпись делится на bands полос; тексты с совпадающей полосой
+    попадают в одну корзину и становятся кандидатами, поэтому поиск
+    сравнивает текст только с кандидатами, а не со всем индексом.
+    Почти-дубликат - кандидат с оценкой сходства не ниже threshold.
+
+    Подписи хранятся одной матрицей uint32, корзины - словарем хешей
+    полос: около bands записей на документ.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 16,
+        threshold: float = 0.8,
+        shingle_size: int = 3,
+        seed: int = 1,
+    ) -> None:
+        if num_perm < 1 or bands < 1 or num_perm % bands:
+            raise ValueError("Число хеш-функций должно быть кратно числу полос")
+        if not 0 < threshold <= 1:
+            raise ValueError("Порог сходства должен быть в интервале (0, 1]")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.seed = seed
+        rng = np.random.RandomState(seed)
+        self.__a = rng.randint(1, 1 << 31, size=num_perm).astype(np.uint64)
+        self.__b = rng.randint(0, 1 << 31, size=num_perm).astype(np.uint64)
+        self.__rows_per_band = num_perm // bands
+        self.__signatures = np.zeros((0, num_perm), dtype=np.uint32)
+        self.__rows: Dict[str, int] = {}
+        self.__free: List[int] = []
+        self.__buckets: Dict[int, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.__rows)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__rows
+
+    def keys(self) -> List[str]:
+        """Ключи проиндексированных документов"""
+        return list(self.__rows)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash-подпись текста, None для текста без слов"""
+        grams = shingles(text, self.shingle_size)
+        if not grams:
+            return None
+        hashes = np.fromiter((zlib.crc32(gram.encode("utf-8")) for gram in grams), dtype=np.uint64, count=len(grams))
+        # a, b < 2**31 и hash < 2**32: произведение не переполняет uint64
+        values = (np.outer(hashes, self.__a) + self.__b) % np.uint64(_PRIME)
+        return (values & np.uint64(_MAX_HASH)).min(axis=0).astype(np.uint32)
+
+    def __band_keys(self, signature: np.ndarray) -> Iterator[int]:
+        """Приватный метод ключей корзин всех полос подписи"""
+        step = self.__rows_per_band
+        for band in range(self.bands):
+            yield hash((band, signature[band * step:(band + 1) * step].tobytes()))
+
+    def query(self, signature: np.ndarray) -> List[Tuple[str, float]]:
+        """Почти-дубликаты подписи: пары (ключ, сходство) по убыванию сходства"""
+        candidates: Set[str] = set()
+        for band_key in self.__band_keys(signature):
+            candidates.update(self.__buckets.get(band_key, ()))
+        if not candidates:
+            return []
+        keys = list(candidates)
+        rows = [self.__rows[key] for key in keys]
+        similarity = (self.__signatures[rows] == signature).mean(axis=1)
+        matches = [(key, float(value)) for key, value in zip(keys, similarity) if value >= self.threshold]
+        return sorted(matches, key=lambda match: (-match[1], match[0]))
+
+    def find(self, text: str) -> Optional[str]:
+        """Ключ самого похожего почти-дубликата текста или None"""
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        matches = self.query(signature)
+        return matches[0][0] if matches else None
+
+    def add(self, key: str, signature: np.ndarray) -> None:
+        """Добавление подписи документа key (прежняя подпись заменяется)"""
+        if key in self.__rows:
+            self.remove(key)
+        if self.__free:
+            row = self.__free.pop()
+        else:
+            row = len(self.__rows)
+            if row == len(self.__signatures):
+                grown = np.zeros((max(16, 2 * row), self.num_perm), dtype=np.uint32)
+                grown[:row] = self.__signatures
+                self.__signatures = grown
+        self.__signatures[row] = signature
+        self.__rows[key] = row
+        for band_key in self.__band_keys(signature):
+            self.__buckets.setdefault(band_key, []).append(key)
+
+    def remove(self, key: str) -> bool:
+        """Удаление документа из индекса, False если его не было"""
+        row = self.__rows.pop(key, None)
+        if row is None:
+            return False
+        for band_key in self.__band_keys(self.__signatures[row]):
+            bucket = self.__buckets.get(band_key)
+            if bucket is None:
+                continue
+            bucket.remove(key)
+            if not bucket:
+                del self.__buckets[band_key]
+        self.__free.append(row)
+        return True
+
+    def __params(self) -> np.ndarray:
+        """Приватный метод параметров подписи для проверки файла индекса"""
+        return np.array([self.num_perm, self.bands, self.shingle_size, self.seed], dtype=np.int64)
+
+    def save(self, filename: str) -> None:
+        """Атомарное сохранение подписей в файл NumPy (.npz)"""
+        keys = list(self.__rows)
+        rows = [self.__rows[key] for key in keys]
+        fd, tmp_name = tempfile.mkstemp(
+            dir=os.path.dirname(filename) or ".", prefix=os.path.basename(filename) + ".", suffix=".tmp"
+        )
+        with os.fdopen(fd, "wb") as file:
+            np.savez(file, params=self.__params(), keys=np.array(keys, dtype=str), signatures=self.__signatures[rows])
+        os.replace(tmp_name, filename)
+
+    def load(self, filename: str) -> bool:
+        """Загрузка подписей из файла save.
+
+        Файл с другими параметрами подписи или поврежденный файл
+        игнорируется, тогда возвращается False.
+        """
+        try:
+            with np.load(filename, allow_pickle=False) as data:
+                if not np.array_equal(data["params"], self.__params()):
+                    return False
+                keys = data["keys"].tolist()
+                signatures = data["signatures"]
+        except (OSError, ValueError, KeyError):
+            return False
+        if signatures.shape != (len(keys), self.num_perm):
+            return False
+        self.__signatures = np.zeros((0, self.num_perm), dtype=np.uint32)
+        self.__rows = {}
+        self.__free = []
+        self.__buckets = {}
+        for key, signature in zip(keys, signatures.astype(np.uint32)):
+            self.add(key, signature)
+        return True
+
+
+class NearDuplicateStorage(AbstractVacancyStorage):
+    """Хранилище, отсеивающее почти-дубликаты вакансий.
+
+    Оборачивает любое хранилище и поддерживает MinHashIndex по
+    названию и описанию сохраненных вакансий. Добавляемая вакансия,
+    похожая на уже сохраненную (или на более раннюю в том же пакете),
+    не сохраняется и считается пропущенной; пары (URL дубликата, URL
+    сохраненной вакансии) накапливаются в duplicates. Дубликаты,
+    найденные при открытии внутри самого хранилища, не индексируются
+    и хранятся отдельно в stored_duplicates (URL дубликата -> URL
+    оригинала): повторная сверка их не перепроверяет, пока оригинал
+    на месте.
+
+    При открытии индекс сверяется с хранилищем за один проход. С
+    index_filename подписи сохраняются между запусками (close), и при
+    открытии вычисляются только подписи новых вакансий.
+    """
+
+    def __init__(
+        self,
+        storage: AbstractVacancyStorage,
+        index: Optional[MinHashIndex] = None,
+        index_filename: Optional[str] = None,
+    ) -> None:
+        self.storage = storage
+        self.index = index if index is not None else MinHashIndex()
+        self.index_filename = index_filename
+        self.duplicates: List[Tuple[str, str]] = []
+        self.stored_duplicates: Dict[str, str] = {}
+        if index_filename is not None and os.path.exists(index_filename) and not self.index.load(index_filename):
+            logger.warning("Индекс почти-дубликатов %s не подходит и будет построен заново", index_filename)
+        self.__sync_index()
+
+    def __sync_index(self) -> None:
+        """Приватный метод сверки индекса с содержимым хранилища"""
+        present = set()
+        missing = []
+        for vacancy in self.storage.iter_vacancies():
+            present.add(vacancy.url)
+            if vacancy.url not in self.index:
+                missing.append(vacancy)
+        # Удаленные вакансии исключаются до проверки новых, чтобы не считать их оригиналами
+        for key in self.index.keys():
+            if key not in present:
+                self.index.remove(key)
+        self.stored_duplicates = {
+            url: original
+            for url, original in self.stored_duplicates.items()
+            if url in present and original in self.index
+        }
+        for vacancy in missing:
+            if vacancy.url in self.stored_duplicates:
+                continue
+            original = self.__check(vacancy.url, self.index.signature(vacancy_text(vacancy)))
+            if original is not None:
+                self.stored_duplicates[vacancy.url] = original
+
+    def __check(self, url: str, signature: Optional[np.ndarray]) -> Optional[str]:
+        """Приватный метод индексации подписи вакансии.
+
+        Для почти-дубликата возвращает URL похожей вакансии, сам
+        дубликат не индексируется; иначе подпись индексируется и
+        возвращается None.
+        """
+        if signature is None:
+            return None
+        matches = self.index.query(signature)
+        if matches:
+            return matches[0][0]
+        self.index.add(url, signature)
+        return None
+
+    def __filter(self, vacancies: Iterable[Vacancy]) -> Tuple[List[Vacancy], int]:
+        """Приватный метод отбора вакансий без почти-дубликатов"""
+        kept = []
+        rejected = 0
+        for vacancy in vacancies:
+            # Вакансии с уже сохраненным URL отсеет само хранилище
+            if vacancy.url in self.index or vacancy.url in self.stored_duplicates:
+                kept.append(vacancy)
+                continue
+            original = self.__check(vacancy.url, self.index.signature(vacancy_text(vacancy)))
+            if original is None:
+                kept.append(vacancy)
+            else:
+                self.duplicates.append((vacancy.url, original))
+                rejected += 1
+        return kept, rejected
+
+    def __forget(self, urls: Iterable[str]) -> None:
+        """Приватный метод исключения удаленных вакансий из индекса.
+
+        Дубликаты удаленного оригинала перепроверяются сверкой с хранилищем.
+        """
+        for url in urls:
+            self.index.remove(url)
+            self.stored_duplicates.pop(url, None)
+        if any(original not in self.index for original in self.stored_duplicates.values()):
+            self.__sync_index()
+
+    def save_index(self) -> None:
+        """Сохранение подписей в index_filename"""
+        if self.index_filename is not None:
+            self.index.save(self.index_filename)
+
+    def close(self) -> None:
+        """Сохранение индекса и закрытие обернутого хранилища"""
+        self.save_index()
+        close = getattr(self.storage, "close", None)
+        if close is not None:
+            close()
+
+    def __enter__(self) -> "NearDuplicateStorage":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def add_vacancy(self, vacancy: Vacancy) -> None:
+        """Добавление вакансии, если она не почти-дубликат сохраненной"""
+        kept, _ = self.__filter([vacancy])
+        if kept:
+            self.storage.add_vacancy(vacancy)
+
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> AddResult:
+        """Пакетное добавление вакансий, почти-дубликаты считаются пропущенными"""
+        kept, rejected = self.__filter(vacancies)
+        result = self.storage.add_vacancies(kept)
+        return AddResult(result.inserted, result.skipped + rejected)
+
+    def get_vacancies(self, criterion: str) -> List[Vacancy]:
+        """Поиск вакансий в обернутом хранилище"""
+        return self.storage.get_vacancies(criterion)
+
+    def iter_vacancies(self, predicate: Optional[VacancyPredicate] = None) -> Iterator[Vacancy]:
+        """Обход вакансий обернутого хранилища"""
+        return self.storage.iter_vacancies(predicate)
+
+    def top_by_salary(self, n: int, area: Optional[str] = None) -> List[Vacancy]:
+        """Топ вакансий по зарплате из обернутого хранилища"""
+        return self.storage.top_by_salary(n, area)
+
+    def remove_vacancy(self, vacancy_url: str) -> None:
+        """Удаление вакансии из хранилища и индекса"""
+        self.storage.remove_vacancy(vacancy_url)
+        self.__forget([vacancy_url])
+
+    def remove_vacancies(self, vacancy_urls: Iterable[str]) -> int:
+        """Удаление вакансий из хранилища и индекса, возвращает число удаленных"""
+        urls = list(vacancy_urls)
+        removed = self.storage.remove_vacancies(urls)
+        self.__forget(urls)
+        return removed
+
+    def prune(self, older_than: float) -> int:
+        """Удаление устаревших вакансий с повторной сверкой индекса"""
+        removed = self.storage.prune(older_than)
+        if removed:
+            # Хранилище не сообщает удаленные URL, индекс сверяется заново
+            self.__sync_index()
+        return removed
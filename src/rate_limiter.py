@@ -0,0 +1,219 @@
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+
+
+class RateLimiter(ABC):
+    """Абстрактный ограничитель частоты запросов.
+
+    url в методах позволяет составным ограничителям выбирать лимит по
+    адресу запроса, простые ограничители его игнорируют.
+    """
+
+    @abstractmethod
+    def _take(self) -> float:
+        """Забирает токен (0.0) или возвращает время ожидания в секундах"""
+
+    @abstractmethod
+    def pause(self, seconds: float, url: Optional[str] = None) -> None:
+        """Запрет запросов на seconds секунд (например, после ответа 429)"""
+
+    def try_acquire(self, url: Optional[str] = None) -> bool:
+        """Попытка забрать токен без ожидания"""
+        return self._take() == 0.0
+
+    def acquire(self, url: Optional[str] = None) -> float:
+        """Ожидание токена, возвращает суммарное время ожидания в секундах"""
+        waited = 0.0
+        while True:
+            delay = self._take()
+            if delay == 0.0:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    def close(self) -> None:
+        """Освобождение ресурсов ограничителя"""
+
+
+def _refill(tokens: float, updated: float, now: float, rate: float, capacity: float) -> Tuple[float, float]:
+    """Шаг token bucket: новый запас токенов и время ожидания.
+
+    Запас может быть отрицательным после pause - это долг, который
+    восполняется с обычной скоростью.
+    """
+    tokens = min(capacity, tokens + (now - updated) * rate)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / rate
+
+
+def _check_limits(rate: float, capacity: float) -> None:
+    if rate <= 0 or capacity < 1:
+        raise ValueError("Частота должна быть положительной, емкость - не меньше 1")
+
+
+class TokenBucket(RateLimiter):
+    """Потокобезопасный ограничитель частоты запросов (token bucket).
+
+    Разрешает в среднем rate запросов в секунду и всплески до capacity
+    запросов подряд. Состояние хранится в памяти процесса.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        _check_limits(rate, capacity)
+        self.rate = rate
+        self.capacity = capacity
+        self.__tokens = capacity
+        self.__updated = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def _take(self) -> float:
+        with self.__lock:
+            now = time.monotonic()
+            self.__tokens, delay = _refill(self.__tokens, self.__updated, now, self.rate, self.capacity)
+            self.__updated = now
+            return delay
+
+    def pause(self, seconds: float, url: Optional[str] = None) -> None:
+        with self.__lock:
+            self.__tokens = min(self.__tokens, 0.0)
+            self.__updated = max(self.__updated, time.monotonic() + seconds)
+
+
+class SQLiteTokenBucket(RateLimiter):
+    """Token bucket с состоянием в файле SQLite.
+
+    Экземпляры с одинаковыми filename и name делят один запас токенов,
+    в том числе из разных процессов: изменение состояния выполняется в
+    транзакции BEGIN IMMEDIATE. Время берется по часам системы, чтобы
+    отметки были сопоставимы между процессами.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        rate: float,
+        capacity: float = 1.0,
+        name: str = "default",
+        timeout: float = 30.0,
+    ) -> None:
+        _check_limits(rate, capacity)
+        self.rate = rate
+        self.capacity = capacity
+        self.name = name
+        self.__lock = threading.Lock()
+        self.__conn = sqlite3.connect(filename, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self.__conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def __update(self, step: Callable[[float, float, float], Tuple[float, float, float]]) -> float:
+        """Приватный метод атомарного изменения состояния ведра.
+
+        step(tokens, updated, now) возвращает новые tokens, updated и
+        результат, который возвращается вызывающему.
+        """
+        with self.__lock:
+            self.__conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = self.__conn.execute(
+                    "SELECT tokens, updated FROM buckets WHERE name = ?", (self.name,)
+                ).fetchone()
+                tokens, updated = row if row is not None else (self.capacity, now)
+                tokens, updated, result = step(tokens, updated, now)
+                self.__conn.execute(
+                    "INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)",
+                    (self.name, tokens, updated),
+                )
+            except BaseException:
+                self.__conn.execute("ROLLBACK")
+                raise
+            self.__conn.execute("COMMIT")
+            return result
+
+    def _take(self) -> float:
+        def step(tokens: float, updated: float, now: float) -> Tuple[float, float, float]:
+            tokens, delay = _refill(tokens, updated, now, self.rate, self.capacity)
+            return tokens, now, delay
+
+        return self.__update(step)
+
+    def pause(self, seconds: float, url: Optional[str] = None) -> None:
+        def step(tokens: float, updated: float, now: float) -> Tuple[float, float, float]:
+            return min(tokens, 0.0), max(updated, now + seconds), 0.0
+
+        self.__update(step)
+
+    def close(self) -> None:
+        self.__conn.close()
+
+
+class EndpointRateLimiter(RateLimiter):
+    """Ограничитель с отдельными лимитами для конечных точек API.
+
+    limits сопоставляет префикс пути URL (например, "/vacancies") с
+    ограничителем; выбирается самый длинный подходящий префикс. Запросы
+    к остальным адресам ограничивает default, а без него не ограничиваются.
+    """
+
+    def __init__(self, limits: Dict[str, RateLimiter], default: Optional[RateLimiter] = None) -> None:
+        self.limits = {"/" + prefix.strip("/"): limiter for prefix, limiter in limits.items()}
+        self.default = default
+        self.__prefixes = sorted(self.limits, key=len, reverse=True)
+
+    def limiter_for(self, url: Optional[str]) -> Optional[RateLimiter]:
+        """Ограничитель для адреса url"""
+        if url is not None:
+            path = urlparse(url).path.rstrip("/")
+            for prefix in self.__prefixes:
+                if path == prefix or path.startswith(prefix + "/"):
+                    return self.limits[prefix]
+        return self.default
+
+    def _take(self) -> float:
+        return self.default._take() if self.default is not None else 0.0
+
+    def try_acquire(self, url: Optional[str] = None) -> bool:
+        limiter = self.limiter_for(url)
+        return limiter is None or limiter.try_acquire(url)
+
+    def acquire(self, url: Optional[str] = None) -> float:
+        limiter = self.limiter_for(url)
+        return 0.0 if limiter is None else limiter.acquire(url)
+
+    def pause(self, seconds: float, url: Optional[str] = None) -> None:
+        limiter = self.limiter_for(url)
+        if limiter is not None:
+            limiter.pause(seconds, url)
+
+    def close(self) -> None:
+        for limiter in self.__all():
+            limiter.close()
+
+    def __all(self) -> Iterable[RateLimiter]:
+        yield from self.limits.values()
+        if self.default is not None:
+            yield self.default
+
+
+def endpoint_limits(
+    limits: Dict[str, Tuple[float, float]], filename: Optional[str] = None
+) -> EndpointRateLimiter:
+    """Ограничитель по конечным точкам из пар (rate, capacity).
+
+    С filename состояние хранится в общем файле SQLite и разделяется
+    всеми процессами, использующими этот файл, иначе - в памяти.
+    """
+    buckets: Dict[str, RateLimiter] = {}
+    for endpoint, (rate, capacity) in limits.items():
+        if filename is None:
+            buckets[endpoint] = TokenBucket(rate, capacity)
+        else:
+            buckets[endpoint] = SQLiteTokenBucket(filename, rate, capacity, name=endpoint)
+    return EndpointRateLimiter(buckets)
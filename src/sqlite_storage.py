@@ -0,0 +1,255 @@
+import os
+import re
+import sqlite3
+import time
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from src.data_saver import AbstractVacancyStorage, AddResult, VacancyPredicate
+from src.vacancy import Vacancy, salary_key
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vacancies (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    name TEXT NOT NULL,
+    area TEXT NOT NULL,
+    salary_from INTEGER,
+    salary_to INTEGER,
+    salary_max INTEGER NOT NULL,
+    description TEXT NOT NULL,
+    fetched_at REAL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS vacancies_url ON vacancies (url);
+CREATE INDEX IF NOT EXISTS vacancies_salary_max ON vacancies (salary_max);
+CREATE INDEX IF NOT EXISTS vacancies_area_salary_max ON vacancies (area, salary_max);
+"""
+
+# Индексы по столбцам, которые добавлены в таблицу после первой версии схемы
+MIGRATED_SCHEMA = """
+CREATE INDEX IF NOT EXISTS vacancies_fetched_at ON vacancies (fetched_at);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS vacancies_fts USING fts5(
+    name, description, content='vacancies', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS vacancies_ai AFTER INSERT ON vacancies BEGIN
+    INSERT INTO vacancies_fts (rowid, name, description)
+    VALUES (new.id, new.name, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS vacancies_ad AFTER DELETE ON vacancies BEGIN
+    INSERT INTO vacancies_fts (vacancies_fts, rowid, name, description)
+    VALUES ('delete', old.id, old.name, old.description);
+END;
+"""
+
+COLUMNS = "name, area, url, salary_from, salary_to, description"
+
+# Слова в понимании токенизатора unicode61 FTS5: буквы и цифры
+_FTS_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def _rows_size(rows: Iterable[Sequence[Any]]) -> int:
+    """Объем данных строк таблицы: текст в UTF-8, числа по 8 байт"""
+    return sum(
+        len(value.encode("utf-8")) if isinstance(value, str) else 8
+        for row in rows
+        for value in row
+        if value is not None
+    )
+
+
+class SQLiteVacancyStorage(AbstractVacancyStorage):
+    """Хранилище вакансий в SQLite.
+
+    URL уникален на уровне индекса, по максимальной зарплате построен
+    индекс для выборки топа. Поиск подстроки в описании сужается
+    индексом FTS5 (если сборка SQLite его поддерживает), а окончательная
+    проверка без учета регистра идет функцией py_lower, регистрируемой в
+    соединении: встроенная lower SQLite не сворачивает кириллицу. Режим WAL позволяет
+    нескольким процессам писать в одну базу. Соединение можно использовать
+    из разных потоков, но не одновременно.
+
+    В storage_io_seconds и storage_io_bytes записываются запросы (op
+    read), перебор курсора (op scan, только объем) и транзакции записи
+    (op write); объем - данные строк, переданных в базу или из нее.
+    """
+
+    def __init__(self, filename: str, timeout: float = 30.0) -> None:
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.__connection = sqlite3.connect(filename, timeout=timeout, check_same_thread=False)
+        self.__connection.create_function("py_lower", 1, str.lower, deterministic=True)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        with self.__connection:
+            self.__connection.executescript(SCHEMA)
+            self.__migrate()
+            self.__connection.executescript(MIGRATED_SCHEMA)
+            try:
+                self.__connection.executescript(FTS_SCHEMA)
+                self.__has_fts = True
+            except sqlite3.OperationalError:
+                self.__has_fts = False
+
+    def __migrate(self) -> None:
+        """Приватный метод добавления столбцов в базу старой версии"""
+        columns = {row[1] for row in self.__connection.execute("PRAGMA table_info(vacancies)")}
+        if "fetched_at" not in columns:
+            self.__connection.execute("ALTER TABLE vacancies ADD COLUMN fetched_at REAL")
+
+    def close(self) -> None:
+        """Закрытие соединения с базой"""
+        self.__connection.close()
+
+    def __enter__(self) -> "SQLiteVacancyStorage":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.__connection.execute("SELECT COUNT(*) FROM vacancies").fetchone()[0]
+
+    @staticmethod
+    def __to_row(vacancy: Vacancy, fetched_at: float) -> tuple:
+        """Приватный метод преобразования вакансии в строку таблицы"""
+        return (
+            vacancy.name,
+            vacancy.area,
+            vacancy.url,
+            vacancy.salary_from,
+            vacancy.salary_to,
+            salary_key(vacancy.salary_from, vacancy.salary_to),
+            vacancy.description,
+            fetched_at,
+        )
+
+    @staticmethod
+    def __to_vacancy(row: tuple) -> Vacancy:
+        """Приватный метод создания вакансии из строки таблицы"""
+        return Vacancy.from_trusted(*row)
+
+    def __select(self, sql: str, params: Sequence[Any] = ()) -> List[Vacancy]:
+        """Приватный метод выборки вакансий с замером чтения"""
+        with self.metrics.time("storage_io_seconds", storage="SQLiteVacancyStorage", op="read"):
+            rows = self.__connection.execute(sql, params).fetchall()
+        if self.metrics.enabled:
+            self.metrics.increment("storage_io_bytes", _rows_size(rows), storage="SQLiteVacancyStorage", op="read")
+        return [self.__to_vacancy(row) for row in rows]
+
+    def __write(self, sql: str, rows: List[Sequence[Any]], *statements: Tuple[str, List[Sequence[Any]]]) -> int:
+        """Приватный метод изменения таблицы в одной транзакции с замером записи.
+
+        statements - дополнительные пары (запрос, строки), выполняемые в
+        той же транзакции до основного запроса. Возвращает число строк,
+        затронутых основным запросом.
+        """
+        with self.metrics.time("storage_io_seconds", storage="SQLiteVacancyStorage", op="write"):
+            with self.__connection:
+                for extra_sql, extra_rows in statements:
+                    self.__connection.executemany(extra_sql, extra_rows)
+                cursor = self.__connection.executemany(sql, rows)
+        if self.metrics.enabled:
+            size = _rows_size(rows) + sum(_rows_size(extra_rows) for _, extra_rows in statements)
+            self.metrics.increment("storage_io_bytes", size, storage="SQLiteVacancyStorage", op="write")
+        return max(cursor.rowcount, 0)
+
+    def add_vacancy(self, vacancy: Vacancy) -> None:
+        """Добавление вакансии с проверкой на дубликаты по уникальному индексу"""
+        self.add_vacancies([vacancy])
+
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> AddResult:
+        """Пакетное добавление вакансий в одной транзакции.
+
+        У уже сохраненных вакансий обновляется время загрузки.
+        """
+        fetched_at = time.time()
+        rows = [self.__to_row(vacancy, fetched_at) for vacancy in vacancies]
+        inserted = self.__write(
+            "INSERT OR IGNORE INTO vacancies "
+            "(name, area, url, salary_from, salary_to, salary_max, description, fetched_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+            ("UPDATE vacancies SET fetched_at = ? WHERE url = ?", [(fetched_at, row[2]) for row in rows]),
+        )
+        return AddResult(inserted, len(rows) - inserted)
+
+    @staticmethod
+    def __fts_query(criterion: str) -> Optional[str]:
+        """Приватный метод построения FTS5-запроса, сужающего поиск подстроки.
+
+        Слово, ограниченное в критерии с обеих сторон, должно быть словом
+        описания, ограниченное только слева - его префиксом. Слово в начале
+        критерия может оказаться концом слова описания и не используется.
+        None - сузить поиск нельзя.
+        """
+        terms = []
+        for match in _FTS_TOKEN_RE.finditer(criterion):
+            if match.start() == 0:
+                continue
+            term = f'"{match.group()}"'
+            terms.append(term if match.end() < len(criterion) else term + "*")
+        if not terms:
+            return None
+        return "description : (" + " ".join(terms) + ")"
+
+    def get_vacancies(self, criterion: str) -> List[Vacancy]:
+        """Получение вакансий по ключевому слову в описании.
+
+        Критерий ищется как подстрока описания без учета регистра, как в
+        остальных хранилищах; FTS5 только сужает перебор.
+        """
+        if not criterion:
+            return self.__select(f"SELECT {COLUMNS} FROM vacancies ORDER BY id")
+        needle = criterion.lower()
+        query = self.__fts_query(criterion) if self.__has_fts else None
+        if query is None:
+            return self.__select(
+                f"SELECT {COLUMNS} FROM vacancies WHERE instr(py_lower(description), ?) > 0 ORDER BY id",
+                (needle,),
+            )
+        return self.__select(
+            f"SELECT {COLUMNS} FROM vacancies WHERE id IN "
+            "(SELECT rowid FROM vacancies_fts WHERE vacancies_fts MATCH ?) "
+            "AND instr(py_lower(description), ?) > 0 ORDER BY id",
+            (query, needle),
+        )
+
+    def iter_vacancies(self, predicate: Optional[VacancyPredicate] = None) -> Iterator[Vacancy]:
+        """Ленивый перебор вакансий курсором базы"""
+        cursor = self.__connection.execute(f"SELECT {COLUMNS} FROM vacancies ORDER BY id")
+        size = 0
+        try:
+            for row in cursor:
+                if self.metrics.enabled:
+                    size += _rows_size((row,))
+                vacancy = self.__to_vacancy(row)
+                if predicate is None or predicate(vacancy):
+                    yield vacancy
+        finally:
+            # Время перебора зависит от потребителя, поэтому учитывается только объем
+            self.metrics.increment("storage_io_bytes", size, storage="SQLiteVacancyStorage", op="scan")
+
+    def top_by_salary(self, n: int, area: Optional[str] = None) -> List[Vacancy]:
+        """Топ N вакансий по максимальной зарплате через индекс"""
+        if area is None:
+            return self.__select(f"SELECT {COLUMNS} FROM vacancies ORDER BY salary_max DESC, id LIMIT ?", (n,))
+        return self.__select(
+            f"SELECT {COLUMNS} FROM vacancies WHERE area = ? ORDER BY salary_max DESC, id LIMIT ?",
+            (area, n),
+        )
+
+    def remove_vacancy(self, vacancy_url: str) -> None:
+        """Удаление вакансии по URL"""
+        self.__write("DELETE FROM vacancies WHERE url = ?", [(vacancy_url,)])
+
+    def remove_vacancies(self, vacancy_urls: Iterable[str]) -> int:
+        """Пакетное удаление вакансий в одной транзакции"""
+        return self.__write("DELETE FROM vacancies WHERE url = ?", [(url,) for url in set(vacancy_urls)])
+
+    def prune(self, older_than: float) -> int:
+        """Удаление устаревших вакансий одним запросом по индексу времени загрузки"""
+        return self.__write("DELETE FROM vacancies WHERE fetched_at < ?", [(time.time() - older_than,)])
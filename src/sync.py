@@ -0,0 +1,194 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set
+
+from src.api_connector import HeadHunterAPI
+from src.data_saver import AbstractVacancyStorage
+from src.vacancy import Vacancy
+
+
+def parse_published_at(value: Optional[str]) -> Optional[datetime]:
+    """Разбор даты публикации hh.ru вида 2024-01-15T10:00:00+0300"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")
+    except ValueError:
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+
+
+class SyncRecord:
+    """Состояние синхронизации одной пары (запрос, регион)"""
+
+    __slots__ = ("watermark", "last_full", "urls")
+
+    def __init__(
+        self,
+        watermark: Optional[str] = None,
+        last_full: float = 0.0,
+        urls: Iterable[str] = (),
+    ) -> None:
+        self.watermark = watermark
+        self.last_full = last_full
+        self.urls: Set[str] = set(urls)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Возвращает словарь для сохранения"""
+        return {"watermark": self.watermark, "last_full": self.last_full, "urls": sorted(self.urls)}
+
+
+class SyncState:
+    """Водяные знаки синхронизации, хранящиеся в JSON-файле"""
+
+    def __init__(self, filename: str) -> None:
+        self.__filename = filename
+        self.__records: Dict[str, SyncRecord] = {}
+        self.__lock = threading.Lock()
+        if os.path.exists(filename):
+            with open(filename, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            self.__records = {key: SyncRecord(**value) for key, value in data.items()}
+
+    @staticmethod
+    def key(query: str, area_id: int) -> str:
+        """Ключ пары (запрос, регион)"""
+        return f"{' '.join(query.split()).casefold()}|{area_id}"
+
+    def get(self, query: str, area_id: int) -> SyncRecord:
+        """Состояние пары, новое если пара еще не синхронизировалась"""
+        with self.__lock:
+            return self.__records.setdefault(self.key(query, area_id), SyncRecord())
+
+    def other_urls(self, query: str, area_id: int) -> Set[str]:
+        """URL вакансий, отслеживаемых другими парами"""
+        own_key = self.key(query, area_id)
+        with self.__lock:
+            result: Set[str] = set()
+            for key, record in self.__records.items():
+                if key != own_key:
+                    result |= record.urls
+            return result
+
+    def save(self) -> None:
+        """Атомарное сохранение состояния на диск"""
+        with self.__lock:
+            data = {key: record.to_dict() for key, record in self.__records.items()}
+        directory = os.path.dirname(self.__filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_name = f"{self.__filename}.tmp"
+        with open(tmp_name, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False)
+        os.replace(tmp_name, self.__filename)
+
+
+class SyncBatch(NamedTuple):
+    """Результат загрузки для одной пары до записи в хранилище"""
+
+    query: str
+    area_id: int
+    items: List[Dict[str, Any]]
+    full: bool
+    complete: bool
+
+
+class SyncResult(NamedTuple):
+    """Итоги синхронизации одной пары"""
+
+    fetched: int
+    inserted: int
+    skipped: int
+    removed: int
+    watermark: Optional[str]
+
+
+class IncrementalSync:
+    """Инкрементальная синхронизация выдачи hh.ru с хранилищем.
+
+    Обычный запуск запрашивает только вакансии, опубликованные после
+    водяного знака пары (параметр date_from). Раз в full_sync_interval
+    секунд выполняется полная загрузка: вакансии пары, пропавшие из
+    выдачи, удаляются из хранилища через remove_vacancy. Если выдача
+    неполная (ошибка страницы или ограничение глубины), удаление
+    не выполняется и водяной знак не сдвигается: иначе незагруженные
+    вакансии старше нового знака пропускались бы до полной загрузки.
+    Вакансии, которые отслеживают другие пары, тоже не удаляются.
+    Выдача запрашивается по убыванию даты публикации, поэтому обрезанная
+    глубиной выдача содержит самые новые вакансии.
+
+    Водяной знак строится только по published_at: date_from hh.ru
+    фильтрует по дате публикации, а в выдаче поиска нет даты изменения.
+    Поэтому вакансия, отредактированная без переопубликации, между
+    полными загрузками не запрашивается; хранилища все равно не
+    перезаписывают данные вакансии с известным URL.
+    """
+
+    def __init__(
+        self,
+        api: HeadHunterAPI,
+        state: SyncState,
+        full_sync_interval: float = 7 * 24 * 60 * 60,
+    ) -> None:
+        self.api = api
+        self.state = state
+        self.full_sync_interval = full_sync_interval
+
+    def fetch(self, query: str, area_id: int, full: bool = False) -> SyncBatch:
+        """Загрузка новых вакансий пары; ошибки сети выбрасываются как ConnectionError"""
+        record = self.state.get(query, area_id)
+        full = full or record.watermark is None or (
+            time.time() - record.last_full >= self.full_sync_interval
+        )
+        result = self.api.search(
+            query,
+            area_id,
+            all_pages=True,
+            date_from=None if full else record.watermark,
+            order_by="publication_time",
+        )
+        return SyncBatch(query, area_id, result["items"], full, result["complete"])
+
+    def commit(self, batch: SyncBatch, storage: AbstractVacancyStorage) -> SyncResult:
+        """Запись загруженных вакансий в хранилище и обновление водяного знака"""
+        record = self.state.get(batch.query, batch.area_id)
+        vacancies = Vacancy.from_api_items(batch.items).vacancies
+        added = storage.add_vacancies(vacancies)
+        current = {vacancy.url for vacancy in vacancies}
+
+        removed = 0
+        if batch.full and batch.complete:
+            # Вакансию, найденную по другому запросу, оставляем в хранилище
+            gone = record.urls - current - self.state.other_urls(batch.query, batch.area_id)
+            if gone:
+                storage.remove_vacancies(gone)
+                removed = len(gone)
+            record.urls = current
+            record.last_full = time.time()
+        else:
+            record.urls |= current
+
+        # Только дата публикации: по ней фильтрует date_from (см. описание класса)
+        published = [parse_published_at(item.get("published_at")) for item in batch.items]
+        published = [value for value in published if value is not None]
+        if record.watermark is not None:
+            previous = parse_published_at(record.watermark)
+            if previous is not None:
+                published.append(previous)
+        # Неполная выдача оставляет прежний знак, см. описание класса
+        if published and batch.complete:
+            record.watermark = max(published).isoformat()
+
+        self.state.save()
+        return SyncResult(len(batch.items), added.inserted, added.skipped, removed, record.watermark)
+
+    def sync(
+        self, query: str, area_id: int, storage: AbstractVacancyStorage, full: bool = False
+    ) -> SyncResult:
+        """Синхронизация одной пары (запрос, регион) с хранилищем"""
+        return self.commit(self.fetch(query, area_id, full), storage)
@@ -1,4 +1,32 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List, NamedTuple, Tuple
+
+
+def salary_key(salary_from: Optional[int], salary_to: Optional[int]) -> int:
+    """Ключ сортировки по зарплате: наибольшая из указанных границ"""
+    return max(salary_from or 0, salary_to or 0)
+
+
+def _validation_error(
+    name: Any, url: Any, salary_from: Any, salary_to: Any
+) -> Optional[str]:
+    """Текст ошибки валидации полей вакансии или None, если ошибок нет"""
+    if not name or not url:
+        return "Название и ссылка на вакансию обязательны"
+
+    if salary_from is not None and not isinstance(salary_from, int):
+        return "Зарплата 'от' должна быть целым числом"
+
+    if salary_to is not None and not isinstance(salary_to, int):
+        return "Зарплата 'до' должна быть целым числом"
+
+    return None
+
+
+class ParsedItems(NamedTuple):
+    """Результат пакетного разбора ответа API"""
+
+    vacancies: List["Vacancy"]
+    errors: List[Tuple[int, str]]  # (номер записи в пакете, причина)
 
 
 class Vacancy:
@@ -25,14 +53,87 @@ class Vacancy:
 
     def _validate(self) -> None:
         """Приватный метод валидации данных вакансии"""
-        if not self.name or not self.url:
-            raise ValueError("Название и ссылка на вакансию обязательны")
+        error = _validation_error(self.name, self.url, self.salary_from, self.salary_to)
+        if error:
+            raise ValueError(error)
 
-        if self.salary_from is not None and not isinstance(self.salary_from, int):
-            raise ValueError("Зарплата 'от' должна быть целым числом")
+    @classmethod
+    def from_trusted(
+        cls,
+        name: str,
+        area: str,
+        url: str,
+        salary_from: Optional[int],
+        salary_to: Optional[int],
+        description: str,
+    ) -> "Vacancy":
+        """Создание вакансии из уже проверенных данных без валидации"""
+        vacancy = cls.__new__(cls)
+        vacancy.name = name
+        vacancy.area = area
+        vacancy.url = url
+        vacancy.salary_from = salary_from
+        vacancy.salary_to = salary_to
+        vacancy.description = description or ""
+        return vacancy
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], trusted: bool = False) -> "Vacancy":
+        """Создание вакансии из словаря to_dict.
+
+        trusted=True пропускает валидацию: для данных, которые хранилище
+        уже проверило при записи.
+        """
+        if trusted:
+            return cls.from_trusted(
+                data["name"],
+                data["area"],
+                data["url"],
+                data["salary_from"],
+                data["salary_to"],
+                data["description"],
+            )
+        return cls(
+            name=data["name"],
+            area=data["area"],
+            url=data["url"],
+            salary_from=data["salary_from"],
+            salary_to=data["salary_to"],
+            description=data["description"],
+        )
 
-        if self.salary_to is not None and not isinstance(self.salary_to, int):
-            raise ValueError("Зарплата 'до' должна быть целым числом")
+    @classmethod
+    def from_api_items(cls, items: Iterable[Dict[str, Any]]) -> ParsedItems:
+        """Пакетное создание вакансий из записей ответа API hh.ru.
+
+        Некорректные записи пропускаются и попадают в errors вместе
+        с номером записи. Пустые salary, snippet и area допустимы.
+        Полное описание (поле description после загрузки деталей)
+        предпочитается фрагменту snippet.requirement.
+        """
+        vacancies = []
+        errors = []
+        for i, item in enumerate(items):
+            try:
+                salary = item.get("salary") or {}
+                snippet = item.get("snippet") or {}
+                area = item.get("area") or {}
+                name = item.get("name")
+                url = item.get("alternate_url")
+                salary_from = salary.get("from")
+                salary_to = salary.get("to")
+                area_name = area.get("name") or ""
+                description = item.get("description") or snippet.get("requirement") or ""
+            except AttributeError:
+                errors.append((i, "Некорректная структура записи"))
+                continue
+
+            error = _validation_error(name, url, salary_from, salary_to)
+            if error:
+                errors.append((i, error))
+                continue
+            vacancies.append(cls.from_trusted(name, area_name, url, salary_from, salary_to, description))
+        return ParsedItems(vacancies, errors)
 
     def __str__(self) -> str:
         salary_info = []
@@ -60,10 +161,13 @@ class Vacancy:
             return False
         return self.url == other.url
 
+    @property
+    def salary_key(self) -> int:
+        """Ключ для сравнения и сортировки вакансий по зарплате"""
+        return salary_key(self.salary_from, self.salary_to)
+
     def __lt__(self, other: "Vacancy") -> bool:
-        self_max = self.salary_to or self.salary_from or 0
-        other_max = other.salary_to or other.salary_from or 0
-        return self_max < other_max
+        return self.salary_key < other.salary_key
 
     def __le__(self, other: "Vacancy") -> bool:
         return self < other or self == other
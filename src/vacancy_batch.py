@@ -0,0 +1,193 @@
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from src.vacancy import Vacancy
+
+
+_SALARY_BITS = 40
+_SALARY_MASK = (1 << _SALARY_BITS) - 1
+
+
+class AreaSalaryStats(NamedTuple):
+    """Статистика зарплат по региону"""
+
+    count: int
+    mean: float
+    median: float
+    min: int
+    max: int
+
+
+def _intern(values: Iterable[str]) -> Tuple[np.ndarray, List[str]]:
+    """Замена строк кодами в таблице уникальных значений"""
+    table: List[str] = []
+    codes: Dict[str, int] = {}
+    result = []
+    for value in values:
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(table)
+            table.append(value)
+        result.append(code)
+    return np.asarray(result, dtype=np.int32), table
+
+
+class VacancyBatch:
+    """Колоночное представление набора вакансий для аналитики по зарплатам.
+
+    Зарплаты хранятся массивами NumPy с масками заполненности, названия
+    и регионы - кодами в таблицах уникальных строк. Фильтрация,
+    сортировка и статистики выполняются векторно, без объектов Vacancy.
+    """
+
+    __slots__ = (
+        "salary_from", "has_from", "salary_to", "has_to",
+        "name_codes", "names", "area_codes", "areas", "urls", "descriptions",
+    )
+
+    def __init__(
+        self,
+        salary_from: np.ndarray,
+        has_from: np.ndarray,
+        salary_to: np.ndarray,
+        has_to: np.ndarray,
+        name_codes: np.ndarray,
+        names: List[str],
+        area_codes: np.ndarray,
+        areas: List[str],
+        urls: np.ndarray,
+        descriptions: np.ndarray,
+    ) -> None:
+        self.salary_from = salary_from
+        self.has_from = has_from
+        self.salary_to = salary_to
+        self.has_to = has_to
+        self.name_codes = name_codes
+        self.names = names
+        self.area_codes = area_codes
+        self.areas = areas
+        self.urls = urls
+        self.descriptions = descriptions
+
+    @classmethod
+    def from_vacancies(cls, vacancies: Iterable[Vacancy]) -> "VacancyBatch":
+        """Создание набора из вакансий (например, storage.iter_vacancies())"""
+        rows = [
+            (v.name, v.area, v.url, v.salary_from, v.salary_to, v.description) for v in vacancies
+        ]
+        name_codes, names = _intern(row[0] for row in rows)
+        area_codes, areas = _intern(row[1] for row in rows)
+        has_from = np.fromiter((row[3] is not None for row in rows), dtype=bool, count=len(rows))
+        has_to = np.fromiter((row[4] is not None for row in rows), dtype=bool, count=len(rows))
+        salary_from = np.fromiter((row[3] or 0 for row in rows), dtype=np.int64, count=len(rows))
+        salary_to = np.fromiter((row[4] or 0 for row in rows), dtype=np.int64, count=len(rows))
+        urls = np.array([row[2] for row in rows], dtype=object)
+        descriptions = np.array([row[5] for row in rows], dtype=object)
+        return cls(
+            salary_from, has_from, salary_to, has_to,
+            name_codes, names, area_codes, areas, urls, descriptions,
+        )
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def __getitem__(self, i: int) -> Vacancy:
+        return Vacancy.from_trusted(
+            self.names[self.name_codes[i]],
+            self.areas[self.area_codes[i]],
+            self.urls[i],
+            int(self.salary_from[i]) if self.has_from[i] else None,
+            int(self.salary_to[i]) if self.has_to[i] else None,
+            self.descriptions[i],
+        )
+
+    def to_vacancies(self) -> List[Vacancy]:
+        """Преобразование набора обратно в список вакансий"""
+        return [self[i] for i in range(len(self))]
+
+    @property
+    def salary_key(self) -> np.ndarray:
+        """Ключ сортировки по зарплате, как salary_key для одной вакансии"""
+        return np.maximum(self.salary_from, self.salary_to)
+
+    @property
+    def has_salary(self) -> np.ndarray:
+        """Маска вакансий, у которых указана хотя бы одна граница зарплаты"""
+        return self.has_from | self.has_to
+
+    def area_mask(self, area: str) -> np.ndarray:
+        """Маска вакансий региона area"""
+        try:
+            code = self.areas.index(area)
+        except ValueError:
+            return np.zeros(len(self), dtype=bool)
+        return self.area_codes == code
+
+    def filter(self, mask: np.ndarray) -> "VacancyBatch":
+        """Новый набор из вакансий, отмеченных булевой маской"""
+        return self.take(np.flatnonzero(mask))
+
+    def take(self, indices: Sequence[int]) -> "VacancyBatch":
+        """Новый набор из вакансий с указанными позициями"""
+        return VacancyBatch(
+            self.salary_from[indices], self.has_from[indices],
+            self.salary_to[indices], self.has_to[indices],
+            self.name_codes[indices], self.names,
+            self.area_codes[indices], self.areas,
+            self.urls[indices], self.descriptions[indices],
+        )
+
+    def sort_by_salary(self, descending: bool = True) -> "VacancyBatch":
+        """Набор, упорядоченный по ключу зарплаты (сортировка устойчивая)"""
+        key = self.salary_key
+        order = np.argsort(-key if descending else key, kind="stable")
+        return self.take(order)
+
+    def top_by_salary(self, n: int) -> "VacancyBatch":
+        """N вакансий с наибольшей зарплатой"""
+        return self.take(np.argsort(-self.salary_key, kind="stable")[:n])
+
+    def percentile(self, q: "np.typing.ArrayLike", only_with_salary: bool = True) -> np.ndarray:
+        """Перцентили ключа зарплаты (q от 0 до 100)"""
+        key = self.salary_key[self.has_salary] if only_with_salary else self.salary_key
+        if not len(key):
+            return np.full(np.shape(q), np.nan)
+        return np.percentile(key, q)
+
+    def group_by_area(self) -> Dict[str, AreaSalaryStats]:
+        """Статистика зарплат по регионам для вакансий с указанной зарплатой.
+
+        Пара (регион, зарплата) упаковывается в одно 64-битное число и
+        сортируется один раз, после чего границы групп, медианы и суммы
+        вычисляются векторно.
+        """
+        valid = self.has_salary
+        key = self.salary_key[valid]
+        if not len(key):
+            return {}
+
+        packed = (self.area_codes[valid].astype(np.int64) << _SALARY_BITS) | np.minimum(key, _SALARY_MASK)
+        packed.sort()
+        codes = packed >> _SALARY_BITS
+        key = packed & _SALARY_MASK
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(codes)) + 1))
+        counts = np.diff(np.concatenate((starts, [len(key)])))
+        sums = np.add.reduceat(key, starts)
+        lower = key[starts + (counts - 1) // 2]
+        upper = key[starts + counts // 2]
+        medians = (lower + upper) / 2
+        minimums = key[starts]
+        maximums = key[starts + counts - 1]
+
+        return {
+            self.areas[codes[start]]: AreaSalaryStats(
+                int(count), float(total / count), float(median), int(low), int(high)
+            )
+            for start, count, total, median, low, high in zip(
+                starts, counts, sums, medians, minimums, maximums
+            )
+        }
+
+    def __repr__(self) -> str:
+        return f"VacancyBatch(size={len(self)}, areas={len(self.areas)})"
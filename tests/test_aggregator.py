@@ -0,0 +1,144 @@
+import os
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from src.aggregator import PlatformAggregator, dedupe_key
+from src.api_connector import FixtureJobPlatform, SuperJobAPI
+from src.metrics import MetricsRegistry
+from src.vacancy import Vacancy
+
+FIXTURE = os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks", "fixtures", "vacancies.json")
+
+
+def make_item(item_id, name, employer, salary_from=100000, area_id="1"):
+    """Запись выдачи в формате hh.ru"""
+    return {
+        "id": str(item_id),
+        "name": name,
+        "alternate_url": f"https://example.com/vacancy/{item_id}",
+        "area": {"id": area_id, "name": "Москва"},
+        "employer": {"name": employer},
+        "salary": {"from": salary_from, "to": None},
+        "snippet": {"requirement": "Python"},
+    }
+
+
+class TestDedupeKey(unittest.TestCase):
+    def test_normalizes_title_and_employer(self):
+        """Тест нормализации названия и работодателя в ключе дедупликации"""
+        first = make_item(1, "Python-разработчик", "ООО «Ромашка»")
+        second = make_item(2, "python  разработчик", "ооо ромашка")
+        self.assertEqual(dedupe_key(first), dedupe_key(second))
+        self.assertNotEqual(dedupe_key(first), dedupe_key(make_item(3, "Python-разработчик", "Ромашка", 120000)))
+        self.assertIsNone(dedupe_key({"name": ""}))
+        self.assertIsNone(dedupe_key({"name": "x", "salary": "bad"}))
+
+
+class TestPlatformAggregator(unittest.TestCase):
+    def test_merges_and_dedupes_across_platforms(self):
+        """Тест объединения выдачи платформ без дубликатов"""
+        hh = FixtureJobPlatform(FIXTURE)
+        other = FixtureJobPlatform(
+            [
+                make_item("sj1", "Python разработчик", "Яндекс", 200000),
+                make_item("sj2", "Senior Python Developer", "Другая компания"),
+            ]
+        )
+        hh.items[0]["salary"]["to"] = None
+        metrics = MetricsRegistry()
+        with PlatformAggregator({"hh": hh, "other": other}, metrics=metrics) as aggregator:
+            result = aggregator.search("python")
+
+        self.assertTrue(result.complete)
+        self.assertEqual([r.provider for r in result.providers], ["hh", "other"])
+        urls = [item["alternate_url"] for item in result.items]
+        self.assertEqual(len(urls), len(set(urls)))
+        self.assertIn("https://example.com/vacancy/sj2", urls)
+        duplicates = sum(r.duplicates for r in result.providers)
+        self.assertEqual(duplicates, 1)
+        self.assertEqual(sum(metrics.counter("aggregator_duplicates", provider=name) for name in ("hh", "other")), 1)
+        self.assertEqual(metrics.counter("aggregator_providers", provider="hh", result="ok"), 1)
+        self.assertEqual(len(Vacancy.from_api_items(result.items).vacancies), len(result.items))
+
+    def test_slow_provider_times_out(self):
+        """Тест таймаута медленной платформы без ожидания ее ответа"""
+        fast = FixtureJobPlatform([make_item(1, "Python Developer", "A")])
+        slow = FixtureJobPlatform([make_item(2, "Python Engineer", "B")], delay=1.0)
+        aggregator = PlatformAggregator(timeout=5.0)
+        aggregator.register("fast", fast)
+        aggregator.register("slow", slow, timeout=0.1)
+
+        started = time.monotonic()
+        results = list(aggregator.iter_search("python"))
+        self.assertLess(time.monotonic() - started, 0.9)
+        self.assertEqual([r.provider for r in results], ["fast", "slow"])
+        self.assertEqual(len(results[0].items), 1)
+        self.assertEqual(results[1].error, "превышено время ожидания")
+        aggregator.close()
+
+    def test_provider_errors_and_regions(self):
+        """Тест ошибок платформ и разрешения региона"""
+        ok = FixtureJobPlatform([make_item(1, "Python Developer", "A"), make_item(2, "Python Dev", "B", area_id="2")])
+        broken = FixtureJobPlatform([])
+        broken.get_vacancies = Mock(side_effect=ConnectionError("Статус: 503"))
+        aggregator = PlatformAggregator({"ok": ok, "broken": broken})
+
+        result = aggregator.search("python", region="Москва")
+        self.assertFalse(result.complete)
+        self.assertEqual([item["id"] for item in result.items], ["1"])
+        self.assertEqual(result.providers[1].error, "регион не найден")
+
+        result = aggregator.search("python")
+        self.assertEqual(len(result.items), 2)
+        self.assertEqual(result.providers[1].error, "Статус: 503")
+        with self.assertRaises(ValueError):
+            aggregator.register("ok", ok)
+
+
+class TestSuperJobAPI(unittest.TestCase):
+    @patch("requests.Session.get")
+    def test_items_converted_to_hh_format(self, mock_get):
+        """Тест приведения выдачи SuperJob к формату hh.ru"""
+        response = Mock()
+        response.status_code = 200
+        response.json.return_value = {
+            "objects": [
+                {
+                    "id": 42,
+                    "profession": "Python-разработчик",
+                    "link": "https://www.superjob.ru/vakansii/42.html",
+                    "payment_from": 150000,
+                    "payment_to": 0,
+                    "currency": "rub",
+                    "town": {"id": 4, "title": "Москва"},
+                    "firm_name": "Яндекс",
+                    "candidat": "Опыт Django",
+                    "date_published": 0,
+                }
+            ],
+            "total": 1,
+            "more": False,
+        }
+        mock_get.return_value = response
+
+        with SuperJobAPI("key") as api:
+            self.assertEqual(api._session.headers["X-Api-App-Id"], "key")
+            items = api.get_vacancies("python", 4)
+
+        self.assertEqual(mock_get.call_args.kwargs["params"]["town"], 4)
+        self.assertNotIn("no_agreement", mock_get.call_args.kwargs["params"])
+        self.assertEqual(items[0]["salary"], {"from": 150000, "to": None, "currency": "RUR"})
+        self.assertEqual(items[0]["employer"], {"name": "Яндекс"})
+        vacancy = Vacancy.from_api_items(items).vacancies[0]
+        self.assertEqual(
+            (vacancy.name, vacancy.area, vacancy.description), ("Python-разработчик", "Москва", "Опыт Django")
+        )
+
+        with SuperJobAPI("key", salary_only=True) as api:
+            api.get_vacancies("python")
+        self.assertEqual(mock_get.call_args.kwargs["params"]["no_agreement"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
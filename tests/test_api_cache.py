@@ -0,0 +1,101 @@
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from src.api_cache import CacheEntry, MemoryCache, SQLiteCache, TieredCache, make_key
+
+
+def entry(value, stored_at=None):
+    return CacheEntry(value, '"etag"', None, time.time() if stored_at is None else stored_at)
+
+
+class TestMakeKey(unittest.TestCase):
+    def test_normalization(self):
+        """Тест нормализации параметров запроса"""
+        first = make_key("https://api.hh.ru/vacancies", {"text": " Python  Developer", "area": 1, "page": 0})
+        second = make_key("https://api.hh.ru/vacancies", {"page": 0, "area": 1, "text": "python developer"})
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, make_key("https://api.hh.ru/vacancies", {"text": "python", "area": 2}))
+        self.assertIn("only_with_salary=true", make_key("u", {"only_with_salary": True}))
+
+
+class TestMemoryCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        """Тест вытеснения давно не использованных записей"""
+        cache = MemoryCache(maxsize=2)
+        cache.set("a", entry(1))
+        cache.set("b", entry(2))
+        cache.get("a")
+        cache.set("c", entry(3))
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a").value, 1)
+        self.assertEqual(len(cache), 2)
+
+    def test_ttl(self):
+        """Тест устаревания записи по TTL"""
+        cache = MemoryCache(ttl=60)
+        self.assertTrue(cache.is_fresh(entry(1)))
+        self.assertFalse(cache.is_fresh(entry(1, stored_at=time.time() - 120)))
+
+
+class TestSQLiteCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "cache.db")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_persistence_and_limit(self):
+        """Тест сохранения записей на диске и ограничения их числа"""
+        cache = SQLiteCache(self.path, max_entries=2)
+        cache.set("a", entry({"items": [1]}, stored_at=1))
+        cache.set("b", entry({"items": [2]}, stored_at=2))
+        cache.set("c", entry({"items": [3]}, stored_at=3))
+        cache.close()
+
+        reopened = SQLiteCache(self.path)
+        self.assertIsNone(reopened.get("a"))
+        self.assertEqual(reopened.get("c"), CacheEntry({"items": [3]}, '"etag"', None, 3))
+        reopened.close()
+
+    def test_eviction_in_batches(self):
+        """Тест вытеснения старых записей пакетом только при переполнении"""
+        cache = SQLiteCache(self.path, max_entries=20, evict_fraction=0.1)
+        statements = []
+        cache._SQLiteCache__connection.set_trace_callback(statements.append)
+        for i in range(20):
+            cache.set(str(i), entry(i, stored_at=i))
+        self.assertFalse([sql for sql in statements if sql.startswith(("DELETE", "SELECT COUNT"))])
+
+        # Повторная запись существующих ключей не вытесняет записи
+        cache.set("19", entry(19, stored_at=19))
+        self.assertEqual(cache.get("0").value, 0)
+
+        cache.set("20", entry(20, stored_at=20))
+        cache.close()
+        with sqlite3.connect(self.path) as connection:
+            keys = [row[0] for row in connection.execute("SELECT key FROM responses ORDER BY stored_at")]
+        connection.close()
+        self.assertEqual(keys, [str(i) for i in range(3, 21)])
+
+    def test_tiered(self):
+        """Тест подъема записи с диска в память"""
+        disk = SQLiteCache(self.path)
+        memory = MemoryCache()
+        cache = TieredCache(memory, disk)
+
+        disk.set("a", entry([1]))
+        self.assertEqual(cache.get("a").value, [1])
+        self.assertEqual(memory.get("a").value, [1])
+
+        cache.clear()
+        self.assertIsNone(cache.get("a"))
+        disk.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
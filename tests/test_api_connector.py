@@ -1,5 +1,8 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, Mock
+from src.api_cache import MemoryCache
 from src.api_connector import HeadHunterAPI
 
 
@@ -7,7 +10,10 @@ class TestHeadHunterAPI(unittest.TestCase):
     def setUp(self):
         self.api = HeadHunterAPI()
 
-    @patch("requests.get")
+    def tearDown(self):
+        self.api.close()
+
+    @patch("requests.Session.get")
     def test_get_area_id_success(self, mock_get):
         """Тест успешного получения ID региона"""
         mock_response = Mock()
@@ -36,8 +42,39 @@ class TestHeadHunterAPI(unittest.TestCase):
         # Регион не найден
         self.assertIsNone(self.api.get_area_id("Несуществующий город"))
 
-    @patch("requests.get")
-    def test_get_area_id_failure(self, mock_get):
+    @patch("requests.Session.get")
+    def test_get_area_id_cached(self, mock_get):
+        """Тест кэширования дерева регионов на диске и ревалидации по ETag"""
+        ok = Mock()
+        ok.status_code = 200
+        ok.headers = {"ETag": '"v1"'}
+        ok.json.return_value = [{"id": "113", "name": "Россия", "areas": [{"id": "1", "name": "Москва"}]}]
+        not_modified = Mock()
+        not_modified.status_code = 304
+        mock_get.side_effect = [ok, not_modified]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "areas.json")
+
+            api = HeadHunterAPI(areas_cache_path=path)
+            self.assertEqual(api.get_area_id("Москва"), 1)
+            self.assertEqual(api.get_area_id("россия"), 113)
+            self.assertEqual(mock_get.call_count, 1)
+
+            # Теплый кэш: сетевой запрос не нужен
+            warm = HeadHunterAPI(areas_cache_path=path)
+            self.assertEqual(warm.get_area_id("Москва"), 1)
+            self.assertEqual(mock_get.call_count, 1)
+
+            # Истекший кэш: условный запрос с If-None-Match
+            expired = HeadHunterAPI(areas_cache_path=path, areas_ttl=0)
+            self.assertEqual(expired.get_area_id("Москва"), 1)
+            self.assertEqual(mock_get.call_count, 2)
+            self.assertEqual(mock_get.call_args.kwargs["headers"], {"If-None-Match": '"v1"'})
+
+    @patch("time.sleep")
+    @patch("requests.Session.get")
+    def test_get_area_id_failure(self, mock_get, mock_sleep):
         """Тест ошибки при получении ID региона"""
         mock_response = Mock()
         mock_response.status_code = 404
@@ -45,7 +82,7 @@ class TestHeadHunterAPI(unittest.TestCase):
 
         self.assertIsNone(self.api.get_area_id("Москва"))
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_vacancies_success(self, mock_get):
         """Тест успешного получения вакансий"""
         mock_response = Mock()
@@ -67,15 +104,206 @@ class TestHeadHunterAPI(unittest.TestCase):
         self.assertEqual(len(vacancies), 1)
         self.assertEqual(vacancies[0]["name"], "Python Developer")
 
-    @patch("requests.get")
-    def test_get_vacancies_failure(self, mock_get):
+    @patch("time.sleep")
+    @patch("requests.Session.get")
+    def test_get_vacancies_failure(self, mock_get, mock_sleep):
         """Тест ошибки при получении вакансий"""
         mock_response = Mock()
         mock_response.status_code = 500
+        mock_response.headers = {}
         mock_get.return_value = mock_response
 
         vacancies = self.api.get_vacancies("Python", 1)
         self.assertEqual(len(vacancies), 0)
+        self.assertIn("500", self.api.last_error)
+        self.assertEqual(mock_get.call_count, self.api.max_retries + 1)
+        self.assertEqual(self.api.stats.errors, 1)
+
+    @patch("requests.Session.get")
+    def test_get_vacancies_cached(self, mock_get):
+        """Тест кэширования ответов и ревалидации по ETag"""
+        ok = Mock()
+        ok.status_code = 200
+        ok.headers = {"ETag": '"v1"'}
+        ok.json.return_value = {"items": [{"name": "Python Developer"}]}
+        not_modified = Mock()
+        not_modified.status_code = 304
+        mock_get.side_effect = [ok, not_modified]
+
+        cache = MemoryCache(ttl=60)
+        api = HeadHunterAPI(cache=cache)
+        self.assertEqual(len(api.get_vacancies("Python", 1)), 1)
+        self.assertEqual(len(api.get_vacancies(" python ", 1)), 1)
+        self.assertEqual(mock_get.call_count, 1)
+
+        cache.ttl = 0
+        self.assertEqual(len(api.get_vacancies("Python", 1)), 1)
+        self.assertEqual(mock_get.call_args.kwargs["headers"], {"If-None-Match": '"v1"'})
+        self.assertEqual(cache.stats.to_dict()["hits"], 1)
+        self.assertEqual(cache.stats.misses, 1)
+        self.assertEqual(cache.stats.revalidations, 1)
+
+    @patch("time.sleep")
+    @patch("requests.Session.get")
+    def test_retry_after_transient_error(self, mock_get, mock_sleep):
+        """Тест повтора запроса после 503 с учетом Retry-After"""
+        unavailable = Mock()
+        unavailable.status_code = 503
+        unavailable.headers = {"Retry-After": "2"}
+        ok = Mock()
+        ok.status_code = 200
+        ok.json.return_value = {"items": [{"name": "Python Developer"}]}
+        mock_get.side_effect = [unavailable, ok]
+
+        vacancies = self.api.get_vacancies("Python", 1)
+        self.assertEqual(len(vacancies), 1)
+        mock_sleep.assert_called_once_with(2.0)
+        self.assertEqual(self.api.stats.retries, 1)
+        self.assertEqual(self.api.stats.requests, 2)
+        self.assertIsNone(self.api.last_error)
+
+    @patch("time.sleep")
+    @patch("requests.Session.get")
+    def test_no_retry_on_client_error(self, mock_get, mock_sleep):
+        """Тест отсутствия повторов при ошибке клиента"""
+        mock_response = Mock()
+        mock_response.status_code = 400
+        mock_get.return_value = mock_response
+
+        self.assertEqual(self.api.get_vacancies("Python", 1), [])
+        self.assertEqual(mock_get.call_count, 1)
+        mock_sleep.assert_not_called()
+
+    @patch("requests.Session.get")
+    def test_get_vacancies_all_pages(self, mock_get):
+        """Тест загрузки всех страниц выдачи в порядке страниц"""
+
+        def fake_get(url, params, headers, timeout):
+            page = params["page"]
+            response = Mock()
+            response.status_code = 200
+            response.json.return_value = {
+                "pages": 3,
+                "found": 3,
+                "items": [{"name": f"Вакансия {page}"}],
+            }
+            return response
+
+        mock_get.side_effect = fake_get
+
+        vacancies = self.api.get_vacancies("Python", 1, all_pages=True)
+        self.assertEqual(
+            [v["name"] for v in vacancies],
+            ["Вакансия 0", "Вакансия 1", "Вакансия 2"],
+        )
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch("requests.Session.get")
+    def test_search_date_from(self, mock_get):
+        """Тест передачи date_from, order_by и признака полноты выдачи"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"pages": 1, "found": 1, "items": [{"name": "x"}]}
+        mock_get.return_value = mock_response
+
+        result = self.api.search(
+            "Python", 1, all_pages=True, date_from="2024-01-15T10:00:00+03:00", order_by="publication_time"
+        )
+        self.assertEqual(mock_get.call_args.kwargs["params"]["date_from"], "2024-01-15T10:00:00+03:00")
+        self.assertEqual(mock_get.call_args.kwargs["params"]["order_by"], "publication_time")
+        self.assertTrue(result["complete"])
+        self.assertEqual(result["found"], 1)
+
+        mock_response.json.return_value = {"pages": 30, "found": 3000, "items": [{"name": "x"}]}
+        self.assertFalse(self.api.search("Python", 1, all_pages=True)["complete"])
+
+    @patch("requests.Session.get")
+    def test_get_vacancies_depth_limit(self, mock_get):
+        """Тест ограничения глубины выдачи hh.ru"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"pages": 50, "items": [{"name": "x"}]}
+        mock_get.return_value = mock_response
+
+        vacancies = self.api.get_vacancies("Python", 1, all_pages=True)
+        self.assertEqual(len(vacancies), HeadHunterAPI.MAX_DEPTH // HeadHunterAPI.PER_PAGE)
+
+    @patch("requests.Session.get")
+    def test_search_enrich_details(self, mock_get):
+        """Тест загрузки полных описаний с кэшем по id и дате изменения"""
+
+        def fake_get(url, params, headers, timeout):
+            response = Mock()
+            response.status_code = 200
+            if url.endswith("/vacancies"):
+                page = params["page"]
+                response.json.return_value = {
+                    "pages": 2,
+                    "found": 4,
+                    "items": [
+                        {"id": str(page * 2 + i), "updated_at": "2024-02-01", "snippet": {"requirement": "..."}}
+                        for i in range(2)
+                    ],
+                }
+            elif url.endswith("/3"):
+                response.status_code = 404
+            else:
+                vacancy_id = url.rsplit("/", 1)[1]
+                response.json.return_value = {
+                    "id": vacancy_id,
+                    "description": f"<p>Python &amp; Django</p><ul><li>id {vacancy_id}</li></ul>",
+                }
+            return response
+
+        mock_get.side_effect = fake_get
+        detail_cache = MemoryCache(ttl=60)
+        api = HeadHunterAPI(enrich=True, detail_workers=2, detail_cache=detail_cache)
+
+        result = api.search("Python", 1, all_pages=True)
+        descriptions = {item["id"]: item.get("description") for item in result["items"]}
+        self.assertEqual(descriptions["0"], "Python & Django\nid 0")
+        self.assertIsNone(descriptions["3"])  # Ошибка загрузки деталей не прерывает поиск
+        self.assertEqual(result["enriched"], 3)
+        self.assertEqual(mock_get.call_count, 2 + 4)
+
+        # Повторный поиск берет описания из кэша, кроме незагруженного
+        mock_get.reset_mock()
+        result = api.search("Python", 1, all_pages=True)
+        self.assertEqual(result["enriched"], 3)
+        self.assertEqual(mock_get.call_count, 2 + 1)
+        self.assertEqual(detail_cache.stats.hits, 3)
+
+        # Без enrich детали не загружаются
+        mock_get.reset_mock()
+        self.assertEqual(api.search("Python", 1, all_pages=True, enrich=False)["enriched"], 0)
+        self.assertEqual(mock_get.call_count, 2)
+        api.close()
+
+    @patch("requests.Session.get")
+    def test_search_skips_malformed_details(self, mock_get):
+        """Тест пропуска деталей вакансии, не являющихся объектом с текстом"""
+        details = {"1": ["не объект"], "2": {"description": 42}, "3": {"description": "<p>Go</p>"}}
+
+        def fake_get(url, params, headers, timeout):
+            response = Mock()
+            response.status_code = 200
+            if url.endswith("/vacancies"):
+                response.json.return_value = {
+                    "pages": 1,
+                    "found": 3,
+                    "items": [{"id": vacancy_id, "snippet": {}} for vacancy_id in details],
+                }
+            else:
+                response.json.return_value = details[url.rsplit("/", 1)[1]]
+            return response
+
+        mock_get.side_effect = fake_get
+        with HeadHunterAPI(enrich=True, detail_workers=2) as api:
+            result = api.search("Go", 1)
+
+        descriptions = {item["id"]: item.get("description") for item in result["items"]}
+        self.assertEqual(descriptions, {"1": None, "2": None, "3": "Go"})
+        self.assertEqual(result["enriched"], 1)
 
 
 if __name__ == "__main__":
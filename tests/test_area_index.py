@@ -0,0 +1,89 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from src.area_index import AreaCache, AreaIndex
+
+
+AREAS = [
+    {
+        "id": "113",
+        "name": "Россия",
+        "areas": [
+            {
+                "id": "1620",
+                "name": "Республика Марий Эл",
+                "areas": [
+                    {
+                        "id": "1621",
+                        "name": "Йошкар-Ола",
+                        "areas": [{"id": "9999", "name": "Вымышленный поселок", "areas": []}],
+                    }
+                ],
+            },
+            {"id": "1", "name": "Москва", "areas": []},
+        ],
+    }
+]
+
+
+class TestAreaIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = AreaIndex(AREAS)
+
+    def test_lookup(self):
+        """Тест поиска региона без учета регистра"""
+        self.assertEqual(self.index.get("Москва"), 1)
+        self.assertEqual(self.index.get("  москва "), 1)
+        self.assertEqual(self.index.get("РОССИЯ"), 113)
+        self.assertIsNone(self.index.get("Атлантида"))
+
+    def test_deep_nesting(self):
+        """Тест поиска на глубоких уровнях вложенности"""
+        self.assertEqual(self.index.get("йошкар-ола"), 1621)
+        self.assertEqual(self.index.get("Вымышленный поселок"), 9999)
+        self.assertEqual(len(self.index), 5)
+
+
+class TestAreaCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "areas.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_store_and_reload(self):
+        """Тест сохранения и повторной загрузки кэша"""
+        cache = AreaCache(self.path, ttl=60)
+        self.assertFalse(cache.is_fresh)
+        cache.store(AREAS, '"etag-1"')
+
+        reloaded = AreaCache(self.path, ttl=60)
+        self.assertTrue(reloaded.is_fresh)
+        self.assertEqual(reloaded.etag, '"etag-1"')
+        self.assertEqual(reloaded.areas, AREAS)
+
+    def test_expired(self):
+        """Тест устаревания кэша по TTL"""
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"etag": "x", "fetched_at": time.time() - 120, "areas": AREAS}, f)
+
+        cache = AreaCache(self.path, ttl=60)
+        self.assertFalse(cache.is_fresh)
+        self.assertEqual(cache.areas, AREAS)
+
+    def test_corrupted_file(self):
+        """Тест игнорирования поврежденного файла кэша"""
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("{not json")
+
+        cache = AreaCache(self.path)
+        self.assertIsNone(cache.areas)
+        self.assertFalse(cache.is_fresh)
+
+
+if __name__ == "__main__":
+    unittest.main()
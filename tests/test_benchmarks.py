@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+import unittest
+
+from benchmarks.harness import measure, percentile, synthetic_vacancies
+from benchmarks.run import QUERIES, SEARCH_QUERIES, main
+from benchmarks.stub_server import StubHeadHunterServer
+from src.api_connector import HeadHunterAPI
+from src.data_saver import JSONVacancyStorage
+
+
+class TestHarness(unittest.TestCase):
+    def test_percentile_nearest_rank(self):
+        """Тест перцентиля по методу ближайшего ранга"""
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 50), 50)
+        self.assertEqual(percentile(samples, 99), 99)
+        self.assertEqual(percentile([3.0], 99), 3.0)
+        with self.assertRaises(ValueError):
+            percentile([], 50)
+
+    def test_measure_calls_extra_traced_run(self):
+        """Тест дополнительного прогона с замером памяти"""
+        calls = []
+        result = measure("suite", "op", 10, calls.append, 5, items=2)
+        self.assertEqual(calls, [0, 1, 2, 3, 4, 5])
+        self.assertEqual(result.ops, 5)
+        self.assertIsNotNone(result.peak_memory)
+        self.assertGreater(result.throughput, 0)
+
+    def test_synthetic_vacancies_deterministic(self):
+        """Тест воспроизводимости синтетических вакансий"""
+        first = synthetic_vacancies(50)
+        second = synthetic_vacancies(50)
+        self.assertEqual([v.url for v in first], [v.url for v in second])
+        self.assertEqual(len({v.url for v in first}), 50)
+        self.assertEqual([v.salary_key for v in first], [v.salary_key for v in second])
+
+
+class TestStubServer(unittest.TestCase):
+    def test_api_against_stub(self):
+        """Тест клиента API на локальной заглушке hh.ru"""
+        with StubHeadHunterServer(found=250) as stub:
+            with HeadHunterAPI(max_workers=2, api_url=stub.url) as api:
+                self.assertEqual(api.get_area_id("Казань"), 88)
+                result = api.search("python", 113, all_pages=True)
+        self.assertEqual(len(result["items"]), 250)
+        self.assertTrue(result["complete"])
+        self.assertEqual(len({item["alternate_url"] for item in result["items"]}), 250)
+        self.assertEqual(stub.requests, 4)
+
+    def test_main_writes_json_report(self):
+        """Тест записи отчета бенчмарков в JSON"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.json")
+            main(["--skip-api", "--sizes", "50", "--repeat", "2", "--output", path], output=lambda line: None)
+            with open(path, encoding="utf-8") as file:
+                report = json.load(file)
+        names = {row["name"] for row in report["results"]}
+        self.assertIn("add_vacancies", names)
+        self.assertIn("search_vacancies", names)
+        self.assertIn("top_by_salary", names)
+        self.assertIn("python", report["environment"])
+
+    def test_queries_match_synthetic_data(self):
+        """Тест запросов бенчмарка, находящих вакансии в синтетических данных"""
+        with tempfile.TemporaryDirectory() as tmp:
+            with JSONVacancyStorage(os.path.join(tmp, "vacancies.json")) as storage:
+                storage.add_vacancies(synthetic_vacancies(200))
+                for query in QUERIES:
+                    self.assertTrue(storage.get_vacancies(query), query)
+                for query in SEARCH_QUERIES:
+                    self.assertTrue(storage.search_vacancies(query), query)
+
+
+if __name__ == "__main__":
+    unittest.main()
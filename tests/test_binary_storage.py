@@ -0,0 +1,148 @@
+import json
+import os
+import tempfile
+import struct
+import unittest
+from unittest.mock import patch
+
+from src.binary_storage import (
+    BinaryVacancyStorage,
+    convert_json_archive,
+    decode_records,
+    decode_vacancies,
+    encode_vacancies,
+    main,
+)
+from src.vacancy import Vacancy
+
+
+class TestBinaryVacancyStorage(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "vacancies.jvb")
+        self.vacancies = [
+            Vacancy("Python Developer", "Москва", "https://hh.ru/vacancy/1", 100000, 150000, "Разработка на Python"),
+            Vacancy("Java Developer", "Москва", "https://hh.ru/vacancy/2", None, 250000, "Разработка на Java"),
+            Vacancy("Python Developer", "Казань", "https://hh.ru/vacancy/3", 0, None, ""),
+            Vacancy("Аналитик", "Казань", "https://hh.ru/vacancy/4", None, None, "Многострочное\nописание"),
+        ]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_encode_decode(self):
+        """Тест кодирования без потерь для всех методов сжатия"""
+        for compression in (None, "gzip"):
+            data = encode_vacancies(self.vacancies, compression)
+            decoded = decode_vacancies(data)
+            self.assertEqual([v.to_dict() for v in decoded], [v.to_dict() for v in self.vacancies])
+        self.assertEqual(decode_vacancies(encode_vacancies([])), [])
+
+    def test_invalid_archive(self):
+        """Тест отказа от чтения чужого файла"""
+        with self.assertRaises(ValueError):
+            decode_vacancies(b"[{}]    ")
+        with self.assertRaises(ValueError):
+            encode_vacancies(self.vacancies, "rar")
+
+    def test_nul_character_rejected(self):
+        """Тест отказа от записи строки с нулевым символом без изменения архива"""
+        storage = BinaryVacancyStorage(self.path)
+        storage.add_vacancies(self.vacancies[:1])
+        broken = Vacancy("Тестировщик", "Москва", "https://hh.ru/vacancy/5", None, None, "Текст\x00с нулем")
+
+        with self.assertRaises(ValueError):
+            storage.add_vacancy(broken)
+        with self.assertRaises(ValueError):
+            encode_vacancies([Vacancy("Имя\x00", "Москва", "https://hh.ru/vacancy/6", None, None, "")])
+        self.assertEqual(len(list(storage.iter_vacancies())), 1)
+        self.assertEqual(os.listdir(self.temp_dir.name), ["vacancies.jvb"])
+
+    def test_storage_operations(self):
+        """Тест операций хранилища"""
+        storage = BinaryVacancyStorage(self.path)
+        self.assertEqual(storage.add_vacancies(self.vacancies + self.vacancies[:1]), (4, 1))
+        storage.add_vacancy(self.vacancies[0])
+
+        self.assertEqual(len(storage.get_vacancies("")), 4)
+        self.assertEqual([v.url for v in storage.get_vacancies("python")], ["https://hh.ru/vacancy/1"])
+        self.assertEqual([v.name for v in storage.top_by_salary(2)], ["Java Developer", "Python Developer"])
+        self.assertEqual(storage.top_by_salary(1, area="Казань")[0].url, "https://hh.ru/vacancy/3")
+
+        storage.remove_vacancy("https://hh.ru/vacancy/2")
+        self.assertEqual(len(list(BinaryVacancyStorage(self.path).iter_vacancies())), 3)
+
+    def test_remove_vacancies_and_prune(self):
+        """Тест пакетного удаления и удаления устаревших вакансий"""
+        storage = BinaryVacancyStorage(self.path)
+        with patch("time.time", return_value=1000.0):
+            storage.add_vacancies(self.vacancies[:2])
+        with patch("time.time", return_value=5000.0):
+            storage.add_vacancies(self.vacancies[2:])
+
+        self.assertEqual(storage.remove_vacancies(["https://hh.ru/vacancy/3", "https://hh.ru/vacancy/999"]), 1)
+        with patch("time.time", return_value=6000.0):
+            self.assertEqual(storage.prune(older_than=3000), 2)
+        with open(self.path, "rb") as file:
+            vacancies, fetched_at = decode_records(file.read())
+        self.assertEqual([v.url for v in vacancies], ["https://hh.ru/vacancy/4"])
+        self.assertEqual(fetched_at, [5000.0])
+
+    def test_readded_vacancy_not_pruned(self):
+        """Тест обновления времени загрузки у повторно найденной вакансии"""
+        storage = BinaryVacancyStorage(self.path)
+        with patch("time.time", return_value=1000.0):
+            storage.add_vacancies(self.vacancies[:2])
+        with patch("time.time", return_value=5000.0):
+            self.assertEqual(storage.add_vacancies(self.vacancies[1:3]), (1, 1))
+
+        with patch("time.time", return_value=6000.0):
+            self.assertEqual(storage.prune(older_than=3000), 1)
+        self.assertEqual(
+            [v.url for v in storage.iter_vacancies()], ["https://hh.ru/vacancy/2", "https://hh.ru/vacancy/3"]
+        )
+
+    def test_decode_version_1(self):
+        """Тест чтения архива первой версии без времени загрузки"""
+        data = encode_vacancies(self.vacancies, None, [1.0] * len(self.vacancies))
+        header = struct.pack("<4sBB2x", b"JHVB", 1, 0)
+        payload = bytearray(data[8:])
+        # В версии 1 нет колонки времени загрузки: вырезаем ее перед флагами
+        count = len(self.vacancies)
+        start = 8 + 12 + count * (4 + 4 + 8 + 8)
+        del payload[start:start + count * 8]
+        vacancies, fetched_at = decode_records(header + bytes(payload))
+        self.assertEqual([v.to_dict() for v in vacancies], [v.to_dict() for v in self.vacancies])
+        self.assertEqual(fetched_at, [0.0] * count)
+
+    def test_convert_json_archive(self):
+        """Тест конвертации vacancies.json в бинарный архив"""
+        json_path = os.path.join(self.temp_dir.name, "vacancies.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump([v.to_dict() for v in self.vacancies], f, ensure_ascii=False, indent=2)
+
+        count, source_size, target_size = convert_json_archive(json_path, self.path)
+        self.assertEqual(count, 4)
+        self.assertLess(target_size, source_size)
+        self.assertEqual(BinaryVacancyStorage(self.path).get_vacancies(""), self.vacancies)
+
+        printed = []
+        main([json_path, self.path + "2", "--compression", "none"], output=printed.append)
+        self.assertIn("Вакансий: 4", printed[0])
+
+    def test_convert_relative_filenames(self):
+        """Тест конвертера с именами файлов без каталога"""
+        with open(os.path.join(self.temp_dir.name, "in.json"), "w", encoding="utf-8") as f:
+            json.dump([v.to_dict() for v in self.vacancies], f, ensure_ascii=False)
+        cwd = os.getcwd()
+        os.chdir(self.temp_dir.name)
+        self.addCleanup(os.chdir, cwd)
+
+        printed = []
+        main(["in.json", "out.jvb"], output=printed.append)
+        self.assertIn("Вакансий: 4", printed[0])
+        self.assertEqual(BinaryVacancyStorage("out.jvb").get_vacancies(""), self.vacancies)
+
+
+if __name__ == "__main__":
+    unittest.main()
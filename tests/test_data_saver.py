@@ -1,13 +1,70 @@
 import unittest
+import io
 import os
 import json
+import multiprocessing
 import tempfile
+from unittest.mock import patch
 
 from src.vacancy import Vacancy
-from src.data_saver import JSONVacancyStorage
+from src.keyword_index import KeywordIndex
+from src.data_saver import (
+    JSONVacancyStorage,
+    JSONLinesVacancyStorage,
+    StorageCorruptedError,
+    _iter_json_array,
+)
 
 
-class TestJSONVacancyStorage(unittest.TestCase):
+class TestIterJSONArray(unittest.TestCase):
+    def test_chunk_boundaries(self):
+        """Тест потокового разбора массива при любой границе фрагментов"""
+        data = [{"name": "Вакансия, [1]", "salary": 100000}, {"name": "}{"}, [1, 2], None]
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+        for chunk_size in (1, 3, 7, 1024):
+            items = list(_iter_json_array(io.StringIO(text), chunk_size=chunk_size))
+            self.assertEqual(items, data)
+
+    def test_numbers_split_across_chunks(self):
+        """Тест чисел и литералов, разрезанных границей фрагментов"""
+        for text in ("[12345, 678]", "[12345,678]", "[1.5e10, -0.25, true, null]"):
+            for chunk_size in (1, 2, 3, 5):
+                items = list(_iter_json_array(io.StringIO(text), chunk_size=chunk_size, strict=True))
+                self.assertEqual(items, json.loads(text))
+
+    def test_large_item_read_in_growing_chunks(self):
+        """Тест чтения большого элемента с удвоением размера чтения"""
+        text = json.dumps([{"description": "x" * 100000}, 1])
+        file = io.StringIO(text)
+        with patch.object(file, "read", wraps=file.read) as read:
+            items = list(_iter_json_array(file, chunk_size=16))
+        self.assertEqual(items, json.loads(text))
+        self.assertLess(read.call_count, 30)
+
+    def test_empty_and_corrupted(self):
+        """Тест пустого и поврежденного файла"""
+        self.assertEqual(list(_iter_json_array(io.StringIO(""))), [])
+        self.assertEqual(list(_iter_json_array(io.StringIO("[]"))), [])
+        self.assertEqual(list(_iter_json_array(io.StringIO('[{"a": 1}, {"b": '))), [{"a": 1}])
+
+        with self.assertRaises(ValueError):
+            list(_iter_json_array(io.StringIO('[{"a": 1}, {"b": '), strict=True))
+        with self.assertRaises(ValueError):
+            list(_iter_json_array(io.StringIO('{"a": 1}'), strict=True))
+
+
+def _add_vacancies_worker(filename, worker, count):
+    """Добавление вакансий из отдельного процесса"""
+    storage = JSONVacancyStorage(filename)
+    for i in range(count):
+        storage.add_vacancy(
+            Vacancy(f"Worker {worker}", "Москва", f"https://hh.ru/vacancy/{worker}-{i}", None, None, "")
+        )
+
+
+class JSONStorageTestCase(unittest.TestCase):
+    """Общая подготовка тестов JSON-хранилища"""
+
     def setUp(self):
         # Создаем временный файл
         self.temp_file = tempfile.NamedTemporaryFile(delete=False)
@@ -25,9 +82,21 @@ class TestJSONVacancyStorage(unittest.TestCase):
         )
 
     def tearDown(self):
-        # Удаляем временный файл после тестов
+        # Удаляем временный файл и служебные файлы хранилища после тестов
         os.unlink(self.temp_file.name)
+        for suffix in (".idx", ".lock", ".bak"):
+            if os.path.exists(self.temp_file.name + suffix):
+                os.unlink(self.temp_file.name + suffix)
+
+    def make_vacancies(self, count):
+        """Вакансии с возрастающей зарплатой"""
+        return [
+            Vacancy(f"Developer {i}", "Москва", f"https://hh.ru/vacancy/{i}", 100000 + i, None, f"Python {i}")
+            for i in range(count)
+        ]
 
+
+class TestJSONVacancyStorage(JSONStorageTestCase):
     def test_add_vacancy(self):
         """Тест добавления вакансии"""
         # Первое добавление
@@ -44,6 +113,26 @@ class TestJSONVacancyStorage(unittest.TestCase):
             data = json.load(f)
             self.assertEqual(len(data), 1)  # Дубликат не добавлен
 
+    def test_add_vacancies(self):
+        """Тест пакетного добавления вакансий"""
+        self.storage.add_vacancy(self.vacancy)
+        other_vacancy = Vacancy(
+            name="Java Developer",
+            area="Москва",
+            url="https://hh.ru/vacancy/124",
+            salary_from=120000,
+            salary_to=180000,
+            description="Разработка на Java",
+        )
+
+        result = self.storage.add_vacancies([self.vacancy, other_vacancy, other_vacancy])
+        self.assertEqual(result.inserted, 1)
+        self.assertEqual(result.skipped, 2)
+
+        with open(self.temp_file.name, "r", encoding="utf-8") as f:
+            data = json.load(f)
+            self.assertEqual([v["url"] for v in data], [self.vacancy.url, other_vacancy.url])
+
     def test_get_vacancies(self):
         """Тест получения вакансий по критерию"""
         # Добавляем тестовые данные
@@ -69,6 +158,187 @@ class TestJSONVacancyStorage(unittest.TestCase):
         all_vacancies = self.storage.get_vacancies("")
         self.assertEqual(len(all_vacancies), 2)
 
+    def test_get_vacancies_keyword_index(self):
+        """Тест поиска подстроки в описании с сужением перебора по индексу"""
+        go_vacancy = Vacancy(
+            name="Go Developer",
+            area="Москва",
+            url="https://hh.ru/vacancy/125",
+            salary_from=None,
+            salary_to=200000,
+            description="Разработчики <highlighttext>Go</highlighttext>, знание Ёлки и Docker",
+        )
+        cpp_vacancy = Vacancy("C++ Developer", "Москва", "https://hh.ru/vacancy/126", None, None, "C++, Google Test")
+        self.storage.add_vacancies([self.vacancy, go_vacancy, cpp_vacancy])
+
+        def urls(query):
+            return [v.url for v in self.storage.get_vacancies(query)]
+
+        self.assertEqual(urls("python"), [self.vacancy.url])
+        self.assertEqual(urls("разработчик"), [go_vacancy.url])
+        self.assertEqual(urls("go"), [go_vacancy.url, cpp_vacancy.url])
+        self.assertEqual(urls("GO</"), [go_vacancy.url])
+        self.assertEqual(urls("ython"), [self.vacancy.url])
+        self.assertEqual(urls("C++"), [cpp_vacancy.url])
+        self.assertEqual(urls("c#"), [])
+        self.assertEqual(urls(", "), [go_vacancy.url, cpp_vacancy.url])
+        self.assertEqual(urls("ёлки"), [go_vacancy.url])
+        self.assertEqual(urls("елки"), [])
+        self.assertEqual(urls("python docker"), [])
+
+        self.storage.remove_vacancy(go_vacancy.url)
+        self.assertEqual(urls("docker"), [])
+
+    def test_search_vacancies(self):
+        """Тест поиска по словам описания с операциями AND/OR"""
+        self.storage.add_vacancies(
+            [
+                self.vacancy,
+                Vacancy("Go", "Москва", "https://hh.ru/vacancy/124", None, None, "Разработки на Go и Python"),
+                Vacancy("Java", "Москва", "https://hh.ru/vacancy/125", None, None, "Java, Spring"),
+            ]
+        )
+
+        def urls(query):
+            return [v.url.rsplit("/", 1)[1] for v in self.storage.search_vacancies(query)]
+
+        self.assertEqual(urls("разработку python"), ["123", "124"])
+        self.assertEqual(urls("python go"), ["124"])
+        self.assertEqual(urls("go | spring"), ["124", "125"])
+        self.assertEqual(urls("kotlin"), [])
+        self.assertEqual(urls(""), [])
+
+    def test_invalid_records_skipped(self):
+        """Тест пропуска записей, измененных вручную и не прошедших валидацию"""
+        broken = dict(self.vacancy.to_dict(), url="https://hh.ru/vacancy/400", salary_from="много")
+        with open(self.temp_file.name, "w", encoding="utf-8") as f:
+            json.dump([broken, dict(broken, url="", salary_from=None), self.vacancy.to_dict()], f)
+
+        self.assertEqual([v.url for v in self.storage.get_vacancies("python")], [self.vacancy.url])
+        self.assertEqual([v.url for v in self.storage.iter_vacancies()], [self.vacancy.url])
+        self.assertEqual([v.url for v in self.storage.top_by_salary(5)], [self.vacancy.url])
+
+    def test_keyword_index_saved_on_close(self):
+        """Тест сохранения индекса при close вместо перезаписи на каждой записи"""
+        with open(self.temp_file.name, "w", encoding="utf-8") as f:
+            json.dump([{"name": "Без URL", "description": "Python"}, self.vacancy.to_dict()], f)
+
+        self.assertEqual(len(self.storage.get_vacancies("python")), 1)
+        index_file = self.temp_file.name + ".idx"
+        stamp = os.stat(index_file).st_mtime_ns
+
+        other = Vacancy("Python Lead", "Москва", "https://hh.ru/vacancy/300", None, None, "Python и Go")
+        self.storage.add_vacancy(other)
+        self.assertEqual(os.stat(index_file).st_mtime_ns, stamp)
+        self.assertEqual([v.url for v in self.storage.get_vacancies("go")], [other.url])
+
+        # Другой экземпляр видит устаревший индекс и перестраивает его
+        self.assertEqual(len(JSONVacancyStorage(self.temp_file.name).get_vacancies("python")), 2)
+
+        self.storage.add_vacancy(Vacancy("Rust", "Москва", "https://hh.ru/vacancy/301", None, None, "Rust"))
+        self.storage.close()
+        with patch.object(KeywordIndex, "add", side_effect=AssertionError("индекс не должен перестраиваться")):
+            with JSONVacancyStorage(self.temp_file.name) as storage:
+                self.assertEqual([v.url for v in storage.get_vacancies("rust")], ["https://hh.ru/vacancy/301"])
+
+    def test_keyword_index_rebuilt_after_external_change(self):
+        """Тест перестроения индекса после изменения файла в обход хранилища"""
+        self.storage.add_vacancy(self.vacancy)
+        self.assertEqual(len(self.storage.get_vacancies("python")), 1)
+
+        data = [dict(self.vacancy.to_dict(), url="https://hh.ru/vacancy/200", description="Rust")]
+        with open(self.temp_file.name, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+        storage = JSONVacancyStorage(self.temp_file.name)
+        self.assertEqual(storage.get_vacancies("python"), [])
+        self.assertEqual(len(storage.get_vacancies("rust")), 1)
+
+    def test_iter_vacancies(self):
+        """Тест ленивого перебора вакансий с условием и ранней остановкой"""
+        self.storage.add_vacancies(
+            Vacancy(f"Developer {i}", "Москва", f"https://hh.ru/vacancy/{i}", i * 1000, None, "")
+            for i in range(10)
+        )
+
+        rich = self.storage.iter_vacancies(lambda v: v.salary_from >= 5000)
+        self.assertEqual(next(rich).name, "Developer 5")
+        rich.close()
+        self.assertEqual(len(list(self.storage.iter_vacancies())), 10)
+
+    def test_top_by_salary(self):
+        """Тест топа N вакансий по зарплате"""
+        vacancies = [
+            Vacancy("A", "Москва", "https://hh.ru/vacancy/1", 100000, None, ""),
+            Vacancy("B", "Казань", "https://hh.ru/vacancy/2", None, 300000, ""),
+            Vacancy("C", "Москва", "https://hh.ru/vacancy/3", 200000, 250000, ""),
+            Vacancy("D", "Москва", "https://hh.ru/vacancy/4", None, None, ""),
+        ]
+        self.storage.add_vacancies(vacancies)
+
+        self.assertEqual([v.name for v in self.storage.top_by_salary(2)], ["B", "C"])
+        self.assertEqual([v.name for v in self.storage.top_by_salary(10, area="Москва")], ["C", "A", "D"])
+        self.assertEqual(self.storage.top_by_salary(0), [])
+
+    def test_recovery_from_backup(self):
+        """Тест восстановления из резервной копии после обрыва записи"""
+        self.storage.add_vacancy(self.vacancy)
+        self.storage.add_vacancy(Vacancy("Java", "Москва", "https://hh.ru/vacancy/124", None, None, ""))
+        with open(self.temp_file.name, "w", encoding="utf-8") as f:
+            f.write('[{"name": "Обрыв')
+
+        # Чтение берет данные из резервной копии, не изменяя файл
+        with self.assertLogs("src.data_saver", "WARNING"):
+            self.assertEqual([v.url for v in self.storage.get_vacancies("")], [self.vacancy.url])
+        self.assertEqual([v.url for v in self.storage.top_by_salary(5)], [self.vacancy.url])
+        with open(self.temp_file.name, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), '[{"name": "Обрыв')
+
+        self.assertEqual(self.storage.recover(), 1)
+        self.assertEqual([v.url for v in self.storage.get_vacancies("")], [self.vacancy.url])
+
+    def test_write_over_corrupted_file_keeps_backup(self):
+        """Тест записи поверх поврежденного файла без замены резервной копии"""
+        self.storage.add_vacancy(self.vacancy)
+        self.storage.add_vacancy(Vacancy("Java", "Москва", "https://hh.ru/vacancy/124", None, None, ""))
+        with open(self.temp_file.name + ".bak", "r", encoding="utf-8") as f:
+            backup = f.read()
+        with open(self.temp_file.name, "w", encoding="utf-8") as f:
+            f.write('[{"name": "Обрыв')
+
+        self.storage.add_vacancy(Vacancy("Go", "Москва", "https://hh.ru/vacancy/125", None, None, ""))
+        with open(self.temp_file.name + ".bak", "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), backup)
+        self.assertEqual(
+            [v.url for v in self.storage.get_vacancies("")], [self.vacancy.url, "https://hh.ru/vacancy/125"]
+        )
+
+    def test_corrupted_without_backup(self):
+        """Тест отказа от перезаписи поврежденного файла без резервной копии"""
+        with open(self.temp_file.name, "w", encoding="utf-8") as f:
+            f.write('[{"name": "Обрыв')
+
+        with self.assertRaises(StorageCorruptedError):
+            self.storage.add_vacancy(self.vacancy)
+        with self.assertRaises(StorageCorruptedError):
+            self.storage.get_vacancies("")
+        with open(self.temp_file.name, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), '[{"name": "Обрыв')
+
+    def test_concurrent_processes(self):
+        """Тест параллельной записи из нескольких процессов без потери обновлений"""
+        context = multiprocessing.get_context("fork" if hasattr(os, "fork") else "spawn")
+        workers = [
+            context.Process(target=_add_vacancies_worker, args=(self.temp_file.name, worker, 10))
+            for worker in range(4)
+        ]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join()
+
+        self.assertEqual(len(self.storage.get_vacancies("")), 40)
+
     def test_remove_vacancy(self):
         """Тест удаления вакансии"""
         # Добавляем тестовые данные
@@ -87,6 +357,290 @@ class TestJSONVacancyStorage(unittest.TestCase):
             data = json.load(f)
             self.assertEqual(len(data), 0)  # Файл остался пустым
 
+    def test_remove_vacancies(self):
+        """Тест пакетного удаления одной перезаписью файла"""
+        self.storage.add_vacancies(self.make_vacancies(5))
+        removed = self.storage.remove_vacancies(
+            ["https://hh.ru/vacancy/1", "https://hh.ru/vacancy/3", "https://hh.ru/vacancy/999"]
+        )
+        self.assertEqual(removed, 2)
+        self.assertEqual(
+            [v.url for v in self.storage.get_vacancies("python")],
+            ["https://hh.ru/vacancy/0", "https://hh.ru/vacancy/2", "https://hh.ru/vacancy/4"],
+        )
+        self.assertEqual(self.storage.remove_vacancies([]), 0)
+
+    def test_prune_by_fetched_at(self):
+        """Тест удаления вакансий по времени загрузки"""
+        vacancies = self.make_vacancies(3)
+        with patch("time.time", return_value=1000.0):
+            self.storage.add_vacancies(vacancies[:2])
+        with patch("time.time", return_value=5000.0):
+            self.storage.add_vacancy(vacancies[2])
+
+        with open(self.temp_file.name, "r", encoding="utf-8") as f:
+            self.assertEqual([item["fetched_at"] for item in json.load(f)], [1000.0, 1000.0, 5000.0])
+
+        with patch("time.time", return_value=6000.0):
+            self.assertEqual(self.storage.prune(older_than=3000), 2)
+            self.assertEqual(self.storage.prune(older_than=3000), 0)
+        self.assertEqual([v.url for v in self.storage.iter_vacancies()], [vacancies[2].url])
+        self.assertEqual(self.storage.get_vacancies("python 0"), [])
+
+    def test_readded_vacancy_not_pruned(self):
+        """Тест обновления времени загрузки у повторно найденной вакансии"""
+        vacancies = self.make_vacancies(2)
+        with patch("time.time", return_value=1000.0):
+            self.storage.add_vacancies(vacancies)
+        with patch("time.time", return_value=5000.0):
+            self.assertEqual(self.storage.add_vacancies(vacancies[:1]), (0, 1))
+
+        with patch("time.time", return_value=6000.0):
+            self.assertEqual(self.storage.prune(older_than=3000), 1)
+        self.assertEqual([v.url for v in self.storage.iter_vacancies()], [vacancies[0].url])
+
+    def test_prune_keeps_records_without_timestamp(self):
+        """Тест сохранения записей, сохраненных до появления времени загрузки"""
+        with open(self.temp_file.name, "w", encoding="utf-8") as f:
+            json.dump([self.vacancy.to_dict()], f)
+        self.assertEqual(self.storage.prune(older_than=0), 0)
+        self.assertEqual(len(list(self.storage.iter_vacancies())), 1)
+
+    def test_snapshot_invalidated_by_external_write(self):
+        """Тест перечитывания снимка после изменения файла другим процессом"""
+        self.storage.add_vacancies(self.make_vacancies(3))
+        self.assertEqual([v.url for v in self.storage.top_by_salary(1)], ["https://hh.ru/vacancy/2"])
+        other = JSONVacancyStorage(self.temp_file.name)
+        other.remove_vacancy("https://hh.ru/vacancy/2")
+        self.assertEqual([v.url for v in self.storage.top_by_salary(1)], ["https://hh.ru/vacancy/1"])
+        self.storage.add_vacancy(self.make_vacancies(3)[2])
+        self.assertEqual(len(other.get_vacancies("python")), 3)
+
+
+class TestJSONVacancyStorageStreaming(TestJSONVacancyStorage):
+    """Те же проверки для хранилища без снимка в памяти"""
+
+    def setUp(self):
+        super().setUp()
+        self.storage = JSONVacancyStorage(self.temp_file.name, snapshot=False)
+
+    def test_corrupted_tail_read_from_backup(self):
+        """Тест дочитывания записей из резервной копии после поврежденного фрагмента"""
+        self.storage.add_vacancies(self.make_vacancies(2))
+        self.storage.add_vacancies(self.make_vacancies(3))
+        with open(self.temp_file.name, "r", encoding="utf-8") as f:
+            content = f.read()
+        with open(self.temp_file.name, "w", encoding="utf-8") as f:
+            f.write(content[:content.index("https://hh.ru/vacancy/1")])
+
+        with self.assertLogs("src.data_saver", "WARNING"):
+            urls = [v.url for v in self.storage.iter_vacancies()]
+        self.assertEqual(urls, ["https://hh.ru/vacancy/0", "https://hh.ru/vacancy/1"])
+
+
+class TestJSONVacancyStorageSnapshot(JSONStorageTestCase):
+    """Проверки снимка в памяти"""
+
+    def test_snapshot_serves_repeated_queries(self):
+        """Тест запросов из снимка в памяти без чтения файла"""
+        self.storage.add_vacancies(self.make_vacancies(3))
+        with patch("builtins.open", side_effect=AssertionError("файл не должен читаться")):
+            self.assertEqual(len(self.storage.get_vacancies("")), 3)
+            self.assertEqual([v.url for v in self.storage.top_by_salary(1)], ["https://hh.ru/vacancy/2"])
+
+
+class TestJSONLinesVacancyStorage(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "vacancies.jsonl")
+        self.storage = JSONLinesVacancyStorage(self.path, compact_threshold=4)
+
+    def tearDown(self):
+        self.storage.close()
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def make_vacancy(i, description="Разработка на Python"):
+        return Vacancy(
+            name=f"Developer {i}",
+            area="Москва",
+            url=f"https://hh.ru/vacancy/{i}",
+            salary_from=100000 + i,
+            salary_to=None,
+            description=description,
+        )
+
+    def read_lines(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_add_vacancy_appends(self):
+        """Тест дозаписи вакансий и проверки дубликатов по индексу"""
+        self.storage.add_vacancy(self.make_vacancy(1))
+        self.storage.add_vacancy(self.make_vacancy(2))
+        self.storage.add_vacancy(self.make_vacancy(1))
+
+        lines = self.read_lines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(set(lines[2]), {"url", "fetched_at", JSONLinesVacancyStorage.TOUCHED_KEY})
+        self.assertEqual(len(self.storage), 2)
+        self.assertIn("https://hh.ru/vacancy/1", self.storage)
+
+    def test_add_vacancies(self):
+        """Тест пакетного добавления одной дозаписью"""
+        self.storage.add_vacancy(self.make_vacancy(1))
+        batch = [self.make_vacancy(i) for i in (1, 2, 3, 2)]
+
+        result = self.storage.add_vacancies(batch)
+        self.assertEqual(result, (2, 2))
+        self.assertEqual(
+            [line["url"] for line in self.read_lines() if JSONLinesVacancyStorage.TOUCHED_KEY not in line],
+            [f"https://hh.ru/vacancy/{i}" for i in (1, 2, 3)],
+        )
+        self.assertEqual(len(self.storage.get_vacancies("")), 3)
+
+    def test_get_vacancies(self):
+        """Тест получения вакансий по критерию"""
+        self.storage.add_vacancy(self.make_vacancy(1))
+        self.storage.add_vacancy(self.make_vacancy(2, "Разработка на Java"))
+
+        self.assertEqual([v.name for v in self.storage.get_vacancies("python")], ["Developer 1"])
+        self.assertEqual(len(self.storage.get_vacancies("")), 2)
+
+    def test_invalid_records_skipped(self):
+        """Тест пропуска строк журнала, не прошедших валидацию"""
+        self.storage.add_vacancy(self.make_vacancy(1))
+        self.storage.close()
+        broken = dict(self.make_vacancy(2).to_dict(), salary_to=-1.5)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(broken) + "\n")
+
+        storage = JSONLinesVacancyStorage(self.path)
+        self.assertEqual(len(storage), 2)
+        self.assertEqual([v.name for v in storage.get_vacancies("python")], ["Developer 1"])
+        self.assertEqual([v.name for v in storage.top_by_salary(5)], ["Developer 1"])
+        storage.close()
+
+    def test_top_by_salary(self):
+        """Тест топа N вакансий по зарплате из журнала"""
+        self.storage.add_vacancies([self.make_vacancy(i) for i in range(5)])
+        self.storage.remove_vacancy("https://hh.ru/vacancy/4")
+
+        self.assertEqual([v.name for v in self.storage.top_by_salary(2)], ["Developer 3", "Developer 2"])
+
+    def test_iter_vacancies(self):
+        """Тест ленивого перебора журнала"""
+        self.storage.add_vacancies([self.make_vacancy(i) for i in range(3)])
+        self.storage.remove_vacancy("https://hh.ru/vacancy/1")
+
+        names = [v.name for v in self.storage.iter_vacancies(lambda v: v.salary_from > 100000)]
+        self.assertEqual(names, ["Developer 2"])
+
+    def test_remove_and_reopen(self):
+        """Тест удаления через отметку и восстановления индекса при открытии"""
+        self.storage.add_vacancy(self.make_vacancy(1))
+        self.storage.add_vacancy(self.make_vacancy(2))
+        self.storage.remove_vacancy("https://hh.ru/vacancy/1")
+        self.storage.remove_vacancy("https://hh.ru/vacancy/999")
+        self.storage.close()
+
+        reopened = JSONLinesVacancyStorage(self.path)
+        self.assertEqual([v.url for v in reopened.get_vacancies("")], ["https://hh.ru/vacancy/2"])
+        reopened.close()
+
+    def test_remove_vacancies_and_prune(self):
+        """Тест пакетного удаления и удаления устаревших вакансий по индексу"""
+        with patch("time.time", return_value=1000.0):
+            self.storage.add_vacancies([self.make_vacancy(i) for i in range(3)])
+        with patch("time.time", return_value=5000.0):
+            self.storage.add_vacancy(self.make_vacancy(3))
+            self.storage.add_vacancy(self.make_vacancy(4))
+
+        self.assertEqual(self.storage.remove_vacancies(["https://hh.ru/vacancy/0", "https://hh.ru/vacancy/0"]), 1)
+        self.assertEqual(len(self.storage), 4)
+        self.storage.close()
+
+        # Время загрузки восстанавливается из журнала при открытии
+        reopened = JSONLinesVacancyStorage(self.path, compact_threshold=100)
+        with patch("time.time", return_value=6000.0):
+            self.assertEqual(reopened.prune(older_than=3000), 2)
+        self.assertEqual(
+            sorted(v.url for v in reopened.iter_vacancies()),
+            ["https://hh.ru/vacancy/3", "https://hh.ru/vacancy/4"],
+        )
+        self.assertEqual(sum(1 for line in self.read_lines() if line.get("_deleted")), 3)
+        reopened.close()
+
+    def test_readded_vacancy_not_pruned(self):
+        """Тест отметки повторно найденной вакансии, переживающей открытие и уплотнение"""
+        with patch("time.time", return_value=1000.0):
+            self.storage.add_vacancies([self.make_vacancy(i) for i in range(2)])
+        with patch("time.time", return_value=5000.0):
+            self.storage.add_vacancy(self.make_vacancy(0))
+        self.storage.close()
+
+        reopened = JSONLinesVacancyStorage(self.path, compact_threshold=100)
+        reopened.compact()
+        self.assertEqual(len(self.read_lines()), 2)
+        with patch("time.time", return_value=6000.0):
+            self.assertEqual(reopened.prune(older_than=3000), 1)
+        self.assertEqual([v.url for v in reopened.iter_vacancies()], ["https://hh.ru/vacancy/0"])
+        reopened.close()
+
+    def test_compaction(self):
+        """Тест уплотнения журнала после удалений"""
+        for i in range(3):
+            self.storage.add_vacancy(self.make_vacancy(i))
+        self.storage.remove_vacancy("https://hh.ru/vacancy/0")
+        self.storage.remove_vacancy("https://hh.ru/vacancy/1")
+
+        lines = self.read_lines()
+        self.assertEqual([line["url"] for line in lines], ["https://hh.ru/vacancy/2"])
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+        self.storage.add_vacancy(self.make_vacancy(3))
+        self.assertEqual(len(self.storage.get_vacancies("")), 2)
+
+    def test_truncated_tail_recovery(self):
+        """Тест восстановления после недописанной строки"""
+        self.storage.add_vacancy(self.make_vacancy(1))
+        self.storage.close()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"name": "Developer 2", "url": "https://hh')
+
+        storage = JSONLinesVacancyStorage(self.path)
+        storage.add_vacancy(self.make_vacancy(3))
+        storage.close()
+        self.assertEqual(
+            [line["url"] for line in self.read_lines()],
+            ["https://hh.ru/vacancy/1", "https://hh.ru/vacancy/3"],
+        )
+
+    def test_corrupted_middle_lines_skipped(self):
+        """Тест пропуска поврежденных строк в середине журнала без потери следующих записей"""
+        self.storage.add_vacancies([self.make_vacancy(i) for i in range(5)])
+        self.storage.close()
+        with open(self.path, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+        lines[1] = '{"name": "Обрыв\n'
+        lines[2] = "[1, 2]\n"
+        lines.insert(3, '{"name": "Без ссылки"}\n')
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+
+        with self.assertLogs("src.data_saver", level="WARNING"):
+            storage = JSONLinesVacancyStorage(self.path, compact_threshold=100)
+        self.assertEqual(
+            sorted(v.url for v in storage.iter_vacancies()),
+            ["https://hh.ru/vacancy/0", "https://hh.ru/vacancy/3", "https://hh.ru/vacancy/4"],
+        )
+        with open(self.path, "r", encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 6)
+
+        storage.compact()
+        storage.close()
+        self.assertEqual(len(self.read_lines()), 3)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,111 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from src.binary_storage import BinaryVacancyStorage
+from src.data_saver import JSONLinesVacancyStorage, JSONVacancyStorage
+from src.harvester import HarvestJob, harvest, open_storage, parse_jobs
+from src.sqlite_storage import SQLiteVacancyStorage
+
+
+def make_item(i, salary=None):
+    return {
+        "name": f"Developer {i}",
+        "area": {"name": "Москва"},
+        "alternate_url": f"https://hh.ru/vacancy/{i}",
+        "salary": salary,
+        "snippet": {"requirement": None},
+    }
+
+
+class FakeAPI:
+    """Заглушка API с фиксированными ответами"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_area_id(self, region):
+        return {"москва": 1}.get(region.lower())
+
+    def search(self, query, area_id, all_pages=False):
+        self.calls.append((query, area_id, all_pages))
+        if query == "rust":
+            raise ConnectionError("Статус: 503")
+        items = [make_item(area_id * 10 + i, {"from": 1000, "to": None}) for i in range(3)]
+        return {"items": items, "found": len(items), "complete": True}
+
+
+class TestHarvester(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_parse_jobs(self):
+        """Тест разбора файла заданий"""
+        lines = ["# комментарий", "", "python; Москва, 2", "java"]
+        self.assertEqual(
+            parse_jobs(lines),
+            [HarvestJob("python", "Москва"), HarvestJob("python", "2"), HarvestJob("java", "113")],
+        )
+
+    def test_open_storage(self):
+        """Тест выбора хранилища по расширению"""
+        for name, cls in (
+            ("v.json", JSONVacancyStorage),
+            ("v.jsonl", JSONLinesVacancyStorage),
+            ("v.db", SQLiteVacancyStorage),
+            ("v.jvb", BinaryVacancyStorage),
+        ):
+            storage = open_storage(os.path.join(self.temp_dir.name, name))
+            self.assertIsInstance(storage, cls)
+            if hasattr(storage, "close"):
+                storage.close()
+
+        path = os.path.join(self.temp_dir.name, "snapshot.bin")
+        self.assertIsInstance(open_storage(path, "binary"), BinaryVacancyStorage)
+        with self.assertRaises(ValueError):
+            open_storage(path, "xml")
+
+    def test_harvest(self):
+        """Тест пакетного сбора с сохранением и отчетами по заданиям"""
+        api = FakeAPI()
+        storage = JSONLinesVacancyStorage(os.path.join(self.temp_dir.name, "v.jsonl"))
+        jobs = [
+            HarvestJob("python", "Москва"),
+            HarvestJob("java", "Москва"),
+            HarvestJob("go", "Атлантида"),
+            HarvestJob("rust", "Москва"),
+        ]
+        printed = []
+
+        reports = asyncio.run(harvest(api, storage, jobs, concurrency=2, report=printed.append))
+
+        self.assertEqual(len(printed), 4)
+        self.assertEqual([r.fetched for r in reports], [3, 3, 0, 0])
+        self.assertEqual(sum(r.inserted for r in reports), 3)
+        self.assertEqual(sum(r.skipped for r in reports), 3)
+        self.assertEqual(reports[2].error, "регион не найден")
+        self.assertEqual(reports[3].error, "Статус: 503")
+        self.assertIn("ошибка", str(reports[3]))
+        self.assertIn("новых", str(reports[0]))
+        self.assertTrue(all(all_pages for _, _, all_pages in api.calls))
+        self.assertEqual(len(storage), 3)
+        storage.close()
+
+    def test_harvest_sqlite_writes_from_worker_threads(self):
+        """Тест записи в SQLite из пула потоков без блокировки цикла событий"""
+        storage = SQLiteVacancyStorage(os.path.join(self.temp_dir.name, "v.db"))
+        jobs = [HarvestJob(query, "Москва") for query in ("python", "java", "go")]
+
+        reports = asyncio.run(harvest(FakeAPI(), storage, jobs, concurrency=3, report=lambda report: None))
+
+        self.assertEqual([r.error for r in reports], [None, None, None])
+        self.assertEqual(len(list(storage.iter_vacancies())), 3)
+        storage.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
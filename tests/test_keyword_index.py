@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from src.keyword_index import KeywordIndex, load_index, save_index, stem, tokenize
+
+
+class TestKeywordIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = KeywordIndex()
+        self.index.add("u1", "Разработка на <highlighttext>Python</highlighttext>")
+        self.index.add("u2", "Разработчик Java, знание SQL")
+        self.index.add("u3", "Python и SQL, работа с ёлками")
+
+    def test_tokenize(self):
+        """Тест нормализации текста"""
+        self.assertEqual(tokenize("<b>Ёлка</b> и PYTHON"), ["елка", "и", "python"])
+
+    def test_stem(self):
+        """Тест отсечения русских окончаний"""
+        self.assertEqual(stem("разработка"), "разработк")
+        self.assertEqual(stem("разработчики"), "разработчик")
+        self.assertEqual(stem("java"), "java")
+        self.assertEqual(stem("код"), "код")
+
+    def test_search(self):
+        """Тест поиска с операциями AND/OR"""
+        self.assertEqual(self.index.search("python"), {"u1", "u3"})
+        self.assertEqual(self.index.search("python sql"), {"u3"})
+        self.assertEqual(self.index.search("java | ёлка"), {"u2", "u3"})
+        self.assertEqual(self.index.search("разработки"), {"u1"})
+        self.assertEqual(self.index.search("разработчики"), {"u2"})
+        self.assertEqual(self.index.search("rust"), set())
+        self.assertEqual(self.index.search(""), set())
+
+    def test_candidates(self):
+        """Тест кандидатов для поиска подстроки"""
+        self.assertEqual(self.index.candidates("ython"), {"u1", "u3"})
+        self.assertEqual(self.index.candidates("Разработ"), {"u1", "u2"})
+        self.assertEqual(self.index.candidates("знание sql"), {"u2"})
+        self.assertEqual(self.index.candidates("ка на"), {"u1"})
+        self.assertEqual(self.index.candidates("highlighttext>py"), {"u1"})
+        self.assertEqual(self.index.candidates("rust"), set())
+        self.assertIsNone(self.index.candidates(" , "))
+
+    def test_remove(self):
+        """Тест удаления документа из индекса"""
+        self.index.remove("u3", "Python и SQL, работа с ёлками")
+        self.assertEqual(self.index.search("sql"), {"u2"})
+        self.assertEqual(self.index.search("елки"), set())
+
+    def test_save_and_load(self):
+        """Тест сохранения индекса с отметкой версии файла данных"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "vacancies.json.idx")
+            save_index(path, self.index, {"size": 1, "mtime_ns": 2})
+
+            loaded = load_index(path, {"size": 1, "mtime_ns": 2})
+            self.assertEqual(loaded.search("python sql"), {"u3"})
+            self.assertIsNone(load_index(path, {"size": 3, "mtime_ns": 2}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import subprocess
+import sys
+import threading
+import unittest
+from unittest.mock import Mock
+
+from main import STORAGE_FORMAT_NAMES, APIPrefetch, StartupProfile, parse_args
+from src.harvester import STORAGE_FORMATS
+
+ROOT = os.path.join(os.path.dirname(__file__), os.pardir)
+
+
+class TestStartup(unittest.TestCase):
+    def test_import_is_lazy(self):
+        """Тест запуска без импорта requests, numpy и asyncio"""
+        code = "import sys, main; print(sorted({'requests', 'numpy', 'asyncio'} & set(sys.modules)))"
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        self.assertEqual(output.strip(), "[]")
+
+    def test_profile_report(self):
+        """Тест отчета о замерах этапов запуска"""
+        profile = StartupProfile(started=0.0)
+        profile.mark("старт")
+        with profile.phase("этап"):
+            pass
+        lines = profile.report()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].endswith("старт"))
+        self.assertIn("MainThread", lines[2])
+
+    def test_prefetch_loads_areas_in_background(self):
+        """Тест фоновой загрузки дерева регионов"""
+        release = threading.Event()
+        api = Mock()
+        api.load_areas.side_effect = lambda: release.wait(5)
+        profile = StartupProfile()
+        prefetch = APIPrefetch(lambda: api, profile)
+        release.set()
+
+        self.assertIs(prefetch.get(), api)
+        api.load_areas.assert_called_once_with()
+        self.assertTrue(any(line.endswith("загрузка дерева регионов") for line in profile.report()))
+
+        prefetch.close()
+        api.close.assert_called_once_with()
+        api.rate_limiter.close.assert_called_once_with()
+        api.detail_cache.close.assert_called_once_with()
+
+    def test_prefetch_error_raised_from_get(self):
+        """Тест ошибки фоновой загрузки из get и закрытия созданного клиента"""
+        def factory():
+            raise RuntimeError("нет сети")
+
+        prefetch = APIPrefetch(factory, StartupProfile())
+        with self.assertRaises(RuntimeError):
+            prefetch.get()
+        prefetch.close()
+
+        api = Mock(detail_cache=None)
+        api.load_areas.side_effect = ConnectionError("нет сети")
+        prefetch = APIPrefetch(lambda: api, StartupProfile())
+        with self.assertRaises(ConnectionError):
+            prefetch.get()
+        prefetch.close()
+        api.close.assert_called_once_with()
+        api.rate_limiter.close.assert_called_once_with()
+
+    def test_prefetch_close_does_not_wait_for_network(self):
+        """Тест выхода без ожидания загрузки: клиент закрывает фоновый поток"""
+        release = threading.Event()
+        api = Mock(detail_cache=None)
+        api.load_areas.side_effect = lambda: release.wait(5)
+        prefetch = APIPrefetch(lambda: api, StartupProfile(), close_timeout=0.01)
+
+        prefetch.close()
+        api.close.assert_not_called()
+        release.set()
+        prefetch.get()
+        api.close.assert_called_once_with()
+        api.rate_limiter.close.assert_called_once_with()
+
+    def test_parse_args(self):
+        """Тест разбора аргументов командной строки"""
+        args = parse_args(["--profile-startup", "--format", "jsonl"])
+        self.assertTrue(args.profile_startup)
+        self.assertEqual(args.format, "jsonl")
+        self.assertEqual(STORAGE_FORMAT_NAMES, tuple(sorted(STORAGE_FORMATS)))
+
+
+if __name__ == "__main__":
+    unittest.main()
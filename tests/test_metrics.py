@@ -0,0 +1,231 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from src.api_cache import MemoryCache
+from src.api_connector import HeadHunterAPI
+from src.data_saver import JSONLinesVacancyStorage, JSONVacancyStorage
+from src.metrics import NULL_METRICS, MetricsRegistry, instrument_methods
+from src.sqlite_storage import SQLiteVacancyStorage
+from src.vacancy import Vacancy
+
+
+def make_response(status, payload=None, content=b"{}"):
+    """Ответ API с заданным статусом и телом"""
+    response = Mock()
+    response.status_code = status
+    response.headers = {}
+    response.content = content
+    response.json.return_value = payload
+    return response
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_counters_and_histograms_by_labels(self):
+        """Тест счетчиков и гистограмм с метками"""
+        metrics = MetricsRegistry(buckets=(0.1, 1.0))
+        metrics.increment("requests", status="200")
+        metrics.increment("requests", 2, status="200")
+        metrics.increment("requests", status="500")
+        metrics.observe("latency", 0.05)
+        metrics.observe("latency", 0.5)
+        metrics.observe("latency", 5.0)
+
+        self.assertEqual(metrics.counter("requests", status="200"), 3)
+        self.assertEqual(metrics.counter("requests", status="500"), 1)
+        self.assertEqual(metrics.counter("requests", status="404"), 0)
+        histogram = metrics.histogram("latency")
+        self.assertEqual(histogram.count, 3)
+        self.assertAlmostEqual(histogram.sum, 5.55)
+        self.assertEqual(histogram.cumulative(), [(0.1, 1), (1.0, 2), (float("inf"), 3)])
+
+        metrics.reset()
+        self.assertEqual(metrics.counter("requests", status="200"), 0)
+        self.assertIsNone(metrics.histogram("latency"))
+
+    def test_openmetrics_export(self):
+        """Тест экспорта метрик в формате OpenMetrics"""
+        metrics = MetricsRegistry(buckets=(0.5,))
+        metrics.increment("api_requests", status="200")
+        metrics.observe("api_request_seconds", 0.25, status='a"b')
+        text = metrics.to_openmetrics()
+
+        self.assertIn("# TYPE api_requests counter\n", text)
+        self.assertIn('api_requests_total{status="200"} 1\n', text)
+        self.assertIn("# TYPE api_request_seconds histogram\n", text)
+        self.assertIn('api_request_seconds_bucket{status="a\\"b",le="0.5"} 1\n', text)
+        self.assertIn('api_request_seconds_bucket{status="a\\"b",le="+Inf"} 1\n', text)
+        self.assertIn('api_request_seconds_count{status="a\\"b"} 1\n', text)
+        self.assertIn('api_request_seconds_sum{status="a\\"b"} 0.25\n', text)
+        self.assertTrue(text.endswith("# EOF\n"))
+
+    def test_instrument_methods_skips_disabled_metrics(self):
+        """Тест обертки методов при выключенных и включенных метриках"""
+        class Service:
+            metrics = NULL_METRICS
+
+            def work(self, value):
+                return value * 2
+
+            def items(self):
+                yield from range(3)
+
+        instrument_methods(Service, "call_seconds", ["work", "items"], iterators=["items"], service="s")
+        service = Service()
+        self.assertEqual(service.work(2), 4)
+
+        service.metrics = MetricsRegistry()
+        self.assertEqual(service.work(3), 6)
+        self.assertEqual(list(service.items()), [0, 1, 2])
+        self.assertEqual(service.metrics.histogram("call_seconds", service="s", method="work").count, 1)
+        self.assertEqual(service.metrics.histogram("call_seconds", service="s", method="items").count, 1)
+        self.assertEqual(Service.work.__name__, "work")
+
+    def test_instrument_methods_times_entry_point_only(self):
+        """Тест замера только внешнего вызова и генератора до первого элемента"""
+        class Service:
+            metrics = NULL_METRICS
+
+            def outer(self):
+                return self.inner() + sum(self.items())
+
+            def inner(self):
+                return 1
+
+            def items(self):
+                yield from range(3)
+
+        instrument_methods(Service, "call_seconds", ["outer", "inner", "items"], iterators=["items"])
+        service = Service()
+        service.metrics = metrics = MetricsRegistry()
+        self.assertEqual(service.outer(), 4)
+        self.assertEqual(service.inner(), 1)
+        self.assertEqual(metrics.histogram("call_seconds", method="outer").count, 1)
+        self.assertEqual(metrics.histogram("call_seconds", method="inner").count, 1)
+        self.assertIsNone(metrics.histogram("call_seconds", method="items"))
+
+        items = service.items()
+        self.assertEqual(next(items), 0)
+        time.sleep(0.05)
+        self.assertEqual(list(items), [1, 2])
+        self.assertLess(metrics.histogram("call_seconds", method="items").sum, 0.05)
+        self.assertEqual(list(service.items()), [0, 1, 2])
+
+
+class TestAPIMetrics(unittest.TestCase):
+    @patch("time.sleep")
+    @patch("requests.Session.get")
+    def test_requests_retries_and_bytes(self, mock_get, _sleep):
+        """Тест метрик запросов, повторов и объема ответов API"""
+        mock_get.side_effect = [
+            make_response(503),
+            make_response(200, {"items": [], "found": 0, "pages": 1}, b'{"items": []}'),
+        ]
+        metrics = MetricsRegistry()
+        with HeadHunterAPI(metrics=metrics) as api:
+            self.assertEqual(api.get_vacancies("python", 113), [])
+
+        self.assertEqual(metrics.counter("api_requests", status="503"), 1)
+        self.assertEqual(metrics.counter("api_requests", status="200"), 1)
+        self.assertEqual(metrics.counter("api_retries"), 1)
+        self.assertEqual(metrics.counter("api_errors"), 0)
+        self.assertEqual(metrics.counter("api_response_bytes"), 13 + 2)
+        self.assertEqual(metrics.histogram("api_request_seconds", status="200").count, 1)
+        # Замеряется только внешний вызов, вложенные search и _connect_to_api - нет
+        self.assertEqual(
+            metrics.histogram("api_call_seconds", platform="HeadHunterAPI", method="get_vacancies").count, 1
+        )
+        for method in ("search", "_connect_to_api"):
+            self.assertIsNone(metrics.histogram("api_call_seconds", platform="HeadHunterAPI", method=method))
+
+    @patch("requests.Session.get")
+    def test_cache_hits_and_errors(self, mock_get):
+        """Тест метрик попаданий в кеш и ошибок API"""
+        mock_get.side_effect = [make_response(200, {"items": []}), make_response(404)]
+        metrics = MetricsRegistry()
+        with HeadHunterAPI(metrics=metrics, cache=MemoryCache(ttl=60)) as api:
+            api.get_vacancies("python", 113)
+            api.get_vacancies("python", 113)
+            api.get_vacancies("java", 113)
+
+        self.assertEqual(metrics.counter("api_cache", result="miss"), 1)
+        self.assertEqual(metrics.counter("api_cache", result="hit"), 1)
+        self.assertEqual(metrics.counter("api_errors"), 1)
+        self.assertEqual(metrics.counter("api_requests", status="404"), 1)
+
+
+class TestStorageMetrics(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.vacancy = Vacancy("Python Developer", "Москва", "https://hh.ru/vacancy/1", 100000, 150000, "Python")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_json_storage_calls_and_io(self):
+        """Тест метрик вызовов и ввода-вывода JSON-хранилища со снимком"""
+        storage = JSONVacancyStorage(os.path.join(self.temp_dir.name, "vacancies.json"))
+        storage.metrics = metrics = MetricsRegistry()
+        storage.add_vacancy(self.vacancy)
+        storage.get_vacancies("python")
+        self.assertEqual(len(list(storage.iter_vacancies())), 1)
+        storage.top_by_salary(5)
+        storage.remove_vacancy(self.vacancy.url)
+
+        for method in ("add_vacancy", "get_vacancies", "iter_vacancies", "top_by_salary", "remove_vacancy"):
+            histogram = metrics.histogram("storage_call_seconds", storage="JSONVacancyStorage", method=method)
+            self.assertEqual(histogram.count, 1, method)
+        self.assertEqual(
+            metrics.histogram("storage_io_seconds", storage="JSONVacancyStorage", op="write").count, 2
+        )
+        self.assertGreater(metrics.counter("storage_io_bytes", storage="JSONVacancyStorage", op="write"), 0)
+        # Чтения после собственной записи обслуживаются снимком в памяти
+        self.assertEqual(metrics.counter("storage_io_bytes", storage="JSONVacancyStorage", op="scan"), 0)
+        self.assertEqual(metrics.counter("storage_snapshot", result="miss"), 0)
+        self.assertGreater(metrics.counter("storage_snapshot", result="hit"), 0)
+
+    def test_json_storage_streaming_io(self):
+        """Тест метрик чтения JSON-хранилища без снимка в памяти"""
+        storage = JSONVacancyStorage(os.path.join(self.temp_dir.name, "vacancies.json"), snapshot=False)
+        storage.metrics = metrics = MetricsRegistry()
+        storage.add_vacancy(self.vacancy)
+        storage.get_vacancies("")
+        self.assertGreater(metrics.counter("storage_io_bytes", storage="JSONVacancyStorage", op="scan"), 0)
+        self.assertEqual(metrics.counter("storage_snapshot", result="hit"), 0)
+
+    def test_sqlite_storage_io(self):
+        """Тест метрик чтения, перебора и записи SQLite"""
+        with SQLiteVacancyStorage(os.path.join(self.temp_dir.name, "vacancies.db")) as storage:
+            storage.metrics = metrics = MetricsRegistry()
+            storage.add_vacancies([self.vacancy])
+            self.assertEqual(len(storage.get_vacancies("python")), 1)
+            self.assertEqual(len(list(storage.iter_vacancies())), 1)
+            storage.remove_vacancy(self.vacancy.url)
+
+        for op in ("read", "scan", "write"):
+            self.assertGreater(metrics.counter("storage_io_bytes", storage="SQLiteVacancyStorage", op=op), 0, op)
+        self.assertEqual(
+            metrics.histogram("storage_io_seconds", storage="SQLiteVacancyStorage", op="write").count, 2
+        )
+        self.assertEqual(
+            metrics.histogram("storage_call_seconds", storage="SQLiteVacancyStorage", method="remove_vacancy").count,
+            1,
+        )
+
+    def test_jsonl_storage_write_bytes(self):
+        """Тест объема записи журнала JSON Lines"""
+        path = os.path.join(self.temp_dir.name, "vacancies.jsonl")
+        with JSONLinesVacancyStorage(path) as storage:
+            storage.metrics = metrics = MetricsRegistry()
+            storage.add_vacancies([self.vacancy])
+        self.assertEqual(
+            metrics.counter("storage_io_bytes", storage="JSONLinesVacancyStorage", op="write"),
+            os.path.getsize(path),
+        )
+        self.assertFalse(JSONLinesVacancyStorage.metrics.enabled)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.data_saver import JSONLinesVacancyStorage
+from src.near_duplicates import MinHashIndex, NearDuplicateStorage, shingles
+from src.vacancy import Vacancy
+
+DESCRIPTION = (
+    "Разработка backend-сервисов на Python и Django, проектирование REST API, "
+    "работа с PostgreSQL и Redis, участие в код-ревью, написание тестов, "
+    "опыт коммерческой разработки от трех лет, знание Docker и Kubernetes"
+)
+
+
+def make_vacancy(url_id, name="Python-разработчик", description=DESCRIPTION):
+    """Вакансия с URL по номеру url_id"""
+    return Vacancy(name, "Москва", f"https://hh.ru/vacancy/{url_id}", 150000, None, description)
+
+
+class TestMinHashIndex(unittest.TestCase):
+    def test_shingles(self):
+        """Тест разбиения текста на шинглы"""
+        self.assertEqual(shingles("Один, два! Три четыре", 3), {"один два три", "два три четыре"})
+        self.assertEqual(shingles("Python", 3), {"python"})
+        self.assertEqual(shingles("", 3), set())
+
+    def test_finds_near_duplicates_only(self):
+        """Тест поиска только почти-дубликатов и удаления из индекса"""
+        index = MinHashIndex()
+        index.add("a", index.signature(DESCRIPTION))
+        index.add("b", index.signature("Водитель погрузчика на склад, сменный график, официальное оформление"))
+
+        self.assertEqual(index.find(DESCRIPTION + ", английский язык"), "a")
+        self.assertIsNone(index.find("Аналитик данных: SQL, Tableau, A/B-тесты и продуктовые метрики"))
+        self.assertIsNone(index.find(""))
+
+        self.assertTrue(index.remove("a"))
+        self.assertFalse(index.remove("a"))
+        self.assertIsNone(index.find(DESCRIPTION))
+        self.assertEqual(index.keys(), ["b"])
+
+    def test_rows_reused_and_saved(self):
+        """Тест повторного использования строк подписей и сохранения индекса"""
+        index = MinHashIndex(num_perm=32, bands=8)
+        for i in range(40):
+            index.add(str(i), index.signature(f"вакансия номер {i} " * 3))
+        for i in range(0, 40, 2):
+            index.remove(str(i))
+        index.add("new", index.signature(DESCRIPTION))
+        self.assertEqual(len(index), 21)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.npz")
+            index.save(path)
+            loaded = MinHashIndex(num_perm=32, bands=8)
+            self.assertTrue(loaded.load(path))
+            self.assertFalse(MinHashIndex(num_perm=64, bands=16).load(path))
+        self.assertEqual(sorted(loaded.keys()), sorted(index.keys()))
+        self.assertEqual(loaded.find(DESCRIPTION), "new")
+
+    def test_invalid_parameters(self):
+        """Тест проверки параметров индекса"""
+        with self.assertRaises(ValueError):
+            MinHashIndex(num_perm=10, bands=3)
+        with self.assertRaises(ValueError):
+            MinHashIndex(threshold=0)
+
+
+class TestNearDuplicateStorage(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "vacancies.jsonl")
+        self.index_path = os.path.join(self.temp_dir.name, "vacancies.minhash.npz")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def open(self):
+        """Открытие хранилища с сохраняемым индексом"""
+        return NearDuplicateStorage(JSONLinesVacancyStorage(self.path), index_filename=self.index_path)
+
+    def test_reposted_vacancy_skipped(self):
+        """Тест пропуска переопубликованной вакансии"""
+        with self.open() as storage:
+            result = storage.add_vacancies(
+                [
+                    make_vacancy(1),
+                    make_vacancy(2, "Python разработчик"),
+                    make_vacancy(1),
+                    make_vacancy(3, "Водитель", "Вождение погрузчика, сменный график работы на складе"),
+                ]
+            )
+            self.assertEqual(result.inserted, 2)
+            self.assertEqual(result.skipped, 2)
+            self.assertEqual(storage.duplicates, [("https://hh.ru/vacancy/2", "https://hh.ru/vacancy/1")])
+
+            storage.add_vacancy(make_vacancy(4, description=DESCRIPTION + " и Kafka"))
+            self.assertEqual(len(list(storage.iter_vacancies())), 2)
+
+            # После удаления оригинала переопубликованная вакансия сохраняется
+            self.assertEqual(storage.remove_vacancies(["https://hh.ru/vacancy/1"]), 1)
+            storage.add_vacancy(make_vacancy(5))
+            self.assertEqual(len(storage.top_by_salary(10)), 2)
+
+    def test_index_synced_on_open(self):
+        """Тест сверки индекса с хранилищем при открытии"""
+        with self.open() as storage:
+            storage.add_vacancies([make_vacancy(1)])
+        with JSONLinesVacancyStorage(self.path) as plain:
+            plain.add_vacancies([make_vacancy(2, "Python Developer")])
+            plain.remove_vacancy("https://hh.ru/vacancy/1")
+
+        with self.open() as storage:
+            self.assertEqual(storage.index.keys(), ["https://hh.ru/vacancy/2"])
+            self.assertEqual(storage.add_vacancies([make_vacancy(3)]).skipped, 1)
+
+    def test_stored_duplicates_kept_separately(self):
+        """Тест учета дубликатов внутри хранилища отдельно от отсеянных"""
+        with JSONLinesVacancyStorage(self.path) as plain:
+            plain.add_vacancies([make_vacancy(1), make_vacancy(2, "Python разработчик")])
+            with patch("time.time", return_value=1.0):
+                plain.add_vacancy(make_vacancy(3, "Водитель", "Вождение погрузчика, сменный график работы на складе"))
+
+        expected = {"https://hh.ru/vacancy/2": "https://hh.ru/vacancy/1"}
+        with self.open() as storage:
+            self.assertEqual(storage.stored_duplicates, expected)
+            self.assertEqual(storage.duplicates, [])
+            # Сверка после удаления устаревших не перепроверяет известный дубликат
+            with patch.object(storage.index, "signature", wraps=storage.index.signature) as signature:
+                self.assertEqual(storage.prune(3600), 1)
+            signature.assert_not_called()
+            self.assertEqual(storage.stored_duplicates, expected)
+
+        with self.open() as storage:
+            self.assertEqual(storage.stored_duplicates, expected)
+            self.assertEqual(storage.duplicates, [])
+            storage.remove_vacancy("https://hh.ru/vacancy/1")
+            # Дубликат удаленного оригинала становится оригиналом сам
+            self.assertEqual(storage.stored_duplicates, {})
+            self.assertEqual(storage.add_vacancies([make_vacancy(4)]).skipped, 1)
+            self.assertEqual(storage.duplicates, [("https://hh.ru/vacancy/4", "https://hh.ru/vacancy/2")])
+
+
+if __name__ == "__main__":
+    unittest.main()
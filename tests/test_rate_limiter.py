@@ -0,0 +1,128 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from src.api_connector import HeadHunterAPI
+from src.rate_limiter import EndpointRateLimiter, SQLiteTokenBucket, TokenBucket, endpoint_limits
+
+
+def _count_tokens(filename, attempts, results):
+    bucket = SQLiteTokenBucket(filename, rate=0.001, capacity=5, name="/vacancies")
+    results.put(sum(bucket.try_acquire() for _ in range(attempts)))
+    bucket.close()
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_capacity(self):
+        """Тест всплеска в пределах емкости"""
+        bucket = TokenBucket(rate=1, capacity=3)
+        self.assertTrue(all(bucket.try_acquire() for _ in range(3)))
+        self.assertFalse(bucket.try_acquire())
+
+    @patch("time.sleep")
+    def test_acquire_waits(self, mock_sleep):
+        """Тест ожидания токена при исчерпании емкости"""
+        bucket = TokenBucket(rate=1000, capacity=1)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertGreater(bucket.acquire(), 0.0)
+        self.assertTrue(mock_sleep.called)
+
+    def test_invalid_parameters(self):
+        """Тест проверки параметров"""
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=1, capacity=0)
+
+    def test_pause(self):
+        """Тест паузы после ответа 429"""
+        bucket = TokenBucket(rate=1000, capacity=5)
+        bucket.pause(60)
+        self.assertFalse(bucket.try_acquire())
+
+
+class TestSQLiteTokenBucket(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.temp_dir.name, "limits.db")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_shared_between_instances(self):
+        """Тест общего запаса токенов у экземпляров с одним файлом и именем"""
+        first = SQLiteTokenBucket(self.filename, rate=0.001, capacity=3)
+        second = SQLiteTokenBucket(self.filename, rate=0.001, capacity=3)
+        other = SQLiteTokenBucket(self.filename, rate=0.001, capacity=1, name="other")
+        try:
+            self.assertTrue(first.try_acquire())
+            self.assertTrue(second.try_acquire())
+            self.assertTrue(first.try_acquire())
+            self.assertFalse(second.try_acquire())
+            self.assertTrue(other.try_acquire())
+
+            other.pause(60)
+            self.assertFalse(other.try_acquire())
+        finally:
+            for bucket in (first, second, other):
+                bucket.close()
+
+    def test_shared_between_processes(self):
+        """Тест ограничения суммарного числа запросов нескольких процессов"""
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(target=_count_tokens, args=(self.filename, 10, results))
+            for _ in range(3)
+        ]
+        for worker in workers:
+            worker.start()
+        granted = sum(results.get(timeout=30) for _ in workers)
+        for worker in workers:
+            worker.join()
+        self.assertEqual(granted, 5)
+
+
+class TestEndpointRateLimiter(unittest.TestCase):
+    def test_limits_by_path_prefix(self):
+        """Тест выбора лимита по конечной точке"""
+        limiter = endpoint_limits({"/vacancies": (0.001, 2), "/areas": (0.001, 1)})
+        self.assertTrue(limiter.try_acquire("https://api.hh.ru/areas"))
+        self.assertFalse(limiter.try_acquire("https://api.hh.ru/areas"))
+        self.assertTrue(limiter.try_acquire("https://api.hh.ru/vacancies?page=1"))
+        self.assertTrue(limiter.try_acquire("https://api.hh.ru/vacancies/123"))
+        self.assertFalse(limiter.try_acquire("https://api.hh.ru/vacancies"))
+        # Адреса без лимита не ограничиваются
+        self.assertTrue(all(limiter.try_acquire("https://api.hh.ru/dictionaries") for _ in range(5)))
+        self.assertIsNone(limiter.limiter_for("https://api.hh.ru/vacanciesx"))
+
+    def test_default_limiter(self):
+        default = TokenBucket(rate=0.001, capacity=1)
+        limiter = EndpointRateLimiter({}, default=default)
+        self.assertTrue(limiter.try_acquire("https://api.hh.ru/employers"))
+        self.assertFalse(limiter.try_acquire("https://api.hh.ru/employers"))
+
+    @patch("time.sleep")
+    @patch("requests.Session.get")
+    def test_api_pauses_limiter_on_429(self, mock_get, mock_sleep):
+        """Тест паузы ограничителя конечной точки при ответе 429"""
+        throttled = Mock(status_code=429, headers={"Retry-After": "7"})
+        ok = Mock(status_code=200, headers={})
+        ok.json.return_value = {"items": [{"id": "1"}], "found": 1, "pages": 1}
+        mock_get.side_effect = [throttled, ok]
+
+        vacancies_limiter = Mock()
+        vacancies_limiter.acquire.return_value = 0.0
+        limiter = EndpointRateLimiter({"/vacancies": vacancies_limiter})
+        with HeadHunterAPI(rate_limiter=limiter) as api:
+            self.assertEqual(len(api.get_vacancies("python", 113)), 1)
+
+        vacancies_limiter.pause.assert_called_once()
+        self.assertEqual(vacancies_limiter.pause.call_args[0][0], 7.0)
+        self.assertEqual(vacancies_limiter.acquire.call_count, 2)
+        mock_sleep.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
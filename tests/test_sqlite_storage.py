@@ -0,0 +1,154 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.data_saver import JSONVacancyStorage
+from src.sqlite_storage import SQLiteVacancyStorage
+from src.vacancy import Vacancy
+
+
+class TestSQLiteVacancyStorage(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "vacancies.db")
+        self.storage = SQLiteVacancyStorage(self.path)
+
+        self.python = Vacancy(
+            "Python Developer", "Москва", "https://hh.ru/vacancy/1", 100000, 150000, "Разработка на Python"
+        )
+        self.java = Vacancy(
+            "Java Developer", "Москва", "https://hh.ru/vacancy/2", 200000, None, "Разработка на Java"
+        )
+        self.junior = Vacancy(
+            "Junior Python", "Казань", "https://hh.ru/vacancy/3", None, 60000, "Стажировка, python и SQL"
+        )
+
+    def tearDown(self):
+        self.storage.close()
+        self.temp_dir.cleanup()
+
+    def test_add_vacancies(self):
+        """Тест пакетного добавления с уникальным URL"""
+        result = self.storage.add_vacancies([self.python, self.java, self.python])
+        self.assertEqual(result, (2, 1))
+
+        self.storage.add_vacancy(self.java)
+        self.assertEqual(len(self.storage), 2)
+
+    def test_get_vacancies_full_text(self):
+        """Тест поиска подстроки в описании с сужением по FTS5"""
+        self.storage.add_vacancies([self.python, self.java, self.junior])
+
+        def urls(criterion):
+            return [v.url for v in self.storage.get_vacancies(criterion)]
+
+        self.assertEqual(urls("PYTHON"), [self.python.url, self.junior.url])
+        self.assertEqual(urls("ython"), [self.python.url, self.junior.url])
+        self.assertEqual(len(self.storage.get_vacancies("")), 3)
+        self.assertEqual(urls("РАЗРАБОТКА на j"), [self.java.url])
+        self.assertEqual(urls("разраб java"), [])
+        self.assertEqual(urls(", p"), [self.junior.url])
+        self.assertEqual(urls("Rust"), [])
+
+    def test_get_vacancies_matches_json_storage(self):
+        """Тест одинаковых ответов get_vacancies в SQLite и JSON-хранилище"""
+        vacancies = [self.python, self.java, self.junior]
+        self.storage.add_vacancies(vacancies)
+        json_storage = JSONVacancyStorage(os.path.join(self.temp_dir.name, "vacancies.json"))
+        json_storage.add_vacancies(vacancies)
+
+        for criterion in ("python", "ython", "на ", "Разработка на", "SQL", " ", ", ", "java python", "ёж"):
+            self.assertEqual(
+                self.storage.get_vacancies(criterion), json_storage.get_vacancies(criterion), criterion
+            )
+
+    def test_get_vacancies_without_fts(self):
+        """Тест поиска подстроки без FTS5: кириллица без учета регистра, % и _ как символы"""
+        percent = Vacancy("Sales", "Москва", "https://hh.ru/vacancy/4", None, None, "Бонус 5% от_продаж")
+        self.storage.add_vacancies([self.python, self.java, self.junior, percent])
+        self.storage._SQLiteVacancyStorage__has_fts = False
+
+        self.assertEqual(self.storage.get_vacancies("разработка на JAVA"), [self.java])
+        self.assertEqual(self.storage.get_vacancies("5%"), [percent])
+        self.assertEqual(self.storage.get_vacancies("т_п"), [percent])
+        self.assertEqual(self.storage.get_vacancies("%"), [percent])
+        self.assertEqual(self.storage.get_vacancies("_"), [percent])
+
+    def test_iter_vacancies(self):
+        """Тест ленивого перебора вакансий"""
+        self.storage.add_vacancies([self.python, self.java, self.junior])
+
+        moscow = self.storage.iter_vacancies(lambda v: v.area == "Москва")
+        self.assertEqual(list(moscow), [self.python, self.java])
+
+    def test_top_by_salary(self):
+        """Тест топа вакансий по максимальной зарплате"""
+        self.storage.add_vacancies([self.python, self.java, self.junior])
+
+        top = self.storage.top_by_salary(2)
+        self.assertEqual([v.url for v in top], [self.java.url, self.python.url])
+        self.assertEqual(self.storage.top_by_salary(5, area="Казань"), [self.junior])
+
+    def test_remove_vacancy(self):
+        """Тест удаления вакансии вместе с полнотекстовым индексом"""
+        self.storage.add_vacancies([self.python, self.junior])
+        self.storage.remove_vacancy(self.python.url)
+        self.storage.remove_vacancy("https://hh.ru/vacancy/999")
+
+        self.assertEqual(self.storage.get_vacancies("python"), [self.junior])
+
+    def test_remove_vacancies_and_prune(self):
+        """Тест пакетного удаления и удаления устаревших вакансий"""
+        with patch("time.time", return_value=1000.0):
+            self.storage.add_vacancies([self.python, self.java])
+        with patch("time.time", return_value=5000.0):
+            self.storage.add_vacancies([self.junior])
+
+        self.assertEqual(self.storage.remove_vacancies([self.java.url, "https://hh.ru/vacancy/999"]), 1)
+        with patch("time.time", return_value=6000.0):
+            self.assertEqual(self.storage.prune(older_than=3000), 1)
+        self.assertEqual(list(self.storage.iter_vacancies()), [self.junior])
+        self.assertEqual(self.storage.get_vacancies("python"), [self.junior])
+
+    def test_readded_vacancy_not_pruned(self):
+        """Тест обновления времени загрузки у повторно найденной вакансии"""
+        with patch("time.time", return_value=1000.0):
+            self.storage.add_vacancies([self.python, self.java])
+        with patch("time.time", return_value=5000.0):
+            self.assertEqual(self.storage.add_vacancies([self.python, self.python]), (0, 2))
+
+        with patch("time.time", return_value=6000.0):
+            self.assertEqual(self.storage.prune(older_than=3000), 1)
+        self.assertEqual(list(self.storage.iter_vacancies()), [self.python])
+
+    def test_migrates_old_schema(self):
+        """Тест добавления времени загрузки в базу старой версии"""
+        self.storage.close()
+        path = os.path.join(self.temp_dir.name, "old.db")
+        with sqlite3.connect(path) as connection:
+            connection.execute(
+                "CREATE TABLE vacancies (id INTEGER PRIMARY KEY, url TEXT NOT NULL, name TEXT NOT NULL, "
+                "area TEXT NOT NULL, salary_from INTEGER, salary_to INTEGER, salary_max INTEGER NOT NULL, "
+                "description TEXT NOT NULL)"
+            )
+            connection.execute(
+                "INSERT INTO vacancies (url, name, area, salary_max, description) VALUES ('u', 'n', 'a', 0, '')"
+            )
+        connection.close()
+
+        self.storage = SQLiteVacancyStorage(path)
+        self.assertEqual(self.storage.prune(older_than=0), 0)
+        self.storage.add_vacancies([self.python])
+        self.assertEqual(len(self.storage), 2)
+
+    def test_wal_mode(self):
+        """Тест включения режима WAL"""
+        with sqlite3.connect(self.path) as connection:
+            mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+
+if __name__ == "__main__":
+    unittest.main()
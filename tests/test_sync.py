@@ -0,0 +1,129 @@
+import os
+import tempfile
+import unittest
+
+from src.data_saver import JSONLinesVacancyStorage
+from src.sync import IncrementalSync, SyncState, parse_published_at
+
+
+def make_item(i, published_at):
+    """Запись выдачи hh.ru с датой публикации"""
+    return {
+        "name": f"Developer {i}",
+        "area": {"name": "Москва"},
+        "alternate_url": f"https://hh.ru/vacancy/{i}",
+        "salary": {"from": 100000, "to": None},
+        "snippet": {"requirement": "Python"},
+        "published_at": published_at,
+    }
+
+
+class FakeAPI:
+    """Заглушка API, запоминающая параметры поиска"""
+
+    def __init__(self):
+        self.responses = []
+        self.calls = []
+
+    def search(self, query, area_id, all_pages=False, date_from=None, order_by=None):
+        """Очередной заготовленный ответ с запоминанием параметров"""
+        self.calls.append({"query": query, "area_id": area_id, "date_from": date_from, "order_by": order_by})
+        return self.responses.pop(0)
+
+
+class TestIncrementalSync(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.state_path = os.path.join(self.temp_dir.name, "sync.json")
+        self.storage = JSONLinesVacancyStorage(os.path.join(self.temp_dir.name, "v.jsonl"))
+        self.api = FakeAPI()
+        self.syncer = IncrementalSync(self.api, SyncState(self.state_path))
+
+    def tearDown(self):
+        self.storage.close()
+        self.temp_dir.cleanup()
+
+    def test_parse_published_at(self):
+        """Тест разбора даты публикации hh.ru"""
+        self.assertEqual(
+            parse_published_at("2024-01-15T10:00:00+0300").isoformat(), "2024-01-15T10:00:00+03:00"
+        )
+        self.assertIsNone(parse_published_at("вчера"))
+
+    def test_incremental_fetch(self):
+        """Тест загрузки только новых вакансий после водяного знака"""
+        self.api.responses = [
+            {"items": [make_item(1, "2024-01-15T10:00:00+0300"), make_item(2, "2024-01-16T10:00:00+0300")],
+             "complete": True},
+            {"items": [make_item(3, "2024-01-17T09:00:00+0300")], "complete": True},
+        ]
+
+        first = self.syncer.sync("Python", 1, self.storage)
+        self.assertEqual((first.fetched, first.inserted), (2, 2))
+        self.assertIsNone(self.api.calls[0]["date_from"])
+        self.assertEqual(self.api.calls[0]["order_by"], "publication_time")
+        self.assertEqual(first.watermark, "2024-01-16T10:00:00+03:00")
+
+        # Состояние переживает перезапуск
+        syncer = IncrementalSync(self.api, SyncState(self.state_path))
+        second = syncer.sync("python", 1, self.storage)
+        self.assertEqual(self.api.calls[1]["date_from"], "2024-01-16T10:00:00+03:00")
+        self.assertEqual(second.inserted, 1)
+        self.assertEqual(second.watermark, "2024-01-17T09:00:00+03:00")
+        self.assertEqual(len(self.storage), 3)
+
+    def test_incomplete_batch_keeps_watermark(self):
+        """Тест сохранения водяного знака при неполной выдаче"""
+        self.api.responses = [
+            {"items": [make_item(1, "2024-01-15T10:00:00+0300")], "complete": True},
+            {"items": [make_item(2, "2024-01-17T10:00:00+0300")], "complete": False},
+            {"items": [make_item(3, "2024-01-16T10:00:00+0300")], "complete": True},
+        ]
+        self.syncer.sync("Python", 1, self.storage)
+
+        partial = self.syncer.sync("Python", 1, self.storage)
+        self.assertEqual(partial.inserted, 1)
+        self.assertEqual(partial.watermark, "2024-01-15T10:00:00+03:00")
+
+        # Следующий запуск снова запрашивает вакансии после прежнего знака
+        result = self.syncer.sync("Python", 1, self.storage)
+        self.assertEqual(self.api.calls[2]["date_from"], "2024-01-15T10:00:00+03:00")
+        self.assertEqual(result.watermark, "2024-01-16T10:00:00+03:00")
+
+    def test_full_sync_removes_disappeared(self):
+        """Тест удаления пропавших вакансий при полной синхронизации"""
+        self.api.responses = [
+            {"items": [make_item(1, "2024-01-15T10:00:00+0300"), make_item(2, "2024-01-15T11:00:00+0300")],
+             "complete": True},
+            {"items": [make_item(2, "2024-01-15T11:00:00+0300")], "complete": False},
+            {"items": [make_item(2, "2024-01-15T11:00:00+0300")], "complete": True},
+        ]
+        self.syncer.sync("Python", 1, self.storage)
+
+        # Неполная выдача не приводит к удалению
+        partial = self.syncer.sync("Python", 1, self.storage, full=True)
+        self.assertEqual(partial.removed, 0)
+        self.assertEqual(partial.watermark, "2024-01-15T11:00:00+03:00")
+
+        result = self.syncer.sync("Python", 1, self.storage, full=True)
+        self.assertEqual(result.removed, 1)
+        self.assertNotIn("https://hh.ru/vacancy/1", self.storage)
+        self.assertIn("https://hh.ru/vacancy/2", self.storage)
+
+    def test_shared_vacancy_kept(self):
+        """Тест сохранения вакансии, найденной по другому запросу"""
+        self.api.responses = [
+            {"items": [make_item(1, "2024-01-15T10:00:00+0300")], "complete": True},
+            {"items": [make_item(1, "2024-01-15T10:00:00+0300")], "complete": True},
+            {"items": [], "complete": True},
+        ]
+        self.syncer.sync("Python", 1, self.storage)
+        self.syncer.sync("Django", 1, self.storage)
+
+        result = self.syncer.sync("Python", 1, self.storage, full=True)
+        self.assertEqual(result.removed, 0)
+        self.assertIn("https://hh.ru/vacancy/1", self.storage)
+
+
+if __name__ == "__main__":
+    unittest.main()
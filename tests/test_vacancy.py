@@ -1,5 +1,5 @@
 import unittest
-from src.vacancy import Vacancy
+from src.vacancy import Vacancy, salary_key
 
 
 class TestVacancy(unittest.TestCase):
@@ -62,6 +62,17 @@ class TestVacancy(unittest.TestCase):
         self.assertTrue(higher_salary >= self.valid_vacancy)
         self.assertEqual(self.valid_vacancy, self.valid_vacancy)
 
+    def test_salary_key(self):
+        """Тест единого ключа сортировки по зарплате"""
+        self.assertEqual(salary_key(None, None), 0)
+        self.assertEqual(salary_key(100000, None), 100000)
+        self.assertEqual(salary_key(150000, 120000), 150000)
+        self.assertEqual(self.valid_vacancy.salary_key, 150000)
+
+        # Некорректная вилка "от" больше "до" сравнивается по наибольшей границе
+        inverted = Vacancy("Lead", "Москва", "https://hh.ru/126", 300000, 200000, "")
+        self.assertTrue(self.valid_vacancy < inverted)
+
     def test_to_dict(self):
         """Тест преобразования в словарь"""
         vacancy_dict = self.valid_vacancy.to_dict()
@@ -72,6 +83,57 @@ class TestVacancy(unittest.TestCase):
         self.assertEqual(vacancy_dict["salary_to"], 150000)
         self.assertEqual(vacancy_dict["description"], "Разработка на Python")
 
+    def test_from_dict(self):
+        """Тест создания вакансии из словаря с валидацией и без нее"""
+        data = self.valid_vacancy.to_dict()
+        self.assertEqual(Vacancy.from_dict(data), self.valid_vacancy)
+        self.assertEqual(Vacancy.from_dict(data, trusted=True).salary_to, 150000)
+
+        data["salary_from"] = "100000"
+        with self.assertRaises(ValueError):
+            Vacancy.from_dict(data)
+
+    def test_from_api_items(self):
+        """Тест пакетного создания вакансий из ответа API"""
+        items = [
+            {
+                "name": "Python Developer",
+                "area": {"name": "Москва"},
+                "alternate_url": "https://hh.ru/vacancy/1",
+                "salary": None,
+                "snippet": {"requirement": None},
+            },
+            {
+                "name": "Java Developer",
+                "area": {"name": "Казань"},
+                "alternate_url": "https://hh.ru/vacancy/2",
+                "salary": {"from": 100000, "to": 200000, "currency": "RUR"},
+                "snippet": {"requirement": "Опыт работы с Java"},
+            },
+            {"name": "Без ссылки"},
+            {"name": "Go", "alternate_url": "https://hh.ru/vacancy/3", "salary": {"from": "много"}},
+            "не словарь",
+        ]
+
+        vacancies, errors = Vacancy.from_api_items(items)
+        self.assertEqual([v.url for v in vacancies], ["https://hh.ru/vacancy/1", "https://hh.ru/vacancy/2"])
+        self.assertIsNone(vacancies[0].salary_from)
+        self.assertEqual(vacancies[0].description, "")
+        self.assertEqual(vacancies[1].area, "Казань")
+        self.assertEqual([i for i, _ in errors], [2, 3, 4])
+        self.assertEqual(errors[1][1], "Зарплата 'от' должна быть целым числом")
+
+    def test_from_api_items_prefers_full_description(self):
+        """Тест использования полного описания вместо фрагмента"""
+        item = {
+            "name": "Python Developer",
+            "alternate_url": "https://hh.ru/vacancy/1",
+            "snippet": {"requirement": "Python..."},
+            "description": "Полное описание с Django",
+        }
+        vacancies, _ = Vacancy.from_api_items([item])
+        self.assertEqual(vacancies[0].description, "Полное описание с Django")
+
     def test_str_representation(self):
         """Тест строкового представления"""
         vacancy_str = str(self.valid_vacancy)
@@ -0,0 +1,74 @@
+import unittest
+
+try:
+    import numpy as np
+    from src.vacancy_batch import VacancyBatch
+except ImportError:  # NumPy не установлен
+    np = None
+
+from src.vacancy import Vacancy
+
+
+@unittest.skipIf(np is None, "NumPy не установлен")
+class TestVacancyBatch(unittest.TestCase):
+    def setUp(self):
+        self.vacancies = [
+            Vacancy("Python", "Москва", "https://hh.ru/vacancy/1", 100000, 150000, "a"),
+            Vacancy("Java", "Москва", "https://hh.ru/vacancy/2", 200000, None, "b"),
+            Vacancy("Go", "Казань", "https://hh.ru/vacancy/3", None, 90000, "c"),
+            Vacancy("Python", "Казань", "https://hh.ru/vacancy/4", None, None, "d"),
+            Vacancy("Rust", "Москва", "https://hh.ru/vacancy/5", 120000, 130000, "e"),
+        ]
+        self.batch = VacancyBatch.from_vacancies(self.vacancies)
+
+    def test_roundtrip_and_interning(self):
+        """Тест обратного преобразования и интернирования строк"""
+        self.assertEqual(len(self.batch), 5)
+        self.assertEqual(self.batch.areas, ["Москва", "Казань"])
+        self.assertEqual(self.batch.names, ["Python", "Java", "Go", "Rust"])
+        restored = self.batch.to_vacancies()
+        self.assertEqual(restored, self.vacancies)
+        self.assertIsNone(restored[3].salary_from)
+        self.assertEqual(restored[2].salary_to, 90000)
+
+    def test_salary_key_matches_vacancy(self):
+        """Тест совпадения векторного ключа с Vacancy.salary_key"""
+        self.assertEqual(self.batch.salary_key.tolist(), [v.salary_key for v in self.vacancies])
+
+    def test_filter_and_sort(self):
+        """Тест векторной фильтрации и сортировки"""
+        moscow = self.batch.filter(self.batch.area_mask("Москва"))
+        self.assertEqual(len(moscow), 3)
+        self.assertEqual(len(self.batch.filter(self.batch.area_mask("Атлантида"))), 0)
+
+        rich = self.batch.filter(self.batch.salary_key >= 130000)
+        self.assertEqual(
+            list(rich.urls), ["https://hh.ru/vacancy/1", "https://hh.ru/vacancy/2", "https://hh.ru/vacancy/5"]
+        )
+
+        top = self.batch.top_by_salary(2)
+        self.assertEqual([v.name for v in top.to_vacancies()], ["Java", "Python"])
+        ascending = self.batch.sort_by_salary(descending=False)
+        self.assertEqual(ascending[0].url, "https://hh.ru/vacancy/4")
+
+    def test_percentile(self):
+        """Тест перцентилей по вакансиям с зарплатой"""
+        self.assertEqual(self.batch.percentile(50), 140000)
+        self.assertEqual(self.batch.percentile([0, 100]).tolist(), [90000, 200000])
+        empty = VacancyBatch.from_vacancies([])
+        self.assertTrue(np.isnan(empty.percentile(50)))
+
+    def test_group_by_area(self):
+        """Тест статистики зарплат по регионам"""
+        stats = self.batch.group_by_area()
+        self.assertEqual(set(stats), {"Москва", "Казань"})
+        self.assertEqual(stats["Москва"].count, 3)
+        self.assertEqual(stats["Москва"].median, 150000)
+        self.assertAlmostEqual(stats["Москва"].mean, (150000 + 200000 + 130000) / 3)
+        self.assertEqual((stats["Москва"].min, stats["Москва"].max), (130000, 200000))
+        self.assertEqual(stats["Казань"].count, 1)
+        self.assertEqual(stats["Казань"].median, 90000)
+
+
+if __name__ == "__main__":
+    unittest.main()